@@ -0,0 +1,53 @@
+# benchmarks/bench_transcripts.py
+# 가짜 YouTubeTranscriptApi(benchmarks/fakes.py)를 사용하여 순차 추출과 동시 추출의 소요 시간을 비교합니다.
+# 실행: python benchmarks/bench_transcripts.py --videos 200 --latency 0.05 --workers 8
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks import fakes
+from utils import youtube_helper
+from utils.log_helper import setup_logging
+
+
+def run_sequential(video_ids):
+    for video_id in video_ids:
+        youtube_helper.get_transcript(video_id)
+
+
+def run_concurrent(video_ids, workers):
+    for _ in youtube_helper.fetch_transcripts(video_ids, max_workers=workers):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크립트 추출 단계 벤치마크")
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="요청 하나당 지연 시간 (초)")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    # get_transcript의 진행 기록은 측정 대상이 아니므로 오류만 출력
+    setup_logging("ERROR")
+    transcripts = fakes.FakeTranscriptApi(faults=fakes.Faults(args.latency))
+    video_ids = [f"vid{i:05d}" for i in range(args.videos)]
+
+    timings = {}
+    with fakes.install(transcripts=transcripts):
+        for name, func in (("sequential", lambda: run_sequential(video_ids)),
+                           ("concurrent", lambda: run_concurrent(video_ids, args.workers))):
+            start = time.perf_counter()
+            func()
+            timings[name] = time.perf_counter() - start
+            print(f"{name:>10}: {timings[name]:.2f}s")
+
+    print(f"   speedup: {timings['sequential'] / timings['concurrent']:.1f}x "
+          f"({args.videos}개 영상, 작업자 {args.workers}개, 지연 {args.latency}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# benchmarks/fakes.py
+# 벤치마크용 가짜 백엔드: googleapiclient YouTube 리소스, YouTubeTranscriptApi, genai.GenerativeModel을
+# 네트워크 없이 흉내 냅니다. 요청마다 지연 시간과 오류율을 설정할 수 있고, 같은 seed면 같은 순서로 오류가 납니다.
+# install()로 utils 모듈에 끼워 넣으면 실제 코드 경로(youtube_helper, gemini_helper, 파이프라인)를 그대로 실행합니다.
+
+import collections
+import contextlib
+import json
+import random
+import threading
+import time
+
+from utils import youtube_helper, gemini_helper
+from utils.youtube_client import YouTubeClientPool
+
+
+class FakeBackendError(Exception):
+    """가짜 백엔드가 오류율에 따라 발생시키는 오류. code는 HTTP 상태(기본 503, 재시도 대상)를 흉내 냅니다."""
+
+    def __init__(self, message, code=503):
+        super().__init__(message)
+        self.code = code
+
+
+class Faults:
+    """
+    요청마다 적용할 지연 시간(초)과 오류율(0~1).
+    jitter는 지연 시간의 변동 비율이며, 예를 들어 0.2이면 지연 시간의 ±20% 안에서 무작위로 정합니다.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, jitter=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = collections.Counter()
+        self.errors = collections.Counter()
+
+    def hit(self, name):
+        """name 요청 하나를 흉내 냅니다. 지연 후 오류율에 따라 FakeBackendError를 발생시킵니다."""
+        with self._lock:
+            self.calls[name] += 1
+            delay = self.latency * (1 + self._random.uniform(-self.jitter, self.jitter)) if self.latency else 0.0
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors[name] += 1
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise FakeBackendError(f"가짜 {name} 요청 실패")
+
+
+# --- YouTube Data API ---
+
+class _Request:
+    def __init__(self, faults, name, build):
+        self._faults = faults
+        self._name = name
+        self._build = build
+
+    def execute(self):
+        self._faults.hit(self._name)
+        return self._build()
+
+
+class _Resource:
+    def __init__(self, youtube, name):
+        self._youtube = youtube
+        self._name = name
+
+    def list(self, **kwargs):
+        return _Request(self._youtube.faults, self._name, lambda: getattr(self._youtube, f"_{self._name}")(**kwargs))
+
+
+class FakeYouTube:
+    """
+    영상 video_count개가 올라간 채널 하나를 가진 YouTube Data API 리소스.
+    search / channels / playlistItems / videos의 list(...).execute()를 지원합니다.
+    """
+
+    CHANNEL_ID = "UC" + "b" * 22
+    PLAYLIST_ID = "UU" + "b" * 22
+
+    def __init__(self, video_count=100, faults=None):
+        self.faults = faults or Faults()
+        self.video_ids = [f"bench{i:06d}" for i in range(video_count)]
+
+    def search(self):
+        return _Resource(self, "search")
+
+    def channels(self):
+        return _Resource(self, "channels")
+
+    def playlistItems(self):
+        return _Resource(self, "playlistItems")
+
+    def videos(self):
+        return _Resource(self, "videos")
+
+    def _search(self, **kwargs):
+        return {'items': [{'id': {'channelId': self.CHANNEL_ID}}]}
+
+    def _channels(self, **kwargs):
+        return {'items': [{'contentDetails': {'relatedPlaylists': {'uploads': self.PLAYLIST_ID}}}]}
+
+    def _playlistItems(self, playlistId, part, maxResults, pageToken=None):
+        start = int(pageToken or 0)
+        items = []
+        for index in range(start, min(start + maxResults, len(self.video_ids))):
+            video_id = self.video_ids[index]
+            # 최신 영상이 먼저 오도록 번호가 클수록 오래된 영상
+            published_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(1700000000 - index * 3600))
+            items.append({
+                'snippet': {
+                    'title': f"벤치마크 영상 {index}" + (" #비밀치트키" if index % 10 == 9 else ""),
+                    'publishedAt': published_at,
+                    'channelId': self.CHANNEL_ID,
+                    'resourceId': {'videoId': video_id},
+                },
+                'contentDetails': {'videoId': video_id, 'videoPublishedAt': published_at},
+            })
+        response = {'items': items}
+        if start + maxResults < len(self.video_ids):
+            response['nextPageToken'] = str(start + maxResults)
+        return response
+
+    def _videos(self, id, part):
+        items = []
+        for video_id in id.split(','):
+            index = int(video_id[len("bench"):])
+            items.append({
+                'id': video_id,
+                'contentDetails': {'duration': f"PT{3 + index % 40}M{index % 60}S"},
+                'snippet': {'title': f"벤치마크 영상 {index}", 'publishedAt': "2024-01-01T00:00:00Z", 'channelId': self.CHANNEL_ID},
+            })
+        return {'items': items}
+
+
+class _FakeClientPool(YouTubeClientPool):
+    """모든 스레드가 같은 가짜 리소스를 사용하는 클라이언트 풀"""
+
+    def __init__(self, fake, max_workers):
+        super().__init__("fake-key", max_workers)
+        self._fake = fake
+
+    def client(self):
+        return self._fake
+
+
+# --- youtube-transcript-api ---
+
+class FakeTranscript:
+    def __init__(self, api, video_id, language_code='ko', is_generated=False):
+        self._api = api
+        self.video_id = video_id
+        self.language_code = language_code
+        self.language = language_code
+        self.is_generated = is_generated
+        self.is_translatable = False
+
+    def fetch(self):
+        self._api.faults.hit("transcript_fetch")
+        words = self._api.words_per_segment
+        return [
+            {'text': " ".join(f"{self.video_id}-단어{i}-{w}" for w in range(words)), 'start': i * 4.0, 'duration': 4.0}
+            for i in range(self._api.segments)
+        ]
+
+
+class FakeTranscriptApi:
+    """
+    YouTubeTranscriptApi.list_transcripts를 흉내 냅니다. 영상마다 수동 한국어 / 자동 생성 영어 자막이 있으며,
+    fetch하면 segments개의 세그먼트(세그먼트당 words_per_segment 단어)를 돌려줍니다.
+    """
+
+    def __init__(self, segments=200, words_per_segment=8, faults=None):
+        self.segments = segments
+        self.words_per_segment = words_per_segment
+        self.faults = faults or Faults()
+
+    def list_transcripts(self, video_id, proxies=None):
+        self.faults.hit("transcript_list")
+        return [FakeTranscript(self, video_id, 'en', True), FakeTranscript(self, video_id, 'ko', False)]
+
+
+# --- Gemini ---
+
+class _Part:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Response:
+    def __init__(self, text):
+        self.parts = [_Part(text)]
+        self.text = text
+
+
+class FakeGenerativeModel:
+    def __init__(self, gemini, model_name):
+        self._gemini = gemini
+        self.model_name = model_name
+
+    def generate_content(self, prompt, stream=False, generation_config=None, **kwargs):
+        self._gemini.faults.hit("gemini")
+        text = self._gemini.respond(prompt, structured=generation_config is not None)
+        if not stream:
+            return _Response(text)
+        size = self._gemini.chunk_chars
+        return iter([_Response(text[i:i + size]) for i in range(0, len(text), size)])
+
+
+class FakeGemini:
+    """
+    genai 모듈 대신 쓰는 객체. GenerativeModel(model_name)은 프롬프트의 작업 JSON을 읽어
+    작업마다 result_chars 글자 정도의 결과를 담은 배치 응답을 돌려줍니다.
+    스트리밍이면 chunk_chars 글자씩 나누어 돌려줍니다.
+    """
+
+    def __init__(self, result_chars=1500, chunk_chars=200, faults=None):
+        self.result_chars = result_chars
+        self.chunk_chars = chunk_chars
+        self.faults = faults or Faults()
+
+    def GenerativeModel(self, model_name, **kwargs):
+        return FakeGenerativeModel(self, model_name)
+
+    def configure(self, **kwargs):
+        pass
+
+    def get_model(self, name):
+        return {"name": name}
+
+    def summary(self, task_id):
+        """작업 하나의 가짜 요약 결과 (제목 줄 + result_chars 글자 본문)"""
+        body = ("요약 문장입니다. " * (self.result_chars // 9 + 1))[:self.result_chars]
+        return f"# {task_id} 요약\n\n{body}"
+
+    def respond(self, prompt, structured=False):
+        """프롬프트의 작업 JSON 배열을 읽어 작업마다 결과를 담은 응답 텍스트를 만듭니다. 구조화 출력이 아니면 ```json 블록으로 감쌉니다."""
+        start = prompt.index('[{"id"')
+        tasks, _ = json.JSONDecoder().raw_decode(prompt, start)
+        text = json.dumps([{"id": task["id"], "result": self.summary(task["id"])} for task in tasks], ensure_ascii=False)
+        return text if structured else f"```json\n{text}\n```"
+
+
+@contextlib.contextmanager
+def install(youtube=None, transcripts=None, gemini=None, youtube_workers=4):
+    """
+    주어진 가짜 백엔드를 utils 모듈에 끼워 넣고, with 블록이 끝나면 원래대로 돌려놓습니다.
+
+    Args:
+        youtube (FakeYouTube, optional): youtube_helper.youtube 대신 사용할 리소스
+        transcripts (FakeTranscriptApi, optional): youtube_helper.YouTubeTranscriptApi 대신 사용할 객체
+        gemini (FakeGemini, optional): gemini_helper의 genai 모듈 대신 사용할 객체
+    """
+    saved = (youtube_helper.youtube, youtube_helper.YouTubeTranscriptApi, gemini_helper._genai)
+    try:
+        if youtube is not None:
+            youtube_helper.youtube = _FakeClientPool(youtube, youtube_workers)
+        if transcripts is not None:
+            youtube_helper.YouTubeTranscriptApi = transcripts
+        if gemini is not None:
+            gemini_helper._genai = gemini
+        youtube_helper._prefetched_pages.clear()
+        yield
+    finally:
+        youtube_helper.youtube, youtube_helper.YouTubeTranscriptApi, gemini_helper._genai = saved
+        youtube_helper._prefetched_pages.clear()
@@ -0,0 +1,329 @@
+# benchmarks/run_benchmarks.py
+# 가짜 YouTube / 자막 / Gemini 백엔드(benchmarks/fakes.py)로 API 할당량 없이 각 단계와 전체 파이프라인의
+# 소요 시간을 영상 10 / 100 / 1000개 규모에서 측정합니다. 결과는 JSONL 기록 파일에 한 줄씩 추가되며,
+# 같은 조건의 이전 실행과 비교해 threshold 이상 느려진 항목을 회귀로 표시합니다.
+# 실행: python benchmarks/run_benchmarks.py --scales 10,100,1000 --latency 0.02 --error-rate 0.01
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks import fakes
+from utils import youtube_helper, gemini_helper
+from utils.config_helper import PROJECT_ROOT, load_config
+from utils.engine import Engine
+from utils.file_helper import save_as_obsidian_note
+from utils.log_helper import setup_logging
+from utils.metrics import METRICS
+from utils.note_writer import NoteWriter
+from utils.pipeline import build_task
+
+CHANNEL_URL = "https://www.youtube.com/@benchmark"
+PROMPT = "다음 텍스트를 요약하고 정리해주세요:\n\n"
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def _faults(args, seed):
+    return fakes.Faults(args.latency, args.error_rate, args.jitter, seed)
+
+
+def _backends(args, count):
+    """규모(count)에 맞는 가짜 백엔드 세 개를 만듭니다. 백엔드마다 seed를 달리해 오류 위치가 겹치지 않게 함"""
+    youtube = fakes.FakeYouTube(count, _faults(args, args.seed))
+    transcripts = fakes.FakeTranscriptApi(args.segments, args.words, _faults(args, args.seed + 1))
+    gemini = fakes.FakeGemini(args.result_chars, faults=_faults(args, args.seed + 2))
+    return youtube, transcripts, gemini
+
+
+def _errors(*backends):
+    return sum(sum(backend.faults.errors.values()) for backend in backends)
+
+
+def _transcript_text(video_id, args):
+    """오류 없이 가짜 자막 하나를 텍스트로 만듭니다. (Gemini / 노트 단계의 입력용)"""
+    api = fakes.FakeTranscriptApi(args.segments, args.words)
+    return " ".join(segment['text'] for segment in fakes.FakeTranscript(api, video_id).fetch())
+
+
+def bench_channel_listing(args, count, workdir):
+    """get_videos_from_channel로 채널의 모든 페이지를 끝까지 불러옵니다."""
+    youtube, _, _ = _backends(args, count)
+    loaded = 0
+    with fakes.install(youtube=youtube, youtube_workers=args.workers):
+        page_token = None
+        while True:
+            videos, page_token = youtube_helper.get_videos_from_channel(
+                CHANNEL_URL, include_shorts=True, max_results=50, page_token=page_token
+            )
+            loaded += len(videos)
+            if not page_token:
+                break
+    return {"items": loaded, "errors": _errors(youtube)}
+
+
+def bench_transcripts_sequential(args, count, workdir):
+    """get_transcript를 영상마다 차례로 호출합니다."""
+    _, transcripts, _ = _backends(args, count)
+    found = 0
+    with fakes.install(transcripts=transcripts):
+        for index in range(count):
+            text, _ = youtube_helper.get_transcript(f"bench{index:06d}")
+            found += text is not None
+    return {"items": found, "errors": _errors(transcripts)}
+
+
+def bench_transcripts_concurrent(args, count, workdir):
+    """fetch_transcripts로 작업자 args.workers개가 동시에 자막을 가져옵니다."""
+    _, transcripts, _ = _backends(args, count)
+    found = 0
+    with fakes.install(transcripts=transcripts):
+        video_ids = [f"bench{index:06d}" for index in range(count)]
+        for _, text, _, error in youtube_helper.fetch_transcripts(video_ids, max_workers=args.workers):
+            found += text is not None and error is None
+    return {"items": found, "errors": _errors(transcripts)}
+
+
+def _gemini_tasks(args, count):
+    return [
+        build_task({'id': f"bench{index:06d}", 'title': f"벤치마크 영상 {index}"}, PROMPT, _transcript_text(f"bench{index:06d}", args))
+        for index in range(count)
+    ]
+
+
+def bench_gemini_batches(args, count, workdir):
+    """process_batch_with_gemini로 batch_size개씩 묶어 차례로 요청합니다. (재시도 없음, 실패한 배치는 오류로 셈)"""
+    _, _, gemini = _backends(args, count)
+    tasks = _gemini_tasks(args, count)
+    model = gemini.GenerativeModel("fake-gemini")
+    results = 0
+    for start in range(0, len(tasks), args.batch_size):
+        try:
+            results += len(gemini_helper.process_batch_with_gemini(tasks[start:start + args.batch_size], model=model, structured=True))
+        except fakes.FakeBackendError:
+            pass
+    return {"items": results, "errors": _errors(gemini)}
+
+
+def _notes(args, count):
+    gemini = fakes.FakeGemini(args.result_chars)
+    return [(f"bench{index:06d}", f"벤치마크 영상 {index}", gemini.summary(f"노트 {index}")) for index in range(count)]
+
+
+def bench_notes_direct(args, count, workdir):
+    """save_as_obsidian_note로 노트를 하나씩 저장합니다."""
+    directory = os.path.join(workdir, "notes")
+    for video_id, title, content in _notes(args, count):
+        save_as_obsidian_note(directory, content, original_title=title, metadata={"video_id": video_id, "title": title})
+    return {"items": len(os.listdir(directory)), "errors": 0}
+
+
+def bench_notes_writer(args, count, workdir):
+    """파이프라인과 같은 NoteWriter(백그라운드 원자적 쓰기)로 노트를 저장합니다."""
+    directory = os.path.join(workdir, "notes")
+    writer = NoteWriter(directory, log=_noop)
+    for video_id, title, content in _notes(args, count):
+        writer.write(content, original_title=title, metadata={"video_id": video_id, "title": title})
+    writer.close()
+    return {"items": len(os.listdir(directory)), "errors": 0}
+
+
+def bench_pipeline(args, count, workdir):
+    """
+    Engine으로 채널 영상 목록을 불러온 뒤 스크립트 추출 → 요약 → 저장 파이프라인 전체를 실행합니다.
+    캐시와 노트 폴더는 임시 폴더에 새로 만들며, Gemini 속도 제한(rpm / tpm)은 끕니다.
+    """
+    youtube, transcripts, gemini = _backends(args, count)
+    config = load_config()
+    config.update({
+        "obsidian_path": os.path.join(workdir, "notes"),
+        "transcript_cache_path": "cache/transcripts.sqlite3",
+        "channel_cache_path": "cache/channels.sqlite3",
+        "result_cache_path": "cache/results.sqlite3",
+        "video_index_path": "cache/videos.sqlite3",
+        "job_journal_dir": "cache/jobs",
+        "vault_index_dir": "cache/vaults",
+        "metrics_path": "",
+        "index_initial_pages": count // 50 + 1,
+        "include_shorts": True,
+        "min_video_duration": 0,
+        "transcript_workers": args.workers,
+        "youtube_api_workers": args.workers,
+        "gemini_batch_size": args.batch_size,
+        "gemini_rpm": 0,
+        "gemini_tpm": 0,
+    })
+    with fakes.install(youtube=youtube, transcripts=transcripts, gemini=gemini, youtube_workers=args.workers):
+        engine = Engine(config, base_dir=workdir)
+        videos, _ = engine.load_channel_videos(CHANNEL_URL)
+        summary = engine.process(videos, PROMPT, config["obsidian_path"], log=_noop)
+    histograms = summary["metrics"]["histograms"]
+    return {
+        "items": len(summary["saved"]),
+        "errors": _errors(youtube, transcripts, gemini),
+        "failed": len(summary["failed"]),
+        "skipped": len(summary["skipped"]),
+        "stages_p50": {name: stats["p50"] for name, stats in sorted(histograms.items())},
+    }
+
+
+SCENARIOS = {
+    "channel_listing": bench_channel_listing,
+    "transcripts_sequential": bench_transcripts_sequential,
+    "transcripts_concurrent": bench_transcripts_concurrent,
+    "gemini_batches": bench_gemini_batches,
+    "notes_direct": bench_notes_direct,
+    "notes_writer": bench_notes_writer,
+    "pipeline": bench_pipeline,
+}
+
+
+def run_scenario(name, args, count):
+    workdir = tempfile.mkdtemp(prefix=f"bench-{name}-")
+    METRICS.reset()
+    try:
+        start = time.perf_counter()
+        result = SCENARIOS[name](args, count, workdir)
+        result["seconds"] = round(time.perf_counter() - start, 4)
+    except Exception as e:
+        result = {"seconds": None, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    result["videos"] = count
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parameters(args):
+    """같은 조건끼리만 비교하도록 기록에 남기는 실행 조건"""
+    return {key: getattr(args, key) for key in (
+        "latency", "error_rate", "jitter", "seed", "segments", "words", "result_chars", "workers", "batch_size"
+    )}
+
+
+def load_previous(path, parameters):
+    """기록 파일에서 같은 실행 조건의 마지막 기록을 찾습니다. 없으면 None을 반환합니다."""
+    previous = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("parameters") == parameters:
+                    previous = entry
+    except FileNotFoundError:
+        pass
+    return previous
+
+
+def append_history(path, entry):
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def compare(results, previous, threshold):
+    """
+    이전 기록과 비교한 표의 줄 목록과 회귀 항목 목록을 반환합니다.
+    소요 시간이 threshold(비율) 넘게 늘어난 항목을 회귀로 봅니다.
+    """
+    old_results = (previous or {}).get("results", {})
+    lines = []
+    regressions = []
+    for key, result in results.items():
+        seconds = result.get("seconds")
+        if seconds is None:
+            lines.append(f"  {key:<32} 실패: {result.get('error')}")
+            continue
+        line = f"  {key:<32} {seconds:>9.3f}초  처리 {result['items']:>5}  오류 {result['errors']:>4}"
+        old_seconds = old_results.get(key, {}).get("seconds")
+        if old_seconds:
+            change = (seconds - old_seconds) / old_seconds
+            line += f"  이전 대비 {change:+.1%}"
+            if change > threshold:
+                line += "  ← 회귀"
+                regressions.append(key)
+        lines.append(line)
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 백엔드를 사용한 오프라인 벤치마크")
+    parser.add_argument("--scales", default="10,100,1000", help="측정할 영상 수 목록 (쉼표로 구분)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="실행할 시나리오 (쉼표로 구분, 기본값: 전체)")
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 요청 하나당 지연 시간 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 시간 변동 비율 (0.2이면 ±20%%)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 요청이 실패할 확률 (0~1)")
+    parser.add_argument("--seed", type=int, default=0, help="지연·오류 난수 seed")
+    parser.add_argument("--segments", type=int, default=200, help="자막 하나의 세그먼트 수")
+    parser.add_argument("--words", type=int, default=8, help="세그먼트 하나의 단어 수")
+    parser.add_argument("--result-chars", type=int, default=1500, help="가짜 Gemini 요약 결과 하나의 글자 수")
+    parser.add_argument("--workers", type=int, default=4, help="자막 / YouTube API 동시 작업자 수")
+    parser.add_argument("--batch-size", type=int, default=30, help="Gemini 요청 하나에 묶을 영상 수")
+    parser.add_argument("--history", default=os.path.join(PROJECT_ROOT, "cache", "benchmarks.jsonl"), help="결과를 추가할 기록 파일")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 표시할 소요 시간 증가 비율 (기본값: 0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1로 끝냄")
+    parser.add_argument("--no-record", action="store_true", help="기록 파일에 결과를 추가하지 않음")
+    args = parser.parse_args()
+
+    # 오류율을 준 실행에서는 경고가 쏟아지므로 오류만 출력
+    setup_logging("ERROR")
+    scales = [int(value) for value in args.scales.split(",") if value.strip()]
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)}")
+
+    results = {}
+    for count in scales:
+        for name in names:
+            results[f"{name}@{count}"] = run_scenario(name, args, count)
+            print(f"  · {name}@{count}: {results[f'{name}@{count}'].get('seconds')}초", file=sys.stderr)
+
+    parameters = _parameters(args)
+    previous = load_previous(args.history, parameters)
+    lines, regressions = compare(results, previous, args.threshold)
+    print(f"--- 벤치마크 결과 (이전 기록: {previous['timestamp'] + ' / ' + str(previous.get('commit')) if previous else '없음'}) ---")
+    for line in lines:
+        print(line)
+
+    if not args.no_record:
+        append_history(args.history, {
+            "timestamp": datetime.now().astimezone().isoformat(timespec='seconds'),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "parameters": parameters,
+            "results": results,
+        })
+        print(f"결과를 '{args.history}'에 기록했습니다.")
+
+    if regressions:
+        print(f"회귀 {len(regressions)}건: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# cli.py
+# GUI 없이 채널 URL 또는 영상 ID 목록을 받아 스크립트 추출 → Gemini 요약 → 노트 저장을 실행하는 명령줄 실행기입니다.
+# 디스플레이가 없는 서버의 cron 작업 등에서 사용할 수 있습니다.
+#
+# 예시:
+#   python cli.py --channel https://www.youtube.com/@gogo_work --output ./notes --summary run.json
+#   python cli.py --video dQw4w9WgXcQ --video-file ids.txt --prompt-file my_prompt.txt
+#
+# 종료 코드:
+#   0 모든 영상 처리 성공 (또는 처리할 영상 없음)
+#   1 일부 영상 처리 실패
+#   2 잘못된 인자 또는 설정 오류 (API 키 없음, 영상 목록 / 프롬프트 파일을 읽을 수 없음 등)
+#   3 실행 중 오류 (네트워크 / API 오류, 예기치 못한 오류)
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+EXIT_OK = 0
+EXIT_PARTIAL_FAILURE = 1
+EXIT_CONFIG_ERROR = 2
+EXIT_RUNTIME_ERROR = 3
+
+class ConfigError(Exception):
+    """영상 처리를 시작하기 전에 발견한 인자 / 설정 문제 (종료 코드 2)"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="YouTube 스크립트를 Gemini로 요약하여 Obsidian 노트로 저장합니다.")
+    source = parser.add_argument_group("처리할 영상")
+    source.add_argument("--channel", action="append", default=[], metavar="URL", help="유튜브 채널 URL (여러 번 지정 가능)")
+    source.add_argument("--video", action="append", default=[], metavar="ID", help="영상 ID 또는 영상 URL (여러 번 지정 가능)")
+    source.add_argument("--video-file", metavar="PATH", help="영상 ID 또는 URL이 한 줄에 하나씩 적힌 파일")
+    source.add_argument("--max-videos", type=int, default=50, help="채널마다 처리할 최대 영상 수 (기본값: 50)")
+    source.add_argument("--skip-processed", action="store_true",
+                        help="노트 폴더에 노트가 있거나 영상 인덱스에 처리 완료로 기록된 영상은 건너뜀"
+                             " (vault_index_dir 필요, 채널만 지정하면 video_index_path로도 가능)")
+
+    options = parser.add_argument_group("처리 옵션")
+    options.add_argument("--config", help="설정 파일 경로 (기본값: 프로젝트 폴더의 config.json)")
+    options.add_argument("--prompt-file", help="프롬프트 파일 (.json의 'prompt' 항목 또는 텍스트 파일, 기본값: default_prompt.json)")
+    options.add_argument("--output", help="노트 저장 폴더 (기본값: config.json의 obsidian_path)")
+    options.add_argument("--model", help="Gemini 모델 이름 (기본값: config.json의 gemini_model)")
+    options.add_argument("--batch-size", type=int, help="Gemini 요청 하나에 묶을 영상 수")
+    options.add_argument("--workers", type=int, help="동시에 스크립트를 가져올 작업자 수")
+    options.add_argument("--timeout", type=int, help="영상 하나의 스크립트 추출 제한 시간 (초)")
+    options.add_argument("--include-shorts", action="store_true", default=None, help="Shorts 영상 포함")
+    options.add_argument("--min-duration", type=int, help="최소 영상 길이 (초)")
+    options.add_argument("--keep-original-title", action="store_true", default=None, help="원본 영상 제목을 파일 이름으로 사용")
+
+    output = parser.add_argument_group("출력")
+    output.add_argument("--summary", default="-", metavar="PATH", help="실행 결과 JSON을 저장할 경로 ('-'이면 표준 출력, 기본값)")
+    output.add_argument("--quiet", action="store_true", help="진행 로그를 출력하지 않음 (경고 이상만 출력)")
+    output.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="로그 수준 (기본값: config.json의 log_level)")
+    output.add_argument("--log-json", action="store_true", default=None, help="로그를 한 줄에 JSON 객체 하나씩 출력")
+    return parser.parse_args(argv)
+
+def read_video_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def apply_overrides(config, args):
+    """명령줄 인자로 지정된 값으로 설정을 덮어씁니다."""
+    overrides = {
+        "obsidian_path": args.output,
+        "gemini_model": args.model,
+        "gemini_batch_size": args.batch_size,
+        "transcript_workers": args.workers,
+        "transcript_timeout": args.timeout,
+        "include_shorts": args.include_shorts,
+        "min_video_duration": args.min_duration,
+        "keep_original_title": args.keep_original_title,
+    }
+    config = dict(config)
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    return config
+
+def collect_videos(engine, args, video_ids, output_dir, log):
+    """
+    채널 인자와 영상 ID 목록(video_ids)으로부터 중복 없는 처리 대상 목록을 만듭니다.
+    --skip-processed이면 영상을 어디서 불러왔는지와 관계없이 노트 폴더 / 영상 인덱스 기준으로 처리한 영상을 뺍니다.
+    """
+    videos = []
+    seen = set()
+
+    def add(batch):
+        for video in batch:
+            if video['id'] in seen:
+                continue
+            seen.add(video['id'])
+            videos.append(video)
+
+    for channel_url in args.channel:
+        log(f"--- 채널 영상 목록 불러오는 중: {channel_url} ---")
+        channel_videos, page_token = engine.load_channel_videos(channel_url)
+        while page_token and len(channel_videos) < args.max_videos:
+            more_videos, page_token = engine.load_more_channel_videos(channel_url, page_token)
+            channel_videos.extend(more_videos)
+        add(channel_videos[:args.max_videos])
+
+    if video_ids:
+        add(engine.load_videos_by_ids(video_ids))
+
+    if args.skip_processed:
+        processed = engine.processed_video_ids(output_dir, [video['id'] for video in videos])
+        if processed:
+            log(f"  - 이미 처리한 영상 {sum(1 for video in videos if video['id'] in processed)}개를 건너뜁니다.")
+            videos = [video for video in videos if video['id'] not in processed]
+    return videos
+
+def prepare(args, configure_logging):
+    """
+    설정, 프롬프트, 영상 ID 목록을 읽고 엔진을 만듭니다. (config, 프롬프트, 영상 ID 목록, 엔진)을 반환합니다.
+    여기서 발생한 문제는 네트워크 요청 전의 인자 / 설정 문제이므로 ConfigError로 바꿉니다.
+    """
+    try:
+        from utils import youtube_helper, gemini_helper
+        from utils.config_helper import load_config, load_prompt_from_json
+        from utils.engine import Engine
+
+        config = apply_overrides(load_config(os.path.abspath(args.config) if args.config else "config.json"), args)
+        configure_logging(config)
+        if not youtube_helper.YOUTUBE_API_KEY or not gemini_helper.GEMINI_API_KEY:
+            raise ConfigError("API 키가 설정되지 않았습니다. MYAPI.json 파일을 확인해주세요.")
+        if not config.get("obsidian_path"):
+            raise ConfigError("노트 저장 폴더가 지정되지 않았습니다. --output 또는 config.json의 obsidian_path를 설정해주세요.")
+        if args.skip_processed and not config.get("vault_index_dir"):
+            # 영상 인덱스에는 채널 동기화로 불러온 영상만 있으므로, ID로 지정한 영상은 노트 폴더 인덱스로만 확인할 수 있음
+            if args.video or args.video_file:
+                raise ConfigError("--video / --video-file과 --skip-processed를 함께 사용하려면 config.json의 vault_index_dir을 설정해야 합니다.")
+            if not config.get("video_index_path"):
+                raise ConfigError("--skip-processed를 사용하려면 config.json의 video_index_path 또는 vault_index_dir을 설정해야 합니다.")
+        if args.prompt_file and not os.path.isfile(args.prompt_file):
+            raise ConfigError(f"프롬프트 파일을 찾을 수 없습니다: {args.prompt_file}")
+        user_prompt = load_prompt_from_json(os.path.abspath(args.prompt_file) if args.prompt_file else "default_prompt.json")
+        video_ids = list(args.video)
+        if args.video_file:
+            video_ids.extend(read_video_file(args.video_file))
+        return config, user_prompt, video_ids, Engine(config)
+    except (ValueError, OSError) as e:
+        raise ConfigError(str(e)) from e
+
+def write_summary(summary, path):
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    if path == "-":
+        print(text)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.channel and not args.video and not args.video_file:
+        print("오류: --channel, --video, --video-file 중 하나 이상을 지정해야 합니다.", file=sys.stderr)
+        return EXIT_CONFIG_ERROR
+
+    from utils.log_helper import setup_logging
+    logger = logging.getLogger("cli")
+
+    def configure_logging(config=None):
+        config = config or {}
+        level = "WARNING" if args.quiet else args.log_level or config.get("log_level", "INFO")
+        json_output = config.get("log_json", False) if args.log_json is None else args.log_json
+        setup_logging(level, json_output)
+
+    def log(message):
+        logger.info(message)
+
+    configure_logging()
+
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    summary = {"started_at": started_at.isoformat(), "total": 0, "saved": [], "failed": [], "skipped": [], "cached": [], "existing": []}
+    exit_code = EXIT_OK
+
+    # 도우미 모듈의 진행 출력이 표준 출력의 JSON 요약과 섞이지 않도록 표준 오류로 보냄
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            config, user_prompt, video_ids, engine = prepare(args, configure_logging)
+            summary["startup_seconds"] = round(time.monotonic() - start, 3)
+            videos = collect_videos(engine, args, video_ids, config["obsidian_path"], log)
+            log(f"--- 총 {len(videos)}개 영상 배치 처리 시작 ---")
+            if videos:
+                summary.update(engine.process(videos, user_prompt, config["obsidian_path"], log=log))
+            summary["output"] = config["obsidian_path"]
+            if summary["failed"]:
+                exit_code = EXIT_PARTIAL_FAILURE
+        except ConfigError as e:
+            logger.error("설정 오류: %s", e)
+            summary["error"] = str(e)
+            exit_code = EXIT_CONFIG_ERROR
+        except (ValueError, OSError) as e:
+            # 채널 조회 실패(resolve_channel의 ValueError), 연결 끊김 / 시간 초과 등 실행 중 네트워크 / API 오류
+            logger.error("오류: %s", e)
+            summary["error"] = str(e)
+            exit_code = EXIT_RUNTIME_ERROR
+        except Exception as e:
+            logger.exception("오류: 예기치 못한 문제 발생 - %s", e)
+            summary["error"] = str(e)
+            exit_code = EXIT_RUNTIME_ERROR
+
+    summary["finished_at"] = datetime.now(timezone.utc).isoformat()
+    summary["elapsed_seconds"] = round(time.monotonic() - start, 3)
+    summary["exit_code"] = exit_code
+    write_summary(summary, args.summary)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
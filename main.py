@@ -1,109 +1,77 @@
 # main.py
 # tkinter를 사용하여 GUI 애플리케이션을 생성하고 전체 프로세스를 제어합니다.
 
+import time
+STARTED_AT = time.perf_counter() # 시작 시간 측정용 (다른 모듈을 불러오기 전)
+
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
+import logging
+import os
 import threading
 import queue
-import json
-import os
 from datetime import datetime
 import pytz
-import time
-import sys
-
-sys.stdout.reconfigure(encoding='utf-8')
-from utils import youtube_helper, gemini_helper, file_helper
-
-def load_config(filepath="config.json"):
-    """JSON 파일에서 설정을 로드합니다."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, filepath)
-    defaults = {
-        "font_size": 12, 
-        "theme": "dark",
-        "obsidian_path": "C:/Users/bounc/OneDrive/문서/SummerVCT/Notes",
-        "gemini_batch_size": 30,
-        "youtube_url": "https://www.youtube.com/@slow_doctor",
-        "min_video_duration": 120, # Default to 2 minutes (120 seconds)
-        "run_ip_test": True, # Default to True
-        "gemini_model": "gemini-2.5-flash", # Default Gemini model
-        "list_load_batch_size": 30, # Default to 30
-        "include_shorts": False, # Default to False
-        "keep_original_title": False # Default to False
-    }
-
-    if not os.path.exists(config_path):
-        return defaults
-
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            return {
-                "font_size": config.get("font_size", defaults["font_size"]),
-                "theme": config.get("theme", defaults["theme"]),
-                "obsidian_path": config.get("obsidian_path", defaults["obsidian_path"]),
-                "gemini_batch_size": config.get("gemini_batch_size", defaults["gemini_batch_size"]),
-                "youtube_url": config.get("youtube_url", defaults["youtube_url"]),
-                "min_video_duration": config.get("min_video_duration", defaults["min_video_duration"]),
-                "run_ip_test": config.get("run_ip_test", defaults["run_ip_test"]),
-                "gemini_model": config.get("gemini_model", defaults["gemini_model"]),
-                "list_load_batch_size": config.get("list_load_batch_size", defaults["list_load_batch_size"]),
-                "include_shorts": config.get("include_shorts", defaults["include_shorts"]),
-                "keep_original_title": config.get("keep_original_title", defaults["keep_original_title"])
-            }
-    except (json.JSONDecodeError, IOError):
-        return defaults
-
-def load_prompt_from_json(filepath="default_prompt.json"):
-    """JSON 파일에서 기본 프롬프트를 로드합니다."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_path = os.path.join(script_dir, filepath)
-    
-    if not os.path.exists(json_path):
-        print(f"경고: {json_path} 파일을 찾을 수 없습니다. 기본 프롬프트를 사용합니다.")
-        return "다음 텍스트를 요약하고 정리해주세요:\n\n"
-    
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get("prompt", "다음 텍스트를 요약하고 정리해주세요:\n\n")
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"경고: 프롬프트 파일 로딩 실패 - {e}. 기본 프롬프트를 사용합니다.")
-        return "다음 텍스트를 요약하고 정리해주세요:\n\n"
-
-# --- 기본 설정 ---
-DEFAULT_PROMPT = load_prompt_from_json()
-CONFIG = load_config()
+from utils import youtube_helper, gemini_helper
+from utils.config_helper import PROJECT_ROOT, load_config, load_prompt_from_json
+from utils.engine import Engine
+from utils.log_helper import setup_logging, add_callback_sink
+
+logger = logging.getLogger("main")
+
+# Scene 2 정렬 선택 상자의 표시 이름 → VideoCatalog 정렬 키
+SORT_LABELS = {
+    "최신순": "newest",
+    "오래된순": "oldest",
+    "긴 영상순": "longest",
+    "짧은 영상순": "shortest",
+    "제목순": "title",
+}
+TREE_INSERT_CHUNK = 200 # Scene 2 목록에 한 번에 넣는 행 수
+FILTER_DELAY_MS = 250 # 검색어 입력이 멈춘 뒤 목록을 다시 그리기까지 기다리는 시간
+QUEUE_POLL_MS = 50 # 작업 스레드 메시지 큐를 확인하는 간격
+QUEUE_SLICE_SECONDS = 0.02 # 한 번 확인할 때 메시지 처리에 쓰는 최대 시간 (넘으면 다음 확인으로 미룸)
+LOG_MAX_LINES = 5000 # 진행 상황 창에 남겨 둘 최대 줄 수
+KST = pytz.timezone('Asia/Seoul')
 
 class App(tk.Tk):
-    def __init__(self):
+    def __init__(self, config, default_prompt):
         super().__init__()
+        self.config_data = config
+        self.default_prompt = default_prompt
+        self.engine = Engine(config)
         self.title("YouTube 스크립트 분석기")
         self.geometry("1324x768")
 
         # --- UI 상태 변수 ---
-        self.font_size = CONFIG['font_size']
-        self.is_dark_mode = tk.BooleanVar(value=(CONFIG['theme'] == 'dark'))
-        self.include_shorts = tk.BooleanVar(value=CONFIG.get('include_shorts', False))
-        self.min_duration_seconds = tk.IntVar(value=CONFIG.get('min_video_duration', 120))
-        self.keep_original_title = tk.BooleanVar(value=CONFIG.get('keep_original_title', False))
-        self.gemini_model_var = tk.StringVar(value=CONFIG.get('gemini_model', 'gemini-2.5-flash'))
+        self.font_size = self.config_data['font_size']
+        self.is_dark_mode = tk.BooleanVar(value=(self.config_data['theme'] == 'dark'))
+        self.include_shorts = tk.BooleanVar(value=self.config_data.get('include_shorts', False))
+        self.min_duration_seconds = tk.IntVar(value=self.config_data.get('min_video_duration', 120))
+        self.keep_original_title = tk.BooleanVar(value=self.config_data.get('keep_original_title', False))
+        self.gemini_model_var = tk.StringVar(value=self.config_data.get('gemini_model', 'gemini-2.5-flash'))
         
         # --- 스타일 설정 ---
         self.style = ttk.Style(self)
         self.update_styles()
 
         self.q = queue.Queue()
-        self.after(100, self.process_queue)
+        self._closed = False # api_error로 창을 닫은 뒤에는 큐 확인을 다시 예약하지 않음
+        self.after(QUEUE_POLL_MS, self.process_queue)
 
         self.current_scene = None
         self.current_scene = self.create_scene1()
         self.update_styles() # 초기 다크모드 적용
 
-        self.all_videos = [] # 모든 로드된 영상을 저장할 리스트
+        self.videos_by_id = {} # 목록에 표시 중인 영상 (영상 ID → 영상)
+        self.shown_videos = [] # 목록에 표시 중인 영상 (표시 순서)
+        self._tree_generation = 0 # 목록을 다시 그릴 때마다 증가하여 이전에 예약된 행 추가를 취소
+        self._filter_job = None
+        self.processed_ids = set() # 노트 폴더에 이미 노트가 있는 영상 ID
         self.next_page_token = None # 다음 페이지 로드를 위한 토큰
         self.channel_url_for_batch = None # 현재 로드 중인 채널 URL
+        # 도우미 모듈의 경고 이상 기록은 작업 진행 창에도 표시
+        add_callback_sink(lambda message: self.q.put(("log", message)))
 
     def update_styles(self):
         """UI의 폰트와 색상 테마를 업데이트합니다."""
@@ -189,20 +157,20 @@ class App(tk.Tk):
         ttk.Label(main_content_frame, text="유튜브 채널 URL:").pack(pady=(0, 5), anchor='w')
         self.url_entry = ttk.Entry(main_content_frame)
         self.url_entry.pack(fill="x", pady=(0, 15))
-        self.url_entry.insert(0, CONFIG.get('youtube_url', ''))
+        self.url_entry.insert(0, self.config_data.get('youtube_url', ''))
 
         ttk.Label(main_content_frame, text="Obsidian 저장 경로:").pack(pady=(0, 5), anchor='w')
         path_frame = ttk.Frame(main_content_frame)
         path_frame.pack(fill="x", pady=(0, 15))
         self.path_entry = ttk.Entry(path_frame)
         self.path_entry.pack(side="left", fill="x", expand=True)
-        self.path_entry.insert(0, CONFIG.get('obsidian_path', ''))
+        self.path_entry.insert(0, self.config_data.get('obsidian_path', ''))
         ttk.Button(path_frame, text="경로 선택", command=self.browse_path).pack(side="left", padx=(5, 0))
 
         ttk.Label(main_content_frame, text="Gemini 프롬프트:").pack(pady=(0, 5), anchor='w')
         self.prompt_text = scrolledtext.ScrolledText(main_content_frame, height=10, relief="solid", borderwidth=1)
         self.prompt_text.pack(fill="both", expand=True, pady=(0, 15))
-        self.prompt_text.insert(tk.END, DEFAULT_PROMPT)
+        self.prompt_text.insert(tk.END, self.default_prompt)
 
         self.confirm_btn1 = ttk.Button(main_content_frame, text="영상 목록 불러오기", command=self.start_fetching_videos)
         self.confirm_btn1.pack(pady=10, ipady=5)
@@ -226,22 +194,19 @@ class App(tk.Tk):
             return
 
         self.confirm_btn1.config(state="disabled", text="불러오는 중...")
-        self.all_videos = [] # 새 채널 로드 시 초기화
         self.next_page_token = None # 새 채널 로드 시 초기화
         self.channel_url_for_batch = self.channel_url # 현재 로드 중인 채널 URL 저장
         threading.Thread(target=self.fetch_videos_thread, daemon=True).start()
 
     def fetch_videos_thread(self):
         try:
-            batch_size = CONFIG.get("list_load_batch_size", 30)
-            videos_batch, self.next_page_token = youtube_helper.get_videos_from_channel(
+            videos_batch, self.next_page_token = self.engine.load_channel_videos(
                 self.channel_url_for_batch, 
                 self.include_shorts.get(), 
-                self.min_video_duration, 
-                max_results=batch_size, 
-                page_token=self.next_page_token
+                self.min_video_duration
             )
-            self.all_videos.extend(videos_batch)
+            # 노트 폴더에 이미 노트가 있는 영상은 목록에 표시해 둠 (폴더 조회는 작업 스레드에서)
+            self.processed_ids = self.engine.processed_video_ids(self.obsidian_path)
             self.q.put(("videos_fetched", videos_batch))
         except Exception as e:
             self.q.put(("error", f"영상 목록 로딩 실패: {e}"))
@@ -252,20 +217,38 @@ class App(tk.Tk):
 
         ttk.Label(scene2, text="처리할 영상을 선택하세요.", font=("Helvetica", int(self.font_size*1.3), "bold")).pack(pady=10, anchor='w')
 
-        cols = ("제목", "영상 길이")
+        cols = ("제목", "영상 길이", "상태")
         self.tree = ttk.Treeview(scene2, columns=cols, show="headings")
         self.tree.heading("제목", text="영상 제목")
         self.tree.heading("영상 길이", text="영상 길이")
         self.tree.column("제목", width=600)
         self.tree.column("영상 길이", width=100, anchor='center')
+        self.tree.heading("상태", text="상태")
+        self.tree.column("상태", width=80, anchor='center')
+        self.tree.tag_configure('processed', foreground='gray')
         self.tree.pack(fill="both", expand=True, pady=10)
 
         scrollbar = ttk.Scrollbar(self.tree, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side='right', fill='y')
 
-        for video in videos_batch:
-            self.tree.insert("", "end", values=(video['title'], video['duration']), iid=video['id'])
+        filter_frame = ttk.Frame(scene2)
+        filter_frame.pack(fill='x', before=self.tree)
+        self.search_var = tk.StringVar()
+        self.sort_var = tk.StringVar(value=next(iter(SORT_LABELS)))
+        self.filter_min_minutes = tk.IntVar(value=self.min_video_duration // 60)
+        ttk.Label(filter_frame, text="제목 검색:").pack(side="left")
+        ttk.Entry(filter_frame, textvariable=self.search_var, width=30).pack(side="left", padx=(5, 10))
+        ttk.Checkbutton(filter_frame, text="Shorts 영상 포함", variable=self.include_shorts, command=self.apply_filters).pack(side="left", padx=10)
+        ttk.Label(filter_frame, text="최소 길이(분):").pack(side="left")
+        ttk.Spinbox(filter_frame, from_=0, to=600, width=5, textvariable=self.filter_min_minutes, command=self.apply_filters).pack(side="left", padx=(5, 10))
+        sort_box = ttk.Combobox(filter_frame, textvariable=self.sort_var, values=list(SORT_LABELS), state="readonly", width=10)
+        sort_box.pack(side="right")
+        sort_box.bind("<<ComboboxSelected>>", self.apply_filters)
+        ttk.Label(filter_frame, text="정렬:").pack(side="right", padx=(0, 5))
+        self.search_var.trace_add("write", self.schedule_filters)
+
+        self.populate_tree(videos_batch)
         
         ttk.Label(scene2, text="* Ctrl 또는 Shift 키를 사용하여 여러 영상을 선택할 수 있습니다.").pack(pady=5, anchor='w')
 
@@ -284,21 +267,71 @@ class App(tk.Tk):
             
         return scene2
 
+    def apply_filters(self, *args):
+        """Scene 2의 검색어 / Shorts / 최소 길이 / 정렬 조건으로 목록을 다시 그립니다. API는 다시 호출하지 않습니다."""
+        try:
+            min_seconds = max(0, int(self.filter_min_minutes.get())) * 60
+        except (tk.TclError, ValueError):
+            return # 최소 길이 입력 중 (빈 값 등)
+        videos = self.engine.query_videos(
+            self.include_shorts.get(),
+            min_seconds,
+            text=self.search_var.get(),
+            sort=SORT_LABELS[self.sort_var.get()]
+        )
+        self.populate_tree(videos, selected=self.tree.selection())
+
+    def schedule_filters(self, *args):
+        """검색어를 입력하는 동안에는 목록을 다시 그리지 않고, 입력이 잠시 멈추면 한 번만 적용합니다."""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._run_scheduled_filters)
+
+    def _run_scheduled_filters(self):
+        self._filter_job = None
+        if self.tree.winfo_exists():
+            self.apply_filters()
+
+    def populate_tree(self, videos, selected=()):
+        """
+        목록을 videos로 바꿉니다. 첫 TREE_INSERT_CHUNK개만 바로 넣고 나머지는 같은 크기로 나누어
+        이벤트 처리 사이사이에 넣으므로, 영상이 수천 개여도 창이 멈추지 않습니다.
+        selected에 있던 영상은 다시 넣을 때 선택 상태를 유지합니다.
+        """
+        self._tree_generation += 1
+        self.tree.delete(*self.tree.get_children())
+        self.shown_videos = videos
+        self.videos_by_id = {video['id']: video for video in videos}
+        self._insert_tree_rows(self._tree_generation, 0, set(selected))
+
+    def _insert_tree_rows(self, generation, start, selected):
+        # 목록을 다시 그렸거나 다른 화면으로 넘어갔으면 남은 행은 넣지 않음
+        if generation != self._tree_generation or not self.tree.winfo_exists():
+            return
+        chunk = self.shown_videos[start:start + TREE_INSERT_CHUNK]
+        for video in chunk:
+            if video['id'] in self.processed_ids:
+                self.tree.insert("", "end", values=(video['title'], video['duration'], "노트 있음"), iid=video['id'], tags=('processed',))
+            else:
+                self.tree.insert("", "end", values=(video['title'], video['duration'], ""), iid=video['id'])
+        reselected = [video['id'] for video in chunk if video['id'] in selected]
+        if reselected:
+            self.tree.selection_add(reselected)
+        if start + len(chunk) < len(self.shown_videos):
+            self.after(1, lambda: self.after_idle(self._insert_tree_rows, generation, start + len(chunk), selected))
+
     def load_more_videos(self):
         self.load_more_btn.config(state="disabled", text="로딩 중...")
         threading.Thread(target=self._load_more_videos_thread, daemon=True).start()
 
     def _load_more_videos_thread(self):
         try:
-            batch_size = CONFIG.get("list_load_batch_size", 30)
-            videos_batch, self.next_page_token = youtube_helper.get_videos_from_channel(
+            videos_batch, self.next_page_token = self.engine.load_more_channel_videos(
                 self.channel_url_for_batch, 
+                self.next_page_token,
                 self.include_shorts.get(), 
-                self.min_video_duration, 
-                max_results=batch_size, 
-                page_token=self.next_page_token
+                self.min_video_duration
             )
-            self.all_videos.extend(videos_batch)
             self.q.put(("add_videos_to_tree", videos_batch))
         except Exception as e:
             self.q.put(("error", f"추가 영상 로딩 실패: {e}"))
@@ -309,7 +342,7 @@ class App(tk.Tk):
             messagebox.showerror("선택 오류", "하나 이상의 영상을 선택하세요.")
             return
         
-        self.selected_videos = [v for v in self.all_videos if v['id'] in selected_ids]
+        self.selected_videos = [self.videos_by_id[video_id] for video_id in selected_ids]
         
         self.switch_scene(self.create_scene3)
         threading.Thread(target=self.process_videos_thread, daemon=True).start()
@@ -319,6 +352,12 @@ class App(tk.Tk):
         scene3.pack(fill="both", expand=True)
         
         ttk.Label(scene3, text="작업 진행 상황", font=("Helvetica", int(self.font_size*1.3), "bold")).pack(pady=10, anchor='w')
+        progress_frame = ttk.Frame(scene3)
+        progress_frame.pack(fill='x', pady=(0, 10))
+        self.progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate", maximum=max(1, len(self.selected_videos)))
+        self.progress_bar.pack(side="left", fill='x', expand=True)
+        self.progress_label = ttk.Label(progress_frame, text=f"0 / {len(self.selected_videos)}")
+        self.progress_label.pack(side="right", padx=(10, 0))
         self.progress_text = scrolledtext.ScrolledText(scene3, height=20, relief="solid", borderwidth=1, state="disabled")
         self.progress_text.pack(fill="both", expand=True)
         
@@ -327,128 +366,156 @@ class App(tk.Tk):
 
     def process_videos_thread(self):
         total = len(self.selected_videos)
-        batch_size = CONFIG.get("gemini_batch_size", 30)
-        
-        video_map = {v['id']: v for v in self.selected_videos}
-
         self.q.put(("log", f"--- 총 {total}개 영상 배치 처리 시작 ---"))
-        
-        tasks = []
-        for i, video in enumerate(self.selected_videos):
-            video_id = video['id']
-            video_title = video['title']
-            self.q.put(("log", f"  - [{i+1}/{total}] '{video_title}' 스크립트 준비 중..."))
-            try:
-                transcript, _ = youtube_helper.get_transcript(video_id)
-                if not transcript:
-                    self.q.put(("log", f"  - 경고: '{video_title}' 스크립트를 찾을 수 없어 건너뜁니다."))
-                    continue
-                
-                prompt_with_title = f"영상 제목: {video_title}\n\n{self.user_prompt}"
-                full_prompt = f"{prompt_with_title}\n\n--- 원본 스크립트 ---\n{transcript}\n--- 원본 스크립트 끝 ---"
-                tasks.append({"id": video_id, "task": full_prompt, "original_title": video_title}) # original_title 추가
-
-            except Exception as e:
-                self.q.put(("log", f"  - ✗ 오류: '{video_title}' 스크립트 추출 중 문제 발생 - {e}"))
-
-        if not tasks:
-            self.q.put(("log", "--- 처리할 작업이 없습니다. ---"))
-            self.q.put(("done", "모든 작업이 완료되었습니다!"))
-            return
+        self.q.put(("log", f"  - 스크립트 동시 추출 (작업자 {self.config_data.get('transcript_workers', 4)}개)"))
 
         try:
-            self.q.put(("log", f"  - Gemini API로 {len(tasks)}개 작업 배치 요청..."))
-            results = gemini_helper.process_batch_with_gemini(tasks, self.gemini_model_var.get())
-            
-            result_map = {res['id']: res['result'] for res in results}
-
-            for task in tasks:
-                video_id = task['id']
-                video_title = task['original_title'] # original_title 사용
-                
-                if video_id in result_map:
-                    processed_content = result_map[video_id]
-                    self.q.put(("log", f"  - '{video_title}' 내용 가공 완료. 노트 저장 중..."))
-                    file_helper.save_as_obsidian_note(self.obsidian_path, processed_content, self.keep_original_title.get(), video_title)
-                    self.q.put(("log", f"  - ✓ 완료: '{video_title}' 노트 생성 완료"))
-                else:
-                    self.q.put(("log", f"  - ✗ 오류: '{video_title}' 처리 결과가 없습니다."))
+            summary = self.engine.process(
+                self.selected_videos,
+                self.user_prompt,
+                self.obsidian_path,
+                model_name=self.gemini_model_var.get(),
+                keep_original_title=self.keep_original_title.get(),
+                log=lambda message: self.q.put(("log", message)),
+                progress=lambda done, total: self.q.put(("progress", (done, total)))
+            )
 
+            if not summary["saved"] and not summary["failed"] and not summary["existing"]:
+                self.q.put(("log", "--- 처리할 작업이 없습니다. ---"))
+            else:
+                self.q.put(("log", f"--- 저장 {len(summary['saved'])}개, 실패 {len(summary['failed'])}개, 건너뜀 {len(summary['skipped'])}개, 캐시 사용 {len(summary['cached'])}개, 기존 노트 {len(summary['existing'])}개 ---"))
         except Exception as e:
-            self.q.put(("log", f"  - ✗ 오류: Gemini 배치 처리 중 문제 발생 - {e}"))
-        
+            # 경고 이상 기록은 진행 창에도 표시되므로, 여기서는 진행 창에 한 줄만 남기고 상세 내용은 디버그 로그로 남김
+            logger.debug("영상 처리 중 오류", exc_info=True)
+            self.q.put(("log", f"  - ✗ 오류: 영상 처리 중 문제 발생 - {e}"))
+        # 오류가 나도 완료 메시지를 보내야 진행 화면이 멈춰 있지 않음
         self.q.put(("done", "모든 작업이 완료되었습니다!"))
 
     def log_message(self, message):
+        self.log_messages([message])
+
+    def log_messages(self, messages):
+        """로그 여러 줄을 한 번의 삽입으로 진행 상황 창에 추가하고, LOG_MAX_LINES를 넘는 오래된 줄은 지웁니다."""
         try:
             if hasattr(self, 'progress_text') and self.progress_text.winfo_exists():
-                kst_now = datetime.now(pytz.timezone('Asia/Seoul')).strftime('%Y-%m-%d %H:%M:%S')
+                kst_now = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
                 self.progress_text.config(state="normal")
-                if isinstance(message, tuple) and message[0] == 'progress':
-                    # 마지막 줄을 캐리지 리턴으로 덮어쓰기
-                    self.progress_text.delete("end-1l", "end")
-                    self.progress_text.insert(tk.END, f"[{kst_now}]   - Gemini 처리 진행도: {message[1]}%\r")
-                else:
-                    self.progress_text.insert(tk.END, f"[{kst_now}] {message}\n")
+                self.progress_text.insert(tk.END, "".join(f"[{kst_now}] {message}\n" for message in messages))
+                line_count = int(self.progress_text.index("end-1c").split('.')[0])
+                if line_count > LOG_MAX_LINES:
+                    self.progress_text.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
                 self.progress_text.config(state="disabled")
                 self.progress_text.see(tk.END)
         except Exception as e:
-            print(f"로그 메시지 표시 오류: {e}")
-            print(f"원본 메시지: {message}")
+            logger.error("로그 메시지 표시 오류: %s (원본 메시지: %s)", e, messages)
+
+    def update_progress(self, done, total):
+        if hasattr(self, 'progress_bar') and self.progress_bar.winfo_exists():
+            self.progress_bar.config(maximum=max(1, total), value=done)
+            self.progress_label.config(text=f"{done} / {total}")
 
     def process_queue(self):
+        """
+        작업 스레드가 보낸 메시지를 QUEUE_SLICE_SECONDS 동안 가능한 만큼 처리합니다.
+        로그는 모았다가 한 번에 그리고, 진행도는 마지막 값만 반영합니다.
+        남은 메시지는 다음 확인 때 이어서 처리하므로 메시지가 몰려도 창이 멈추지 않습니다.
+        """
+        deadline = time.monotonic() + QUEUE_SLICE_SECONDS
+        pending_logs = []
+        latest_progress = None
         try:
-            msg_type, data = self.q.get_nowait()
-            if msg_type == "videos_fetched":
-                self.switch_scene(self.create_scene2, data)
-            elif msg_type == "add_videos_to_tree":
-                for video in data:
-                    self.tree.insert("", "end", values=(video['title'], video['duration']), iid=video['id'])
-                if self.next_page_token:
-                    self.load_more_btn.config(state="normal", text="추가 로드")
-                else:
-                    self.load_more_btn.config(state="disabled", text="더 이상 영상 없음")
-            elif msg_type == "error":
-                messagebox.showerror("오류", data)
-                if hasattr(self, 'confirm_btn1'):
-                    self.confirm_btn1.config(state="normal", text="영상 목록 불러오기")
-                if hasattr(self, 'load_more_btn'):
-                    self.load_more_btn.config(state="normal", text="추가 로드") # 에러 발생 시 버튼 활성화
-            elif msg_type == "log":
-                self.log_message(data)
-            elif msg_type == "progress":
-                self.log_message(("progress", data))
-            elif msg_type == "done":
-                self.log_message(f"\n--- {data} ---")
-                messagebox.showinfo("완료", data)
-
-        except queue.Empty:
-            pass
+            while time.monotonic() < deadline:
+                try:
+                    msg_type, data = self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if msg_type == "log":
+                    pending_logs.append(data)
+                    continue
+                if msg_type == "progress":
+                    latest_progress = data
+                    continue
+                # 화면 전환이나 대화 상자 전에 앞선 로그를 먼저 그림
+                if pending_logs:
+                    self.log_messages(pending_logs)
+                    pending_logs = []
+                if not self.handle_message(msg_type, data):
+                    # 창이 닫혔으면 더 그리지 않고 다음 확인도 예약하지 않음
+                    return
         finally:
-            self.after(100, self.process_queue)
+            if self._closed:
+                return
+            if pending_logs:
+                self.log_messages(pending_logs)
+            if latest_progress is not None:
+                self.update_progress(*latest_progress)
+            self.after(QUEUE_POLL_MS, self.process_queue)
+
+    def start_api_check(self):
+        """Gemini API 접근성을 백그라운드에서 확인합니다. 확인하는 동안에도 창을 바로 사용할 수 있습니다."""
+        cache_path = self.config_data.get("api_check_cache_path")
+        if cache_path and not os.path.isabs(cache_path):
+            cache_path = os.path.join(PROJECT_ROOT, cache_path)
+
+        def check():
+            is_accessible, message = gemini_helper.check_gemini_api(
+                self.config_data.get("gemini_model"),
+                cache_path=cache_path,
+                ttl_seconds=self.config_data.get("api_check_ttl_minutes", 60) * 60
+            )
+            if is_accessible:
+                logger.info(message)
+            else:
+                logger.error(message)
+                self.q.put(("api_error", message))
+        threading.Thread(target=check, daemon=True).start()
+
+    def handle_message(self, msg_type, data):
+        """메시지 하나를 처리합니다. 창을 닫았으면 False를 반환합니다."""
+        if msg_type == "api_error":
+            # API 접근 불가 시, 사용자에게 알리고 프로그램 종료
+            messagebox.showerror("API 연결 오류", f"{data}\n\nIP가 차단되었거나 네트워크 연결에 문제가 있을 수 있습니다. 프로그램을 종료합니다.")
+            self._closed = True
+            self.destroy()
+            return False
+        elif msg_type == "videos_fetched":
+            self.switch_scene(self.create_scene2, data)
+        elif msg_type == "add_videos_to_tree":
+            # 새 영상이 현재 검색어 / 정렬 순서에 맞는 위치에 오도록 목록을 다시 그림
+            self.apply_filters()
+            if self.next_page_token:
+                self.load_more_btn.config(state="normal", text="추가 로드")
+            else:
+                self.load_more_btn.config(state="disabled", text="더 이상 영상 없음")
+        elif msg_type == "error":
+            messagebox.showerror("오류", data)
+            if hasattr(self, 'confirm_btn1'):
+                self.confirm_btn1.config(state="normal", text="영상 목록 불러오기")
+            if hasattr(self, 'load_more_btn'):
+                self.load_more_btn.config(state="normal", text="추가 로드") # 에러 발생 시 버튼 활성화
+        elif msg_type == "done":
+            self.log_message(f"\n--- {data} ---")
+            messagebox.showinfo("완료", data)
+        return True
 
 if __name__ == "__main__":
     try:
+        CONFIG = load_config()
+        setup_logging(CONFIG.get("log_level", "INFO"), CONFIG.get("log_json", False))
+        DEFAULT_PROMPT = load_prompt_from_json()
+
         if not youtube_helper.YOUTUBE_API_KEY:
             raise ValueError("YouTube API 키가 설정되지 않았습니다. MYAPI.json 파일을 확인해주세요.")
         if not gemini_helper.GEMINI_API_KEY:
             raise ValueError("Gemini API 키가 설정되지 않았습니다. MYAPI.json 파일을 확인해주세요.")
-        
+
+        app = App(CONFIG, DEFAULT_PROMPT)
         # Gemini API 접근성 확인 (config.json 설정에 따름)
         if CONFIG.get("run_ip_test", True):
-            is_accessible, message = gemini_helper.check_gemini_api()
-            if not is_accessible:
-                # API 접근 불가 시, 사용자에게 알리고 프로그램 종료
-                print(f"오류: {message}")
-                messagebox.showerror("API 연결 오류", f"{message}\n\nIP가 차단되었거나 네트워크 연결에 문제가 있을 수 있습니다. 프로그램을 종료합니다.")
-                sys.exit() # 프로그램 종료
-            else:
-                print(message) # API 접근 가능 메시지 출력
-        
-        app = App()
+            app.start_api_check()
+        app.after_idle(lambda: logger.info("시작 시간: %.2f초", time.perf_counter() - STARTED_AT))
         app.mainloop()
 
     except ValueError as e:
-        print(f"오류: {e}")
-        print("MYAPI.json 파일에 유효한 API 키를 설정해주세요.")
+        logger.error("%s MYAPI.json 파일에 유효한 API 키를 설정해주세요.", e)
         messagebox.showerror("설정 오류", str(e))
\ No newline at end of file
@@ -0,0 +1,114 @@
+# tests/test_batch_planner.py
+# BatchPlanner와 작업 나누기 / 합치기(split_task, merge_part_results, build_merge_task)를 네트워크 없이 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.batch_planner import BatchPlanner, PROMPT_OVERHEAD_TOKENS, estimate_tokens, plan_batches, split_text, task_tokens
+from utils.map_reduce import TRANSCRIPT_START, TRANSCRIPT_END, build_merge_task, merge_part_results, split_task
+
+
+def make_task(video_id, words, title="제목", **extra):
+    transcript = " ".join(f"word{i}" for i in range(words))
+    task = {
+        "id": video_id,
+        "task": f"영상 제목: {title}\n\n요약해 줘\n\n{TRANSCRIPT_START}{transcript}{TRANSCRIPT_END}",
+        "original_title": title,
+    }
+    task.update(extra)
+    return task
+
+
+def transcript_of(task):
+    return task['task'].partition(TRANSCRIPT_START)[2][:-len(TRANSCRIPT_END)]
+
+
+class SplitTextTest(unittest.TestCase):
+    def test_chunks_fit_and_rejoin(self):
+        text = " ".join(f"단어{i} word{i}" for i in range(2000))
+        chunks = split_text(text, 300)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), text)
+        for chunk in chunks:
+            self.assertLessEqual(estimate_tokens(chunk), 300)
+
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(split_text("짧은 글", 100), ["짧은 글"])
+
+
+class BatchPlannerTest(unittest.TestCase):
+    def test_respects_task_count_and_token_budget(self):
+        tasks = [make_task(f"v{i}", 100) for i in range(25)]
+        budget = 2000
+        batches = plan_batches(tasks, budget, 4)
+        self.assertEqual(sorted(t['id'] for b in batches for t in b), sorted(t['id'] for t in tasks))
+        for batch in batches:
+            self.assertLessEqual(len(batch), 4)
+            self.assertLessEqual(PROMPT_OVERHEAD_TOKENS + sum(task_tokens(t) for t in batch), budget)
+
+    def test_same_input_gives_same_batches(self):
+        tasks = [make_task(f"v{i}", 50 + i * 7) for i in range(30)]
+        first = [[t['id'] for t in b] for b in plan_batches(tasks, 1500, 5)]
+        second = [[t['id'] for t in b] for b in plan_batches(tasks, 1500, 5)]
+        self.assertEqual(first, second)
+
+    def test_oversized_task_without_splitter_goes_alone(self):
+        planner = BatchPlanner(1000, 10)
+        big = make_task("big", 5000)
+        self.assertEqual(planner.add(big), [[big]])
+
+    def test_oversized_task_is_split_within_budget(self):
+        budget = 1000
+        planner = BatchPlanner(budget, 10, splitter=split_task)
+        big = make_task("vid", 3000)
+        batches = planner.add(big) + planner.flush()
+        parts = [t for b in batches for t in b]
+        self.assertGreater(len(parts), 1)
+        for batch in batches:
+            self.assertLessEqual(PROMPT_OVERHEAD_TOKENS + sum(task_tokens(t) for t in batch), budget)
+        self.assertEqual("".join(transcript_of(p) for p in sorted(parts, key=lambda p: p['part_index'])), transcript_of(big))
+        for part in parts:
+            self.assertEqual(part['parent_id'], "vid")
+            self.assertEqual(part['split_of']['id'], "vid")
+            self.assertNotIn('task', part['split_of'])
+            self.assertEqual(part['part_count'], len(parts))
+
+
+class SplitTaskTest(unittest.TestCase):
+    def test_split_map_task_points_to_video_and_map_task(self):
+        # 구간 / reduce 작업을 나눠도 parent_id는 영상 ID이고, split_of로 원래 작업을 되찾을 수 있어야 함
+        map_task = make_task("vid#map2", 3000, kind="map", parent_id="vid", part_index=1, part_count=3)
+        parts = split_task(map_task, 800)
+        self.assertGreater(len(parts), 1)
+        for index, part in enumerate(parts):
+            self.assertEqual(part['id'], f"vid#map2#part{index+1}")
+            self.assertEqual(part['parent_id'], "vid")
+            self.assertEqual(part['split_of']['id'], "vid#map2")
+            self.assertEqual(part['split_of']['kind'], "map")
+            self.assertEqual(part['split_of']['part_index'], 1)
+            self.assertNotIn('kind', part)
+            self.assertLessEqual(estimate_tokens(part['task']), 800)
+
+
+class MergeTest(unittest.TestCase):
+    def test_merge_part_results_drops_repeated_title(self):
+        merged = merge_part_results(["# 제목\n\n첫 부분", "# 제목\n\n둘째 부분\n"])
+        self.assertEqual(merged, "# 제목\n\n첫 부분\n\n둘째 부분")
+
+    def test_build_merge_task_keeps_part_order(self):
+        source = {"id": "vid", "original_title": "영상"}
+        task = build_merge_task(source, ["첫 정리", "둘째 정리"], "요약해 줘")
+        self.assertEqual(task['id'], "vid#merge")
+        self.assertEqual(task['parent_id'], "vid")
+        self.assertEqual(task['kind'], "merge")
+        body = transcript_of(task)
+        self.assertLess(body.index("첫 정리"), body.index("둘째 정리"))
+        self.assertIn("요약해 줘", task['task'])
+
+
+if __name__ == "__main__":
+    unittest.main()
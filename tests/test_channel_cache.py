@@ -0,0 +1,60 @@
+# tests/test_channel_cache.py
+# 채널 URL 정리와 ChannelCache의 만료를 네트워크 없이 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.channel_cache import ChannelCache, normalize_channel_url
+
+
+class NormalizeChannelUrlTest(unittest.TestCase):
+    def test_same_handle_gives_same_key(self):
+        for url in ("https://www.youtube.com/@Gogo_Work/videos", "HTTP://m.YouTube.com/@gogo_work?si=x", "youtube.com/@gogo_work/"):
+            self.assertEqual(normalize_channel_url(url), "youtube.com/@gogo_work")
+
+    def test_channel_id_keeps_case(self):
+        self.assertEqual(
+            normalize_channel_url("https://WWW.YouTube.com/channel/UCabcDEF123/Videos"),
+            "youtube.com/channel/UCabcDEF123"
+        )
+        self.assertNotEqual(
+            normalize_channel_url("youtube.com/channel/UCabc"),
+            normalize_channel_url("youtube.com/channel/UCABC")
+        )
+
+
+class ChannelCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ChannelCache(os.path.join(self.tmp.name, "channels.sqlite3"), ttl_seconds=60)
+
+    def tearDown(self):
+        self.cache.store.close()
+        self.tmp.cleanup()
+
+    def test_memory_entry_expires_with_ttl(self):
+        self.cache.put("youtube.com/@a", "UCa", "UUa")
+        self.assertEqual(self.cache.get("youtube.com/@a"), ("UCa", "UUa"))
+        later = time.time() + 61
+        with mock.patch("time.time", return_value=later):
+            self.assertIsNone(self.cache.get("youtube.com/@a"))
+
+    def test_memory_entry_uses_disk_timestamp(self):
+        # 디스크에서 읽어 온 항목은 읽은 시각이 아니라 저장된 시각부터 만료
+        self.cache.put("youtube.com/@a", "UCa", "UUa")
+        self.cache._memo.clear()
+        with mock.patch("time.time", return_value=time.time() + 50):
+            self.assertEqual(self.cache.get("youtube.com/@a"), ("UCa", "UUa"))
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertIsNone(self.cache.get("youtube.com/@a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# tests/test_channel_sync.py
+# 영상 인덱스의 증분 동기화(sync_channel)와 과거 영상 이어 받기(backfill_channel)를 가짜 YouTube(benchmarks/fakes.py)로 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.fakes import FakeYouTube, install
+from utils import youtube_helper
+from utils.video_index import VideoIndex
+from utils.youtube_helper import backfill_channel, sync_channel
+
+CHANNEL_URL = f"https://www.youtube.com/channel/{FakeYouTube.CHANNEL_ID}"
+
+
+class ChannelSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.index_path = os.path.join(self.directory, "videos.sqlite3")
+        self.index = VideoIndex(self.index_path)
+        self.youtube = FakeYouTube(video_count=100)
+        patcher = install(youtube=self.youtube)
+        patcher.__enter__()
+        self.addCleanup(patcher.__exit__, None, None, None)
+
+    def page_requests(self):
+        return self.youtube.faults.calls["playlistItems"]
+
+    def upload(self, count):
+        """채널에 새 영상 count개를 올립니다. (재생목록 맨 앞에 추가됨)"""
+        new_ids = [f"bench{100000 + len(self.youtube.video_ids) + i:06d}" for i in range(count)]
+        self.youtube.video_ids[:0] = new_ids
+        return new_ids
+
+    def test_initial_sync_stores_backfill_token(self):
+        channel_id, videos = sync_channel(CHANNEL_URL, self.index, max_pages=2, page_size=10)
+        self.assertEqual(channel_id, FakeYouTube.CHANNEL_ID)
+        self.assertEqual([v['id'] for v in videos], [f"bench{i:06d}" for i in range(20)])
+        self.assertEqual(self.page_requests(), 2)
+        self.assertEqual(self.index.get_backfill_token(channel_id), "20")
+        self.assertEqual(len(self.index.list_videos(channel_id)), 20)
+
+    def test_sync_stops_at_first_known_video(self):
+        sync_channel(CHANNEL_URL, self.index, max_pages=2, page_size=10)
+        new_ids = self.upload(3)
+        before = self.page_requests()
+        channel_id, videos = sync_channel(CHANNEL_URL, self.index, max_pages=2, page_size=10)
+        # 첫 페이지에서 알고 있는 영상(bench000000)을 만나 더 요청하지 않음
+        self.assertEqual(self.page_requests() - before, 1)
+        self.assertEqual([v['id'] for v in videos], new_ids)
+        self.assertEqual(self.index.get_backfill_token(channel_id), "20")
+
+    def test_sync_follows_pages_until_known_video(self):
+        sync_channel(CHANNEL_URL, self.index, max_pages=1, page_size=10)
+        new_ids = self.upload(25)
+        before = self.page_requests()
+        _, videos = sync_channel(CHANNEL_URL, self.index, max_pages=1, page_size=10)
+        # 증분 동기화에는 max_pages 제한이 없으므로 알고 있는 영상이 나오는 세 번째 페이지까지 요청함
+        self.assertEqual(self.page_requests() - before, 3)
+        self.assertEqual([v['id'] for v in videos], new_ids)
+
+    def test_backfill_resumes_from_stored_token(self):
+        sync_channel(CHANNEL_URL, self.index, max_pages=2, page_size=10)
+        # 인덱스를 다시 열어도 저장된 토큰부터 이어 받음
+        index = VideoIndex(self.index_path)
+        channel_id, videos = backfill_channel(CHANNEL_URL, index, pages=1, page_size=10)
+        self.assertEqual([v['id'] for v in videos], [f"bench{i:06d}" for i in range(20, 30)])
+        self.assertEqual(index.get_backfill_token(channel_id), "30")
+        _, videos = backfill_channel(CHANNEL_URL, index, pages=2, page_size=10)
+        self.assertEqual([v['id'] for v in videos], [f"bench{i:06d}" for i in range(30, 50)])
+        self.assertEqual(index.get_backfill_token(channel_id), "50")
+
+    def prefetched(self, page_token, page_size):
+        """미리 받는 중인 페이지의 Future를 반환합니다. 없으면 None을 반환합니다."""
+        entry = youtube_helper._prefetched_pages.get((FakeYouTube.PLAYLIST_ID, page_token, page_size))
+        return entry[0] if entry else None
+
+    def test_sync_prefetches_backfill_page(self):
+        sync_channel(CHANNEL_URL, self.index, max_pages=2, page_size=10, prefetch_page_size=5)
+        self.prefetched("20", 5).result()
+        before = self.page_requests()
+        channel_id, videos = backfill_channel(CHANNEL_URL, self.index, pages=1, page_size=5)
+        self.assertEqual([v['id'] for v in videos], [f"bench{i:06d}" for i in range(20, 25)])
+        # 미리 받은 페이지를 쓰고, 다음 호출에 쓸 페이지만 새로 요청함
+        self.prefetched("25", 5).result()
+        self.assertEqual(self.page_requests() - before, 1)
+        self.assertIsNone(self.prefetched("20", 5))
+        self.assertEqual(self.index.get_backfill_token(channel_id), "25")
+
+    def test_backfill_uses_and_refills_prefetch(self):
+        sync_channel(CHANNEL_URL, self.index, max_pages=2, page_size=10)
+        self.assertEqual(youtube_helper._prefetched_pages, {})
+        backfill_channel(CHANNEL_URL, self.index, pages=1, page_size=10)
+        self.prefetched("30", 10).result()
+        before = self.page_requests()
+        _, videos = backfill_channel(CHANNEL_URL, self.index, pages=2, page_size=10)
+        self.assertEqual([v['id'] for v in videos], [f"bench{i:06d}" for i in range(30, 50)])
+        self.prefetched("50", 10).result()
+        # 첫 페이지는 미리 받은 것을 쓰므로 요청은 두 번째 페이지와 다음 미리 받기 두 번뿐
+        self.assertEqual(self.page_requests() - before, 2)
+
+    def test_backfill_until_end_clears_token(self):
+        sync_channel(CHANNEL_URL, self.index, max_pages=1, page_size=40)
+        channel_id, videos = backfill_channel(CHANNEL_URL, self.index, pages=5, page_size=40)
+        self.assertEqual(len(videos), 60)
+        self.assertIsNone(self.index.get_backfill_token(channel_id))
+        self.assertEqual(len(self.index.list_videos(channel_id)), 100)
+        # 더 받을 페이지가 없으면 요청하지 않음
+        before = self.page_requests()
+        self.assertEqual(backfill_channel(CHANNEL_URL, self.index, pages=1, page_size=40)[1], [])
+        self.assertEqual(self.page_requests(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+# tests/test_fetch_transcripts.py
+# fetch_transcripts의 제출 창(window), 시간 초과 후 작업자 보충, 일시적 오류 재시도를
+# 가짜 자막 백엔드(benchmarks/fakes.py)로 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.fakes import FakeBackendError, FakeTranscriptApi, Faults, install
+from utils import youtube_helper
+
+
+class ScriptedTranscriptApi(FakeTranscriptApi):
+    """영상 ID별로 정해 둔 동작(멈춤 / 오류)을 list_transcripts에서 흉내 내는 가짜 자막 API"""
+
+    def __init__(self, hang=(), hang_seconds=0.0, errors=None, **kwargs):
+        super().__init__(segments=3, **kwargs)
+        self.hang = set(hang)
+        self.hang_seconds = hang_seconds
+        self.errors = errors or {} # 영상 ID → 차례로 발생시킬 오류 목록
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def list_transcripts(self, video_id, proxies=None):
+        with self._lock:
+            self.calls.append(video_id)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            errors = self.errors.get(video_id)
+            error = errors.pop(0) if errors else None
+        try:
+            if video_id in self.hang:
+                time.sleep(self.hang_seconds)
+            if error is not None:
+                raise error
+            return super().list_transcripts(video_id, proxies)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def ids(count):
+    return [f"v{i}" for i in range(count)]
+
+
+class FetchTranscriptsTest(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        api = FakeTranscriptApi(segments=3, faults=Faults(latency=0.01, jitter=0.9, seed=1))
+        with install(transcripts=api):
+            results = list(youtube_helper.fetch_transcripts(ids(20), max_workers=4))
+        self.assertEqual([r[0] for r in results], ids(20))
+        self.assertTrue(all(r[1] and r[3] is None for r in results))
+
+    def test_submits_at_most_window_ahead(self):
+        api = ScriptedTranscriptApi(faults=Faults(latency=0.01))
+        with install(transcripts=api):
+            results = youtube_helper.fetch_transcripts(ids(30), max_workers=3)
+            next(results)
+            time.sleep(0.2)
+            # 결과 하나를 꺼낸 시점에는 창 크기(작업자 수 x 2)만큼만 제출되어 있음
+            self.assertEqual(len(api.calls), 6)
+            self.assertLessEqual(api.max_running, 3)
+            remaining = list(results)
+        self.assertEqual(len(remaining), 29)
+
+    def test_timeout_does_not_block_queued_videos(self):
+        # 작업자 하나가 멈춰도 뒤의 영상은 새 작업자가 처리하여 멈춘 요청이 끝나기 전에 모두 반환됨
+        api = ScriptedTranscriptApi(hang={"v0"}, hang_seconds=2.0)
+        start = time.monotonic()
+        with install(transcripts=api):
+            results = list(youtube_helper.fetch_transcripts(ids(5), max_workers=1, timeout=0.3))
+        elapsed = time.monotonic() - start
+        self.assertIsInstance(results[0][3], TimeoutError)
+        self.assertEqual([r[0] for r in results[1:] if r[1]], ids(5)[1:])
+        self.assertLess(elapsed, 1.5)
+
+    def test_hung_worker_does_not_block_exit(self):
+        api = ScriptedTranscriptApi(hang={"v0"}, hang_seconds=1.0)
+        with install(transcripts=api):
+            list(youtube_helper.fetch_transcripts(ids(1), max_workers=1, timeout=0.1))
+        hung = [t for t in threading.enumerate() if t.name.startswith("transcript") and t.is_alive()]
+        self.assertTrue(hung)
+        self.assertTrue(all(t.daemon for t in hung))
+
+    @mock.patch("utils.youtube_helper.backoff_delay", return_value=0)
+    def test_retries_transient_errors(self, _):
+        api = ScriptedTranscriptApi(errors={
+            "v1": [FakeBackendError("서버 오류", code=503), ConnectionError("연결 끊김")],
+            "v2": [FakeBackendError("서버 오류", code=503)] * 5,
+        })
+        with install(transcripts=api):
+            results = {r[0]: r for r in youtube_helper.fetch_transcripts(ids(3), max_workers=2, retries=2)}
+        self.assertIsNotNone(results["v1"][1])
+        self.assertEqual(api.calls.count("v1"), 3)
+        # 재시도 횟수를 넘기면 자막 없음으로 처리
+        self.assertIsNone(results["v2"][1])
+        self.assertEqual(api.calls.count("v2"), 3)
+
+    @mock.patch("utils.youtube_helper.backoff_delay", return_value=0)
+    def test_does_not_retry_other_errors(self, _):
+        api = ScriptedTranscriptApi(errors={"v0": [FakeBackendError("없음", code=404)]})
+        with install(transcripts=api):
+            results = list(youtube_helper.fetch_transcripts(ids(1), retries=3))
+        self.assertIsNone(results[0][1])
+        self.assertEqual(api.calls, ["v0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
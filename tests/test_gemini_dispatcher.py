@@ -0,0 +1,132 @@
+# tests/test_gemini_dispatcher.py
+# GeminiDispatcher의 재시도 / 작업별 재요청과 TokenBucket을 가짜 모델(benchmarks/fakes.py)로 확인합니다.
+# 실행: python -m pytest -q tests
+
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.fakes import FakeBackendError, FakeGemini
+from utils.gemini_dispatcher import GeminiDispatcher, TokenBucket, is_retryable_error
+
+
+def make_batch(count):
+    return [{'id': f"v{i}", 'task': f"영상 {i} 요약", 'original_title': f"영상 {i}"} for i in range(count)]
+
+
+def prompt_ids(prompt):
+    start = prompt.index('[{"id"')
+    tasks, _ = json.JSONDecoder().raw_decode(prompt, start)
+    return [task['id'] for task in tasks]
+
+
+class ScriptedModel:
+    """
+    FakeGemini 모델을 감싸 요청마다 respond(prompt, 호출 번호)의 결과를 따릅니다.
+    respond가 예외를 반환하면 발생시키고, 문자열이면 그 텍스트로 응답하며, None이면 FakeGemini의 정상 응답을 돌려줍니다.
+    """
+
+    def __init__(self, respond=None):
+        self.model = FakeGemini(result_chars=40).GenerativeModel("fake")
+        self.respond = respond or (lambda prompt, call: None)
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        reply = self.respond(prompt, len(self.prompts))
+        if isinstance(reply, Exception):
+            raise reply
+        if reply is not None:
+            return SimpleNamespace(parts=[SimpleNamespace(text=reply)])
+        return self.model.generate_content(prompt, stream=stream, **kwargs)
+
+
+def run(model, batch, max_retries=3, stream=False):
+    """배치 하나를 보내고 (받은 결과 {id: result}, missing ID 목록, error)를 반환합니다."""
+    results = {}
+    done = []
+    dispatcher = GeminiDispatcher("fake", max_in_flight=1, rpm=0, tpm=0, max_retries=max_retries,
+                                  stream=stream, model_factory=lambda name: model, log=lambda message: None)
+    try:
+        dispatcher.submit(batch, lambda task, result: results.__setitem__(task['id'], result),
+                          lambda batch, missing, error: done.append(([t['id'] for t in missing], error))).result()
+    finally:
+        dispatcher.close()
+    missing, error = done[0]
+    return results, missing, error
+
+
+@mock.patch("utils.gemini_dispatcher.backoff_delay", return_value=0)
+class RetryTest(unittest.TestCase):
+    def test_retries_429_and_5xx(self, _):
+        errors = {1: FakeBackendError("한도 초과", code=429), 2: FakeBackendError("서버 오류", code=503)}
+        model = ScriptedModel(lambda prompt, call: errors.get(call))
+        results, missing, error = run(model, make_batch(3))
+        self.assertEqual(len(model.prompts), 3)
+        self.assertEqual(sorted(results), ["v0", "v1", "v2"])
+        self.assertEqual((missing, error), ([], None))
+
+    def test_gives_up_after_max_retries(self, _):
+        model = ScriptedModel(lambda prompt, call: FakeBackendError("서버 오류", code=500))
+        results, missing, error = run(model, make_batch(2), max_retries=2)
+        self.assertEqual(len(model.prompts), 3)
+        self.assertEqual(results, {})
+        self.assertEqual(missing, ["v0", "v1"])
+        self.assertEqual(error.code, 500)
+
+    def test_does_not_retry_other_errors(self, _):
+        model = ScriptedModel(lambda prompt, call: FakeBackendError("잘못된 요청", code=400))
+        results, missing, error = run(model, make_batch(2))
+        self.assertEqual(len(model.prompts), 1)
+        self.assertEqual(missing, ["v0", "v1"])
+        self.assertFalse(is_retryable_error(error))
+
+    def test_unparsable_batch_falls_back_to_single_tasks(self, _):
+        # 여러 작업을 담은 요청의 응답은 해석할 수 없고, 작업 하나짜리 요청에는 정상 응답
+        model = ScriptedModel(lambda prompt, call: "죄송합니다, 요약할 수 없습니다." if len(prompt_ids(prompt)) > 1 else None)
+        results, missing, error = run(model, make_batch(3))
+        self.assertEqual([prompt_ids(p) for p in model.prompts[1:]], [["v0"], ["v1"], ["v2"]])
+        self.assertEqual(sorted(results), ["v0", "v1", "v2"])
+        self.assertEqual((missing, error), ([], None))
+
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_waits_for_refill(self):
+        bucket = TokenBucket(60, capacity=2, clock=self.clock, sleep=self.sleep)
+        bucket.acquire(2)
+        self.assertEqual(self.sleeps, [])
+        bucket.acquire(1)
+        self.assertEqual(self.sleeps, [1.0])
+
+    def test_refills_with_elapsed_time(self):
+        bucket = TokenBucket(60, capacity=2, clock=self.clock, sleep=self.sleep)
+        bucket.acquire(2)
+        self.now += 5
+        bucket.acquire(2)
+        self.assertEqual(self.sleeps, [])
+
+    def test_request_larger_than_capacity_waits_for_full_bucket(self):
+        bucket = TokenBucket(60, capacity=2, clock=self.clock, sleep=self.sleep)
+        bucket.acquire(2)
+        bucket.acquire(10)
+        self.assertEqual(self.sleeps, [2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_gemini_helper.py
+# 구조화 출력(JSON 응답 스키마) 요청 경로를 가짜 모델로 확인합니다.
+# 실행: python -m pytest -q tests
+
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.gemini_helper import RESULT_SCHEMA, build_batch_prompt, process_batch_with_gemini, request_batch
+
+TASKS = [{'id': "v0", 'task': "첫 영상 요약"}, {'id': "v1", 'task': "둘째 영상 요약"}]
+
+
+class RecordingModel:
+    """generate_content에 넘어온 인자를 기록하고 정해진 텍스트로 답하는 가짜 모델"""
+
+    def __init__(self, text, chunk_chars=None):
+        self.text = text
+        self.chunk_chars = chunk_chars
+        self.calls = []
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls.append({'prompt': prompt, 'stream': stream, **kwargs})
+        if not stream:
+            return SimpleNamespace(parts=[SimpleNamespace(text=self.text)])
+        size = self.chunk_chars or len(self.text)
+        return iter([SimpleNamespace(parts=[SimpleNamespace(text=self.text[i:i + size])])
+                     for i in range(0, len(self.text), size)])
+
+
+def schema_reply(items):
+    return json.dumps(items, ensure_ascii=False)
+
+
+class StructuredOutputTest(unittest.TestCase):
+    def test_schema_and_mime_type_are_sent(self):
+        model = RecordingModel(schema_reply([{"id": "v0", "result": "첫 요약"}, {"id": "v1", "result": "둘째 요약"}]))
+        request_batch(TASKS, model, structured=True)
+        config = model.calls[0]['generation_config']
+        self.assertEqual(config['response_mime_type'], "application/json")
+        self.assertEqual(config['response_schema'], RESULT_SCHEMA)
+        self.assertEqual(model.calls[0]['prompt'], build_batch_prompt(TASKS, structured=True))
+
+    def test_plain_request_has_no_generation_config(self):
+        model = RecordingModel("```json\n" + schema_reply([{"id": "v0", "result": "요약"}]) + "\n```")
+        request_batch(TASKS[:1], model)
+        self.assertNotIn('generation_config', model.calls[0])
+
+    def test_schema_reply_parses_without_fallback(self):
+        model = RecordingModel(schema_reply([{"id": "v0", "result": "첫 요약"}, {"id": "v1", "result": "둘째 요약"}]))
+        results = process_batch_with_gemini(TASKS, model=model, structured=True)
+        self.assertEqual(results, [{'id': "v0", 'result': "첫 요약"}, {'id': "v1", 'result': "둘째 요약"}])
+        self.assertEqual(len(model.calls), 1)
+
+    def test_streamed_schema_reply_delivers_each_result(self):
+        model = RecordingModel(schema_reply([{"id": "v0", "result": "첫 요약"}, {"id": "v1", "result": "둘째 요약"}]), chunk_chars=7)
+        delivered = []
+        request_batch(TASKS, model, on_result=delivered.append, stream=True, structured=True)
+        self.assertTrue(model.calls[0]['stream'])
+        self.assertEqual([item['id'] for item in delivered], ["v0", "v1"])
+
+    def test_objects_outside_the_schema_are_discarded(self):
+        model = RecordingModel(schema_reply([{"id": "v0", "result": "첫 요약"}, {"id": "v1", "result": ["목록"]}]))
+        results = request_batch(TASKS, model, structured=True)
+        self.assertEqual([item['id'] for item in results], ["v0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# tests/test_job_journal.py
+# JobJournal의 이어서 진행 / 완료 후 삭제 / 단계 경계 동기화를 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.job_journal import JobJournal, STAGE_QUEUED, STAGE_SUMMARIZED, STAGE_SAVED
+
+
+class JobJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "journal", "job.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resumes_unfinished_job(self):
+        journal = JobJournal(self.path)
+        journal.record("a", STAGE_SAVED)
+        journal.record("b", STAGE_SUMMARIZED, result="# 요약")
+        journal.close()
+
+        resumed = JobJournal(self.path)
+        self.assertTrue(resumed.resumed)
+        self.assertEqual(resumed.stage("a"), STAGE_SAVED)
+        self.assertEqual(resumed.result("b"), "# 요약")
+        resumed.close()
+
+    def test_finish_deletes_journal(self):
+        journal = JobJournal(self.path)
+        journal.record("a", STAGE_SAVED)
+        journal.finish()
+        journal.close()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(JobJournal(self.path).resumed)
+
+    def test_fsync_only_at_sync_and_close(self):
+        with mock.patch("os.fsync") as fsync:
+            journal = JobJournal(self.path)
+            for i in range(10):
+                journal.record(f"v{i}", STAGE_QUEUED)
+            self.assertEqual(fsync.call_count, 0)
+            journal.sync()
+            journal.sync()
+            self.assertEqual(fsync.call_count, 1)
+            journal.record("v0", STAGE_SAVED)
+            journal.close()
+            self.assertEqual(fsync.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
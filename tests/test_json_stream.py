@@ -0,0 +1,114 @@
+# tests/test_json_stream.py
+# ResultStreamParser / parse_results의 점진적 파싱과, 응답에서 빠진 작업만 다시 요청하는 동작을 확인합니다.
+# 실행: python -m pytest -q tests
+
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.gemini_dispatcher import GeminiDispatcher
+from utils.json_stream import ResultStreamParser, parse_results
+
+TRICKY_RESULT = '# 제목 {중괄호}\n\n그는 "안녕 }" 이라고 말했다. 경로 C:\\temp\\ {"id": "가짜"}'
+RESPONSE = json.dumps([
+    {"id": "a", "result": TRICKY_RESULT},
+    {"id": "b", "result": "둘째 결과 {{ }}"},
+    {"id": "c", "result": "셋째"},
+], ensure_ascii=False)
+EXPECTED = [("a", TRICKY_RESULT), ("b", "둘째 결과 {{ }}"), ("c", "셋째")]
+
+
+def pairs(items):
+    return [(item['id'], item['result']) for item in items]
+
+
+class ResultStreamParserTest(unittest.TestCase):
+    def test_whole_response(self):
+        self.assertEqual(pairs(parse_results(RESPONSE)), EXPECTED)
+
+    def test_split_at_every_offset(self):
+        for offset in range(len(RESPONSE) + 1):
+            parser = ResultStreamParser()
+            items = parser.feed(RESPONSE[:offset]) + parser.feed(RESPONSE[offset:]) + parser.close()
+            self.assertEqual(pairs(items), EXPECTED, offset)
+
+    def test_one_character_at_a_time(self):
+        parser = ResultStreamParser()
+        items = []
+        for ch in RESPONSE:
+            items.extend(parser.feed(ch))
+        self.assertEqual(pairs(items + parser.close()), EXPECTED)
+
+    def test_objects_are_returned_as_soon_as_closed(self):
+        parser = ResultStreamParser()
+        first_end = RESPONSE.index('}, {"id": "b"') + 1
+        self.assertEqual(pairs(parser.feed(RESPONSE[:first_end])), EXPECTED[:1])
+
+    def test_markdown_fence_and_prose(self):
+        text = f'다음은 "요청하신" JSON 결과입니다 :)\n```json\n{RESPONSE}\n```\n더 필요한 것이 있으면 말씀해 주세요.'
+        self.assertEqual(pairs(parse_results(text)), EXPECTED)
+
+    def test_truncated_final_object_is_dropped(self):
+        cut = RESPONSE.index('"셋째"') + 3
+        parser = ResultStreamParser()
+        self.assertEqual(pairs(parser.feed(RESPONSE[:cut]) + parser.close()), EXPECTED[:2])
+
+    def test_broken_object_does_not_stop_the_rest(self):
+        text = '[{"id": "a", "result": "첫째"}, {"id": "b", "result": 둘째}, {"id": "c", "result": "셋째"}]'
+        self.assertEqual(pairs(parse_results(text)), [("a", "첫째"), ("c", "셋째")])
+
+    def test_duplicate_ids_keep_the_first(self):
+        text = '[{"id": "a", "result": "처음"}, {"id": "a", "result": "다시"}]'
+        self.assertEqual(pairs(parse_results(text)), [("a", "처음")])
+
+    def test_strict_mode_counts_rejected_objects(self):
+        text = json.dumps([
+            {"id": "a", "result": "정상"},
+            {"id": "b", "result": {"summary": "객체"}},
+            {"id": "c", "result": "  "},
+            {"id": 4, "result": "숫자 ID"},
+        ], ensure_ascii=False)
+        parser = ResultStreamParser(strict=True)
+        self.assertEqual(pairs(parser.feed(text) + parser.close()), [("a", "정상")])
+        self.assertEqual(parser.rejected, 3)
+
+    def test_loose_mode_accepts_non_string_values(self):
+        text = '[{"id": 4, "result": {"summary": "객체"}}]'
+        self.assertEqual(pairs(parse_results(text)), [("4", '{"summary": "객체"}')])
+
+
+class MissingResultTest(unittest.TestCase):
+    def test_only_missing_ids_are_requested_again(self):
+        prompts = []
+
+        class Model:
+            def generate_content(self, prompt, **kwargs):
+                start = prompt.index('[{"id"')
+                ids = [task['id'] for task in json.JSONDecoder().raw_decode(prompt, start)[0]]
+                prompts.append(ids)
+                # 첫 응답에서는 v1의 결과가 빠짐
+                answered = [i for i in ids if i != "v1"] if len(prompts) == 1 else ids
+                text = json.dumps([{"id": i, "result": f"{i} 요약"} for i in answered], ensure_ascii=False)
+                return SimpleNamespace(parts=[SimpleNamespace(text=text)])
+
+        results = {}
+        done = []
+        dispatcher = GeminiDispatcher("fake", max_in_flight=1, rpm=0, tpm=0, max_retries=2,
+                                      model_factory=lambda name: Model(), log=lambda message: None)
+        batch = [{'id': f"v{i}", 'task': f"영상 {i} 요약"} for i in range(3)]
+        try:
+            dispatcher.submit(batch, lambda task, result: results.__setitem__(task['id'], result),
+                              lambda batch, missing, error: done.append((missing, error))).result()
+        finally:
+            dispatcher.close()
+        self.assertEqual(prompts, [["v0", "v1", "v2"], ["v1"]])
+        self.assertEqual(results, {"v0": "v0 요약", "v1": "v1 요약", "v2": "v2 요약"})
+        self.assertEqual(done, [([], None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
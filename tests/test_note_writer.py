@@ -0,0 +1,90 @@
+# tests/test_note_writer.py
+# NoteWriter의 원자적 저장, 임시 파일 정리, 이름 충돌 처리, umask를 따르는 파일 권한을 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils import note_writer
+from utils.note_writer import NoteWriter, TEMP_DIR_NAME
+
+
+class NoteWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def write_all(self, contents, **options):
+        """노트들을 저장하고 (경로, 오류) 목록을 write 호출 순서대로 반환합니다."""
+        done = []
+        writer = NoteWriter(self.directory, log=lambda message: None)
+        try:
+            for content in contents:
+                writer.write(content, on_done=lambda path, error: done.append((path, error)), **options)
+        finally:
+            writer.close()
+        return done
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_replaces_file_atomically_and_removes_temp_dir(self):
+        done = self.write_all(["# 첫 노트\n\n본문"])
+        self.assertEqual(done, [(os.path.join(self.directory, "첫-노트.md"), None)])
+        self.assertEqual(self.read("첫-노트.md"), "# 첫 노트\n\n본문")
+        # 작성기를 닫으면 빈 임시 폴더도 지워져 볼트에는 노트만 남음
+        self.assertEqual(os.listdir(self.directory), ["첫-노트.md"])
+
+    def test_failed_replace_leaves_no_temp_file(self):
+        with open(os.path.join(self.directory, "노트.md"), 'w', encoding='utf-8') as f:
+            f.write("원래 내용")
+        with mock.patch.object(note_writer.os, "replace", side_effect=OSError("잠김")):
+            writer = NoteWriter(self.directory, log=lambda message: None)
+            done = []
+            writer.write("# 노트\n\n새 내용", on_done=lambda path, error: done.append((path, error)))
+            writer.close()
+        self.assertIsInstance(done[0][1], OSError)
+        self.assertEqual(self.read("노트.md"), "원래 내용")
+        self.assertFalse(os.path.exists(os.path.join(self.directory, TEMP_DIR_NAME)))
+
+    def test_name_collisions_get_numbered(self):
+        with open(os.path.join(self.directory, "같은-제목.md"), 'w', encoding='utf-8') as f:
+            f.write("기존 노트")
+        done = self.write_all(["# 같은 제목\n\n하나", "# 같은 제목\n\n둘", "# 같은 제목\n\n셋"])
+        self.assertEqual([os.path.basename(path) for path, _ in done], ["같은-제목-1.md", "같은-제목-2.md", "같은-제목-3.md"])
+        self.assertEqual(self.read("같은-제목.md"), "기존 노트")
+        self.assertTrue(self.read("같은-제목-3.md").endswith("셋"))
+
+    def test_collision_check_ignores_case(self):
+        open(os.path.join(self.directory, "Title.md"), 'w').close()
+        done = self.write_all(["# title\n\n본문"])
+        self.assertEqual(os.path.basename(done[0][0]), "title-1.md")
+
+    def test_keep_original_title(self):
+        done = self.write_all(["# 요약 제목\n\n본문"], keep_original_title=True, original_title="원본: 제목?")
+        self.assertEqual(os.path.basename(done[0][0]), "원본-제목.md")
+
+    @unittest.skipIf(os.name == 'nt', "POSIX 파일 권한")
+    def test_file_mode_follows_umask(self):
+        umask = os.umask(0o027)
+        try:
+            mode = note_writer._default_file_mode()
+        finally:
+            os.umask(umask)
+        self.assertEqual(mode, 0o640)
+        with mock.patch.object(note_writer, "_FILE_MODE", mode):
+            done = self.write_all(["# 권한\n\n본문"])
+        # mkstemp의 0600이 아니라 umask를 적용한 권한으로 저장됨
+        self.assertEqual(stat.S_IMODE(os.stat(done[0][0]).st_mode), 0o640)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# tests/test_pipeline.py
+# run_pipeline의 map-reduce / 부분 merge / 실패 경로를 가짜 자막 API와 가짜 모델(benchmarks/fakes.py)로 확인합니다.
+# 실행: python -m pytest -q tests
+
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.fakes import FakeBackendError, FakeGemini, FakeTranscriptApi, install
+from utils.gemini_dispatcher import GeminiDispatcher
+from utils.pipeline import run_pipeline
+
+VIDEO = {'id': "bench000001", 'title': "긴 영상"}
+
+
+def prompt_ids(prompt):
+    start = prompt.index('[{"id"')
+    tasks, _ = json.JSONDecoder().raw_decode(prompt, start)
+    return [task['id'] for task in tasks]
+
+
+class RecordingModel:
+    """요청마다 작업 ID를 기록하고, fail(작업 ID)가 참인 작업이 있으면 재시도하지 않는 오류를 냅니다."""
+
+    def __init__(self, fail=None):
+        self.model = FakeGemini(result_chars=40).GenerativeModel("fake")
+        self.fail = fail or (lambda task_id: False)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        ids = prompt_ids(prompt)
+        with self._lock:
+            self.requests.append(ids)
+        if any(self.fail(task_id) for task_id in ids):
+            raise FakeBackendError("잘못된 요청", code=400)
+        return self.model.generate_content(prompt, **kwargs)
+
+    def task_ids(self):
+        return [task_id for ids in self.requests for task_id in ids]
+
+
+class DroppingDispatcher:
+    """drop(작업 ID)가 참인 작업의 결과를 missing으로도 알리지 않고 버리는 디스패처. (결과가 사라지는 경우를 흉내 냄)"""
+
+    def __init__(self, drop):
+        self.drop = drop
+        self.gemini = FakeGemini(result_chars=40)
+
+    def submit(self, batch, on_result, on_done):
+        for task in batch:
+            if not self.drop(task['id']):
+                on_result(task, self.gemini.summary(task['id']))
+        on_done(batch, [], None)
+
+    def close(self):
+        pass
+
+
+class PipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+
+    def run_pipeline(self, dispatcher, **options):
+        """가짜 자막 API로 영상 하나를 처리합니다. 파이프라인이 멈추면 실패로 봅니다."""
+        outcome = {}
+
+        def target():
+            with install(transcripts=FakeTranscriptApi(segments=200, words_per_segment=8)):
+                outcome['summary'] = run_pipeline(
+                    [VIDEO], "요약해 줘", self.output_dir, model_name="fake",
+                    transcript_workers=1, dispatcher=dispatcher, log=lambda message: None, **options
+                )
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(20)
+        self.assertFalse(thread.is_alive(), "run_pipeline이 끝나지 않았습니다.")
+        return outcome['summary']
+
+    def dispatcher(self, model):
+        return GeminiDispatcher("fake", max_in_flight=2, rpm=0, tpm=0, max_retries=0, stream=False,
+                                model_factory=lambda name: model, log=lambda message: None)
+
+    def notes(self):
+        return sorted(glob.glob(os.path.join(self.output_dir, "*.md")))
+
+    def test_map_reduce_produces_one_note(self):
+        model = RecordingModel()
+        summary = self.run_pipeline(self.dispatcher(model), batch_size=2, max_batch_tokens=100000,
+                                    map_reduce_threshold=1000, map_reduce_chunk_tokens=2000)
+        ids = model.task_ids()
+        maps = [task_id for task_id in ids if "#map" in task_id]
+        self.assertGreaterEqual(len(maps), 2)
+        # reduce 작업은 모든 구간 요약이 도착한 뒤 마지막에 한 번만 나감
+        self.assertEqual(ids[-1], "bench000001#reduce")
+        self.assertEqual(ids.count("bench000001#reduce"), 1)
+        self.assertEqual(summary['saved'], ["bench000001"])
+        notes = self.notes()
+        self.assertEqual(len(notes), 1)
+        with open(notes[0], encoding='utf-8') as f:
+            self.assertIn("bench000001#reduce 요약", f.read())
+
+    def test_split_parts_are_merged(self):
+        model = RecordingModel()
+        summary = self.run_pipeline(self.dispatcher(model), batch_size=4, max_batch_tokens=3000)
+        ids = model.task_ids()
+        parts = [task_id for task_id in ids if "#part" in task_id]
+        self.assertGreaterEqual(len(parts), 3)
+        self.assertEqual(ids[-1], "bench000001#merge")
+        self.assertEqual(summary['saved'], ["bench000001"])
+        notes = self.notes()
+        self.assertEqual(len(notes), 1)
+        with open(notes[0], encoding='utf-8') as f:
+            self.assertIn("bench000001#merge 요약", f.read())
+
+    def test_failed_map_part_fails_job(self):
+        model = RecordingModel(fail=lambda task_id: task_id == "bench000001#map2")
+        summary = self.run_pipeline(self.dispatcher(model), batch_size=1, max_batch_tokens=100000,
+                                    map_reduce_threshold=1000, map_reduce_chunk_tokens=2000)
+        self.assertNotIn("bench000001#reduce", model.task_ids())
+        self.assertEqual(summary['failed'], ["bench000001"])
+        self.assertEqual(summary['saved'], [])
+        self.assertEqual(self.notes(), [])
+
+    def test_orphaned_map_job_releases_waiting_reduce(self):
+        dispatcher = DroppingDispatcher(drop=lambda task_id: task_id == "bench000001#map2")
+        summary = self.run_pipeline(dispatcher, batch_size=2, max_batch_tokens=100000,
+                                    map_reduce_threshold=1000, map_reduce_chunk_tokens=2000)
+        self.assertEqual(summary['failed'], ["bench000001"])
+        self.assertEqual(summary['saved'], [])
+        self.assertEqual(self.notes(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
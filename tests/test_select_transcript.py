@@ -0,0 +1,70 @@
+# tests/test_select_transcript.py
+# youtube_helper.select_transcript의 자막 선택 순서(선호 언어 → 수동 작성 → 번역 → 첫 자막)를 가짜 자막 목록으로 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.youtube_helper import select_transcript
+
+
+class FakeTranscript:
+    def __init__(self, language_code, is_generated=False, is_translatable=False, translate_error=None):
+        self.language_code = language_code
+        self.is_generated = is_generated
+        self.is_translatable = is_translatable
+        self.translate_error = translate_error
+        self.translated_to = []
+
+    def translate(self, language):
+        self.translated_to.append(language)
+        if self.translate_error is not None:
+            raise self.translate_error
+        return FakeTranscript(language, self.is_generated)
+
+
+class SelectTranscriptTest(unittest.TestCase):
+    def test_manual_before_generated_in_same_language(self):
+        generated = FakeTranscript('ko', is_generated=True)
+        manual = FakeTranscript('ko-KR')
+        transcript, reason = select_transcript([generated, manual])
+        self.assertIs(transcript, manual)
+        self.assertEqual(reason, "ko-KR 수동작성 자막")
+
+    def test_preferred_language_order(self):
+        english = FakeTranscript('en')
+        korean = FakeTranscript('ko', is_generated=True)
+        self.assertIs(select_transcript([english, korean])[0], korean)
+        self.assertIs(select_transcript([english, korean], languages=['en', 'ko'])[0], english)
+
+    def test_translation_not_used_when_preferred_track_exists(self):
+        japanese = FakeTranscript('ja', is_translatable=True)
+        english = FakeTranscript('en', is_generated=True)
+        transcript, _ = select_transcript([japanese, english])
+        self.assertIs(transcript, english)
+        self.assertEqual(japanese.translated_to, [])
+
+    def test_translates_when_no_preferred_track(self):
+        japanese = FakeTranscript('ja', is_translatable=True)
+        transcript, reason = select_transcript([FakeTranscript('fr'), japanese])
+        self.assertEqual(transcript.language_code, 'ko')
+        self.assertEqual(reason, "ja → ko 번역 자막")
+
+    def test_next_language_when_translation_fails(self):
+        japanese = FakeTranscript('ja', is_translatable=True, translate_error=RuntimeError("번역 불가"))
+        french = FakeTranscript('fr')
+        transcript, reason = select_transcript([french, japanese])
+        # 선호 언어로 모두 번역하지 못하면 첫 번째 자막을 그대로 사용
+        self.assertEqual(japanese.translated_to, ['ko', 'en'])
+        self.assertIs(transcript, french)
+        self.assertEqual(reason, "fr 자막")
+
+    def test_empty_list(self):
+        self.assertEqual(select_transcript([]), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# tests/test_transcript.py
+# Transcript의 시간 구간 자르기 / 세그먼트 경계 조각 나누기 / 타임스탬프 출력과 언어 순위 함수를 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.batch_planner import estimate_tokens
+from utils.transcript import Transcript, format_timestamp, language_rank, normalize_language, watch_url
+
+
+def make_transcript(count=50, seconds=4.0):
+    return Transcript.from_segments(
+        (f"세그먼트{i} " + " ".join(f"단어{i}-{w}" for w in range(6)), i * seconds, seconds) for i in range(count)
+    )
+
+
+class TranscriptTest(unittest.TestCase):
+    def test_from_segments_skips_empty_text(self):
+        transcript = Transcript.from_segments([("첫 줄\n둘째 줄", 0.0, 2.0), ("  ", 2.0, 1.0), ("끝", 3.0, 1.0)])
+        self.assertEqual(transcript.text, "첫 줄 둘째 줄 끝")
+        self.assertEqual(list(transcript), [("첫 줄 둘째 줄", 0.0, 2.0), ("끝", 3.0, 1.0)])
+        self.assertEqual(transcript.end, 4.0)
+
+    def test_slice_keeps_segments_starting_in_range(self):
+        transcript = make_transcript()
+        part = transcript.slice(10, 20)
+        self.assertEqual([start for _, start, _ in part], [12.0, 16.0])
+        self.assertEqual(part.text, " ".join(text for text, _, _ in part))
+        self.assertEqual(len(transcript.slice(190)), 2)
+        self.assertFalse(transcript.slice(500))
+
+    def test_chunks_align_to_segments_without_overlap(self):
+        transcript = make_transcript()
+        chunks = transcript.chunks(100)
+        self.assertGreater(len(chunks), 2)
+        # 조각들을 이어 붙이면 빠지거나 겹치는 세그먼트 없이 원래 세그먼트 목록이 됨
+        self.assertEqual([segment for chunk in chunks for segment in chunk], list(transcript))
+        self.assertEqual(" ".join(chunk.text for chunk in chunks), transcript.text)
+        for chunk in chunks:
+            self.assertIn(chunk.start, transcript.starts)
+            self.assertLessEqual(estimate_tokens(chunk.text), 110)
+
+    def test_chunks_limit_seconds(self):
+        transcript = make_transcript()
+        chunks = transcript.chunks(100000, max_seconds=30)
+        # 4초 세그먼트 7개(28초)까지 담고 8번째 세그먼트에서 자름
+        self.assertEqual([len(chunk) for chunk in chunks], [7] * 7 + [1])
+        for chunk in chunks:
+            self.assertLessEqual(chunk.end - chunk.start, 30)
+
+    def test_oversized_segment_is_its_own_chunk(self):
+        transcript = make_transcript(count=3)
+        chunks = transcript.chunks(1)
+        self.assertEqual([len(chunk) for chunk in chunks], [1, 1, 1])
+
+    def test_to_markdown_links_line_start_seconds(self):
+        transcript = make_transcript(count=40, seconds=4.5)
+        lines = transcript.to_markdown("abc123", interval_seconds=60).split("\n")
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith(f"[0:00]({watch_url('abc123', 0)}) 세그먼트0 "))
+        # 두 번째 줄은 60초 이후 처음 시작하는 세그먼트(63초)에서 시작하며 링크의 초는 소수점을 버림
+        self.assertTrue(lines[1].startswith("[1:03](https://www.youtube.com/watch?v=abc123&t=63s) 세그먼트14 "))
+        self.assertTrue(lines[2].startswith("[2:06](https://www.youtube.com/watch?v=abc123&t=126s) 세그먼트28 "))
+
+    def test_format_timestamp(self):
+        self.assertEqual(format_timestamp(59.9), "0:59")
+        self.assertEqual(format_timestamp(3725), "1:02:05")
+
+
+class LanguageTest(unittest.TestCase):
+    def test_normalize_language(self):
+        self.assertEqual(normalize_language("ko-KR"), "ko")
+        self.assertEqual(normalize_language("en_US"), "en")
+        self.assertEqual(normalize_language("KOR"), "ko")
+        self.assertEqual(normalize_language("ja"), "ja")
+
+    def test_language_rank(self):
+        self.assertEqual(language_rank("ko", False), 0)
+        self.assertEqual(language_rank("ko-KR", True), 1)
+        self.assertEqual(language_rank("en", False), 2)
+        self.assertEqual(language_rank("en-GB", True), 3)
+        self.assertIsNone(language_rank("ja", False))
+        self.assertEqual(language_rank("ja", True, languages=["ja-JP", "ko"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# tests/test_transcript_cache.py
+# TranscriptCache.find가 선호 언어를 지키는지 네트워크 없이 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.transcript_cache import TranscriptCache
+
+
+class TranscriptCacheFindTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TranscriptCache(os.path.join(self.tmp.name, "transcripts.sqlite3"))
+        self.cache.put("vid", "en", True, [["hello", 0.0, 1.0]])
+        self.cache.put("vid", "ko", True, [["안녕", 0.0, 1.0]])
+        self.cache.put("vid", "ko", False, [["안녕하세요", 0.0, 1.0]])
+
+    def tearDown(self):
+        self.cache.store.close()
+        self.tmp.cleanup()
+
+    def test_prefers_language_order_then_manual(self):
+        self.assertEqual(self.cache.find("vid", ["ko", "en"])[:2], ("ko", False))
+        self.assertEqual(self.cache.find("vid", ["en", "ko"])[:2], ("en", True))
+
+    def test_other_languages_only_as_fallback(self):
+        # 선호 언어가 바뀌면 다른 언어의 캐시는 바로 쓰지 않고, fallback=True일 때만 반환
+        self.assertIsNone(self.cache.find("vid", ["ja"]))
+        self.assertIsNotNone(self.cache.find("vid", ["ja"], fallback=True))
+        self.assertIsNone(self.cache.find("other", ["ja"], fallback=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# tests/test_vault_index.py
+# 노트 frontmatter 작성 / 읽기와, frontmatter의 video_id로 이미 노트가 있는 영상을 건너뛰는 VaultIndex를 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.engine import Engine
+from utils.file_helper import build_frontmatter, read_frontmatter
+from utils.vault_index import VaultIndex
+
+
+class VaultTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.vault = os.path.join(self.root, "vault")
+        self.index_dir = os.path.join(self.root, "index")
+        os.makedirs(self.vault)
+
+    def write_note(self, name, metadata=None, body="# 노트\n\n본문"):
+        path = os.path.join(self.vault, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write((build_frontmatter(metadata) if metadata else "") + body)
+        return path
+
+
+class FrontmatterTest(VaultTestCase):
+    def test_round_trip_with_quotes_colons_and_newlines(self):
+        metadata = {
+            "video_id": "abc123",
+            "title": '제목: "따옴표"와 \'작은따옴표\'\n둘째 줄 --- 끝',
+            "channel": None,
+            "model": "gemini-1.5-flash",
+            "prompt_hash": "0123456789ab",
+        }
+        path = self.write_note("노트.md", metadata)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        # 제목의 줄바꿈이 frontmatter 줄을 나누지 않으며, None 값은 적지 않음
+        self.assertEqual(text.split("---\n")[1].count("\n"), 4)
+        self.assertNotIn("channel", text)
+        expected = dict(metadata)
+        del expected["channel"]
+        self.assertEqual(read_frontmatter(path), expected)
+
+    def test_note_without_frontmatter(self):
+        path = self.write_note("메모.md", body="그냥 메모\nvideo_id: abc")
+        self.assertEqual(read_frontmatter(path), {})
+
+
+class VaultIndexTest(VaultTestCase):
+    def test_refresh_collects_video_ids(self):
+        self.write_note("a.md", {"video_id": "vid-a"})
+        self.write_note("b.md", {"video_id": "vid-b"})
+        self.write_note("메모.md")
+        self.write_note("c.txt", {"video_id": "vid-c"})
+        index = VaultIndex.for_vault(self.index_dir, self.vault).refresh()
+        self.assertEqual(index.video_ids(), {"vid-a", "vid-b"})
+        self.assertEqual(index.path_for("vid-b"), os.path.join(os.path.abspath(self.vault), "b.md"))
+
+    def test_reopen_reads_only_changed_notes(self):
+        self.write_note("a.md", {"video_id": "vid-a"})
+        self.write_note("b.md", {"video_id": "vid-b"})
+        VaultIndex.for_vault(self.index_dir, self.vault).refresh()
+        os.remove(os.path.join(self.vault, "b.md"))
+        self.write_note("c.md", {"video_id": "vid-c"})
+        with mock.patch("utils.vault_index.read_frontmatter", wraps=read_frontmatter) as read:
+            index = VaultIndex.for_vault(self.index_dir, self.vault).refresh()
+        self.assertEqual([os.path.basename(call.args[0]) for call in read.call_args_list], ["c.md"])
+        self.assertEqual(index.video_ids(), {"vid-a", "vid-c"})
+
+    def test_add_saved_note(self):
+        index = VaultIndex.for_vault(self.index_dir, self.vault).refresh()
+        path = self.write_note("new.md", {"video_id": "vid-new"})
+        index.add("vid-new", path)
+        self.assertEqual(index.video_ids(), {"vid-new"})
+
+    def test_engine_skips_videos_with_existing_notes(self):
+        self.write_note("a.md", {"video_id": "vid-a"})
+        engine = Engine({"vault_index_dir": self.index_dir}, base_dir=self.root)
+        videos = [{'id': "vid-a", 'title': "A"}, {'id': "vid-b", 'title': "B"}]
+        result = {"saved": ["vid-b"], "failed": [], "skipped": [], "resumed": [], "cached": []}
+        with mock.patch("utils.pipeline.run_pipeline", return_value=result) as run:
+            summary = engine.process(videos, "요약해 줘", self.vault, model_name="fake", log=lambda message: None)
+        self.assertEqual(run.call_args.args[0], [{'id': "vid-b", 'title': "B"}])
+        self.assertEqual(summary["existing"], ["vid-a"])
+        self.assertEqual(summary["total"], 2)
+        self.assertEqual(engine.processed_video_ids(self.vault), {"vid-a"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# tests/test_video_catalog.py
+# VideoCatalog의 필터 / 검색 / 정렬을 네트워크 없이 확인합니다.
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.video_catalog import VideoCatalog
+
+
+def make_videos():
+    return [
+        {'id': "long", 'title': "파이썬 강의 1편", 'total_seconds': 1800, 'published_at': "2024-01-03T00:00:00Z"},
+        {'id': "mid", 'title': "Python tips", 'total_seconds': 600, 'published_at': "2024-01-02T00:00:00Z"},
+        {'id': "short", 'title': "짧은 영상 #비밀치트키", 'total_seconds': 40, 'published_at': "2024-01-01T00:00:00Z"},
+    ]
+
+
+class VideoCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.catalog = VideoCatalog()
+        self.catalog.add(make_videos())
+
+    def ids(self, **kwargs):
+        return [video['id'] for video in self.catalog.query(**kwargs)]
+
+    def test_filters_and_sorts(self):
+        self.assertEqual(self.ids(include_shorts=False), ["long", "mid"])
+        self.assertEqual(self.ids(min_duration_seconds=120, sort="shortest"), ["mid", "long"])
+        self.assertEqual(self.ids(sort="oldest"), ["short", "mid", "long"])
+
+    def test_text_search_matches_word_prefixes(self):
+        self.assertEqual(self.ids(text="pyth"), ["mid"])
+        self.assertEqual(self.ids(text="파이썬 강의"), ["long"])
+        self.assertEqual(self.ids(text="없는단어"), [])
+
+    def test_search_without_words_is_no_filter(self):
+        # 문장 부호만 있는 검색어는 최소 길이 조건과 함께여도 오류 없이 검색 조건이 없는 것으로 처리
+        for text in ("?", "!!!", "  "):
+            self.assertEqual(self.ids(min_duration_seconds=120, text=text), ["long", "mid"])
+
+    def test_add_while_querying(self):
+        # '더 불러오기' 작업 스레드의 add와 GUI 스레드의 query가 겹쳐도 오류 없이 일관된 결과를 반환
+        errors = []
+
+        def load_more():
+            for page in range(50):
+                self.catalog.add([
+                    {'id': f"p{page}-{i}", 'title': f"추가 영상 {i}", 'total_seconds': 100 + i, 'published_at': f"2023-{page:02d}"}
+                    for i in range(40)
+                ])
+
+        thread = threading.Thread(target=load_more)
+        thread.start()
+        try:
+            while thread.is_alive():
+                for video in self.catalog.query(min_duration_seconds=120, text="영상", sort="longest"):
+                    if video['total_seconds'] < 120:
+                        errors.append(video['id'])
+        finally:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.catalog), 3 + 50 * 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# utils/batch_planner.py
+# Gemini 배치 요청을 토큰 예산 안에서 구성하는 배치 계획기를 포함합니다.
+# 네트워크나 API 키 없이 동작하며, 같은 입력에 대해 항상 같은 배치를 만듭니다.
+
+# 배치 요청마다 붙는 안내 문구와 JSON 구조에 대한 대략적인 토큰 수
+PROMPT_OVERHEAD_TOKENS = 300
+# 작업 하나를 JSON 배열에 넣을 때 추가되는 키, 따옴표 등의 토큰 수
+TASK_OVERHEAD_TOKENS = 20
+# 배치가 예산의 이 비율 이상 채워지면 더 기다리지 않고 바로 보냄
+FULL_RATIO = 0.9
+
+def estimate_tokens(text):
+    """
+    텍스트의 토큰 수를 어림합니다.
+    영문 등 ASCII 문자는 약 4자당 1토큰, 한글 등 그 밖의 문자는 약 1.5자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    if text.isascii():
+        return len(text) // 4 + 1
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return int(ascii_chars / 4 + other_chars / 1.5) + 1
+
+def task_tokens(task):
+    return estimate_tokens(task['task']) + TASK_OVERHEAD_TOKENS
+
+def split_text(text, max_tokens):
+    """
+    텍스트를 토큰 수가 max_tokens 이하인 조각들로 나눕니다.
+    가능한 한 공백 위치에서 자르며, 조각을 이어 붙이면 원문과 같습니다.
+    """
+    total_tokens = estimate_tokens(text)
+    if total_tokens <= max_tokens:
+        return [text]
+    chars_per_token = len(text) / total_tokens
+    chunks = []
+    start = 0
+    while start < len(text):
+        # 전체 평균 글자/토큰 비율로 조각 길이를 어림한 뒤 초과하면 줄임
+        end = min(len(text), start + max(1, int(max_tokens * chars_per_token)))
+        while end < len(text) and end - start > 1 and estimate_tokens(text[start:end]) > max_tokens:
+            end = start + max(1, int((end - start) * 0.9))
+        if end < len(text):
+            space = text.rfind(' ', start + (end - start) // 2, end)
+            if space > start:
+                end = space + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+class _Batch:
+    __slots__ = ('tasks', 'tokens')
+
+    def __init__(self):
+        self.tasks = []
+        self.tokens = PROMPT_OVERHEAD_TOKENS
+
+class BatchPlanner:
+    """
+    작업을 하나씩 받아 토큰 예산(token_budget)과 요청당 최대 작업 수(max_tasks)를 넘지 않도록 배치로 묶습니다.
+
+    최대 max_open_batches개의 배치를 열어 두고, 작업을 들어갈 수 있는 첫 번째 배치에 넣습니다 (first-fit).
+    배치가 가득 차면 add가 곧바로 반환하므로 스트리밍 파이프라인에서도 사용할 수 있습니다.
+    예산보다 큰 작업은 splitter(task, max_tokens)가 있으면 여러 조각 작업으로 나누고, 없으면 단독 배치로 보냅니다.
+    """
+
+    def __init__(self, token_budget, max_tasks, splitter=None, max_open_batches=4):
+        self.token_budget = token_budget
+        self.max_tasks = max(1, int(max_tasks))
+        self.splitter = splitter
+        self.max_open_batches = max(1, int(max_open_batches))
+        self._open = []
+
+    @property
+    def task_budget(self):
+        """작업 하나가 차지할 수 있는 최대 토큰 수"""
+        return self.token_budget - PROMPT_OVERHEAD_TOKENS
+
+    def add(self, task):
+        """작업을 추가하고, 그 결과 보낼 준비가 된 배치 목록을 반환합니다."""
+        tokens = task_tokens(task)
+        if tokens > self.task_budget:
+            if self.splitter is None:
+                return [[task]]
+            ready = []
+            for part in self.splitter(task, self.task_budget - TASK_OVERHEAD_TOKENS):
+                ready.extend(self._place(part, task_tokens(part)))
+            return ready
+        return self._place(task, tokens)
+
+    def flush(self):
+        """열려 있는 배치를 모두 반환하고 비웁니다."""
+        ready = [batch.tasks for batch in self._open if batch.tasks]
+        self._open = []
+        return ready
+
+    def _place(self, task, tokens):
+        ready = []
+        target = None
+        for batch in self._open:
+            if batch.tokens + tokens <= self.token_budget and len(batch.tasks) < self.max_tasks:
+                target = batch
+                break
+        if target is None:
+            if len(self._open) >= self.max_open_batches:
+                # 가장 많이 채워진 배치를 보내고 자리를 만듦 (같으면 먼저 연 배치)
+                fullest = max(self._open, key=lambda b: b.tokens)
+                self._open.remove(fullest)
+                ready.append(fullest.tasks)
+            target = _Batch()
+            self._open.append(target)
+
+        target.tasks.append(task)
+        target.tokens += tokens
+        if len(target.tasks) >= self.max_tasks or target.tokens >= self.token_budget * FULL_RATIO:
+            self._open.remove(target)
+            ready.append(target.tasks)
+        return ready
+
+def plan_batches(tasks, token_budget, max_tasks, splitter=None, max_open_batches=4):
+    """작업 목록 전체를 한 번에 배치로 나눕니다. BatchPlanner와 같은 규칙을 사용합니다."""
+    planner = BatchPlanner(token_budget, max_tasks, splitter, max_open_batches)
+    batches = []
+    for task in tasks:
+        batches.extend(planner.add(task))
+    batches.extend(planner.flush())
+    return batches
@@ -0,0 +1,125 @@
+# utils/cache_store.py
+# 여러 로컬 캐시가 공통으로 사용하는 SQLite 기반 키-값 저장소를 포함합니다.
+# 값은 zlib으로 압축해 저장하며, TTL 만료와 전체 크기 기준 LRU 제거를 지원합니다.
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+class CacheStore:
+    """
+    문자열 키와 문자열 값을 저장하는 스레드 안전한 디스크 캐시.
+
+    Args:
+        path (str): SQLite 파일 경로. 상위 폴더가 없으면 생성합니다.
+        ttl_seconds (float, optional): 항목의 유효 기간. None 또는 0이면 만료되지 않습니다.
+        max_bytes (int, optional): 압축된 값의 총 크기 상한. 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, path, ttl_seconds=None, max_bytes=None):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.ttl_seconds = ttl_seconds or None
+        self.max_bytes = max_bytes or None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _is_expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key):
+        """키에 해당하는 값을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key):
+        """(값, 저장 시각)을 반환합니다. 저장 시각은 time.time() 기준이며, 없거나 만료되었으면 None을 반환합니다."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self._is_expired(row[1], now):
+                self._delete(key)
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return zlib.decompress(row[0]).decode('utf-8'), row[1]
+
+    def put(self, key, value):
+        """값을 압축하여 저장하고, 크기 상한을 넘으면 오래된 항목을 제거합니다."""
+        blob = zlib.compress(value.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now)
+            )
+            self._total_bytes += len(blob)
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._delete(key)
+            self._conn.commit()
+
+    def keys_with_prefix(self, prefix):
+        """주어진 접두사로 시작하는 키 목록을 반환합니다. 만료 여부는 get에서 확인합니다."""
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM entries WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def total_bytes(self):
+        return self._total_bytes
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _delete(self, key):
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _evict(self):
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            expired_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries WHERE created_at < ?", (cutoff,)
+            ).fetchone()[0]
+            if expired_bytes:
+                self._conn.execute("DELETE FROM entries WHERE created_at < ?", (cutoff,))
+                self._total_bytes -= expired_bytes
+        if self.max_bytes is None:
+            return
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= size
@@ -0,0 +1,81 @@
+# utils/channel_cache.py
+# 채널 URL → 채널 ID → 업로드 재생목록 ID 변환 결과를 보관하여
+# 페이지를 넘길 때마다 search().list / channels().list를 다시 호출하지 않도록 하는 캐시를 포함합니다.
+
+import json
+import os
+import re
+import threading
+import time
+from .cache_store import CacheStore
+
+def normalize_channel_url(url):
+    """
+    같은 채널을 가리키는 URL이 같은 키가 되도록 정리합니다. (예: .../@handle/videos → youtube.com/@handle)
+    /channel/UC... 채널 ID는 대소문자를 구분하므로 스킴, 호스트, @핸들만 소문자로 바꿉니다.
+    """
+    normalized = re.split(r'[?#]', url.strip())[0].rstrip('/')
+    normalized = re.sub(r'^https?://', '', normalized, flags=re.IGNORECASE)
+    host, _, path = normalized.partition('/')
+    host = re.sub(r'^(www\.|m\.)', '', host.lower())
+    path = re.sub(r'/(videos|shorts|streams|featured|playlists|about)$', '', '/' + path, flags=re.IGNORECASE)
+    path = re.sub(r'^/@[^/]+', lambda m: m.group(0).lower(), path)
+    return host + path.rstrip('/')
+
+class ChannelCache:
+    """
+    채널 URL별 (채널 ID, 업로드 재생목록 ID)를 메모리와 디스크에 저장하는 캐시.
+    항목은 메모리와 디스크 모두 디스크에 저장된 시각부터 ttl_seconds가 지나면 만료되며, invalidate로 즉시 무효화할 수 있습니다.
+    """
+
+    def __init__(self, path, ttl_seconds=None):
+        self.store = CacheStore(path, ttl_seconds=ttl_seconds)
+        self.ttl_seconds = ttl_seconds or None
+        self._memo = {} # key → (항목, 저장 시각)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, base_dir):
+        """config의 channel_cache_* 설정으로 캐시를 만듭니다. 경로가 비어 있으면 None을 반환합니다."""
+        path = config.get("channel_cache_path")
+        if not path:
+            return None
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        ttl_days = config.get("channel_cache_ttl_days", 30)
+        return cls(path, ttl_seconds=ttl_days * 86400 if ttl_days else None)
+
+    def get(self, channel_url):
+        """저장된 (채널 ID, 업로드 재생목록 ID)를 반환합니다. 없으면 None을 반환합니다."""
+        key = normalize_channel_url(channel_url)
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo is not None:
+                if not self._is_expired(memo[1]):
+                    return memo[0]
+                del self._memo[key]
+        stored = self.store.get_entry(key)
+        if stored is None:
+            return None
+        value, stored_at = stored
+        data = json.loads(value)
+        entry = (data['channel_id'], data['uploads_playlist_id'])
+        with self._lock:
+            self._memo[key] = (entry, stored_at)
+        return entry
+
+    def put(self, channel_url, channel_id, uploads_playlist_id):
+        key = normalize_channel_url(channel_url)
+        with self._lock:
+            self._memo[key] = ((channel_id, uploads_playlist_id), time.time())
+        self.store.put(key, json.dumps({'channel_id': channel_id, 'uploads_playlist_id': uploads_playlist_id}))
+
+    def invalidate(self, channel_url):
+        key = normalize_channel_url(channel_url)
+        with self._lock:
+            self._memo.pop(key, None)
+        self.store.delete(key)
+
+    def _is_expired(self, stored_at):
+        # CacheStore와 같은 기준(time.time()으로 기록한 저장 시각)으로 만료 판단
+        return self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds
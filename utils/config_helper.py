@@ -0,0 +1,98 @@
+# utils/config_helper.py
+# config.json 설정과 기본 프롬프트 파일을 불러오는 함수들을 포함합니다.
+# GUI(main.py)와 명령줄 실행기(cli.py)가 함께 사용합니다.
+
+import logging
+import os
+import json
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 (config.json, default_prompt.json, MYAPI.json이 있는 폴더)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+DEFAULT_PROMPT_TEXT = "다음 텍스트를 요약하고 정리해주세요:\n\n"
+
+def load_config(filepath="config.json"):
+    """JSON 파일에서 설정을 로드합니다. 파일에 없는 항목은 기본값을 사용합니다."""
+    config_path = os.path.join(PROJECT_ROOT, filepath)
+    defaults = {
+        "font_size": 12, 
+        "theme": "dark",
+        "obsidian_path": "C:/Users/bounc/OneDrive/문서/SummerVCT/Notes",
+        "gemini_batch_size": 30, # Gemini 요청 하나에 묶을 최대 영상 수
+        "gemini_max_batch_tokens": 120000, # Gemini 요청 하나의 최대 추정 입력 토큰 수
+        "gemini_max_in_flight": 3, # 동시에 보낼 Gemini 요청 수
+        "gemini_rpm": 60, # 분당 최대 요청 수 (0이면 제한 없음)
+        "gemini_tpm": 1000000, # 분당 최대 추정 입력 토큰 수 (0이면 제한 없음)
+        "gemini_max_retries": 4, # 429 / 5xx 오류 시 최대 재시도 횟수
+        "gemini_stream": True, # 응답을 스트리밍으로 받아 완성된 결과부터 저장
+        "gemini_structured_output": True, # JSON 응답 스키마로 결과 형식 강제 (지원하지 않는 모델이면 False)
+        "map_reduce_threshold_tokens": 30000, # 추정 토큰 수가 이보다 많은 스크립트는 구간별로 요약한 뒤 합침 (0이면 사용 안 함)
+        "map_reduce_chunk_tokens": 8000, # 구간 하나의 최대 추정 토큰 수
+        "map_reduce_chunk_minutes": 30, # 구간 하나의 최대 길이 (분, 0이면 제한 없음)
+        "note_timestamp_interval": 0, # 0보다 크면 노트 끝에 이 간격(초)마다 &t= 링크가 달린 원본 스크립트를 덧붙임
+        "shorts_detectors": ["hashtag"], # Shorts 판별 방법: "hashtag"(제목 끝 해시태그), "duration"(길이)
+        "shorts_title_suffixes": ["#비밀치트키"], # hashtag 판별기가 확인할 제목 끝 해시태그
+        "shorts_max_seconds": 60, # duration 판별기가 Shorts로 보는 최대 길이 (초)
+        "youtube_url": "https://www.youtube.com/@slow_doctor",
+        "min_video_duration": 120, # Default to 2 minutes (120 seconds)
+        "run_ip_test": True, # Default to True
+        "api_check_cache_path": "cache/api_check.json", # Gemini API 접근성 확인 결과 저장 위치 (비워두면 매번 확인)
+        "api_check_ttl_minutes": 60, # 이 시간 안에 성공한 확인 결과가 있으면 다시 확인하지 않음
+        "gemini_model": "gemini-2.5-flash", # Default Gemini model
+        "list_load_batch_size": 30, # Default to 30
+        "include_shorts": False, # Default to False
+        "keep_original_title": False, # Default to False
+        "youtube_api_workers": 4, # 동시에 보낼 YouTube Data API 요청 수
+        "transcript_workers": 4, # 동시에 스크립트를 가져올 작업자 수
+        "transcript_timeout": 60, # 영상 하나의 스크립트 추출 제한 시간 (초)
+        "transcript_max_retries": 2, # 자막 요청이 연결 끊김 / 429 / 5xx 오류로 실패했을 때 다시 시도하는 최대 횟수
+        "transcript_languages": ["ko", "en"], # 자막 선호 언어 순서. 선호 언어 자막이 없을 때만 번역 자막을 사용
+        "transcript_cache_path": "cache/transcripts.sqlite3", # 비워두면 자막 캐시를 사용하지 않음
+        "transcript_cache_ttl_days": 30, # 0이면 만료되지 않음
+        "transcript_cache_max_mb": 500, # 0이면 크기 제한 없음
+        "channel_cache_path": "cache/channels.sqlite3", # 비워두면 채널 정보 캐시를 사용하지 않음
+        "channel_cache_ttl_days": 30, # 0이면 만료되지 않음
+        "result_cache_path": "cache/results.sqlite3", # 비워두면 요약 결과 캐시를 사용하지 않음
+        "result_cache_max_mb": 200, # 0이면 크기 제한 없음
+        "video_index_path": "cache/videos.sqlite3", # 비워두면 영상 인덱스(증분 동기화)를 사용하지 않음
+        "index_initial_pages": 4, # 처음 보는 채널을 동기화할 때 가져올 최대 페이지 수 (페이지당 50개)
+        "job_journal_dir": "cache/jobs", # 비워두면 작업 일지(중단된 작업 이어하기)를 사용하지 않음
+        "vault_index_dir": "cache/vaults", # 비워두면 노트 폴더 인덱스(노트 frontmatter의 video_id)를 사용하지 않음
+        "skip_existing_notes": True, # 노트 폴더에 이미 노트가 있는 영상은 처리하지 않음
+        "metrics_path": "cache/metrics.json", # 마지막 실행의 단계별 소요 시간·처리량 저장 위치 (비워두면 저장하지 않음)
+        "log_level": "INFO", # 로그 수준: DEBUG(자막 선택·샘플 등 상세), INFO, WARNING, ERROR
+        "log_json": False # 로그를 한 줄에 JSON 객체 하나씩 출력 (화면 없는 실행의 로그 수집용)
+    }
+
+    if not os.path.exists(config_path):
+        return defaults
+
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+            return {key: config.get(key, default) for key, default in defaults.items()}
+    except (json.JSONDecodeError, IOError):
+        return defaults
+
+def load_prompt_from_json(filepath="default_prompt.json"):
+    """
+    파일에서 기본 프롬프트를 로드합니다.
+    .json 파일은 'prompt' 항목을 읽고, 그 밖의 파일(.txt, .md 등)은 내용 전체를 프롬프트로 사용합니다.
+    """
+    json_path = os.path.join(PROJECT_ROOT, filepath)
+    
+    if not os.path.exists(json_path):
+        logger.warning("%s 파일을 찾을 수 없습니다. 기본 프롬프트를 사용합니다.", json_path)
+        return DEFAULT_PROMPT_TEXT
+    
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            if not json_path.lower().endswith('.json'):
+                return f.read()
+            data = json.load(f)
+            return data.get("prompt", DEFAULT_PROMPT_TEXT)
+    except (json.JSONDecodeError, IOError) as e:
+        logger.warning("프롬프트 파일 로딩 실패 - %s. 기본 프롬프트를 사용합니다.", e)
+        return DEFAULT_PROMPT_TEXT
@@ -0,0 +1,235 @@
+# utils/engine.py
+# GUI 없이 영상 목록 조회와 스크립트 추출 → 요약 → 저장 파이프라인을 실행하는 엔진을 포함합니다.
+# tkinter App과 명령줄 실행기(cli.py)가 같은 엔진을 사용합니다.
+
+import logging
+import os
+from . import youtube_helper, pipeline
+from .config_helper import PROJECT_ROOT
+from .transcript_cache import TranscriptCache
+from .channel_cache import ChannelCache
+from .result_cache import ResultCache
+from .video_index import VideoIndex
+from .video_catalog import VideoCatalog, make_shorts_detector
+from .vault_index import VaultIndex
+from .metrics import METRICS
+from .job_journal import JobJournal
+from .gemini_dispatcher import GeminiDispatcher
+
+logger = logging.getLogger(__name__)
+
+class Engine:
+    """
+    설정(config)에 따라 캐시와 영상 인덱스를 준비하고, 영상 목록 조회와 처리 파이프라인 실행을 담당합니다.
+    """
+
+    def __init__(self, config, base_dir=PROJECT_ROOT):
+        self.config = config
+        self.base_dir = base_dir
+        self.transcript_cache = TranscriptCache.from_config(config, base_dir)
+        self.channel_cache = ChannelCache.from_config(config, base_dir)
+        self.result_cache = ResultCache.from_config(config, base_dir)
+        self.video_index = VideoIndex.from_config(config, base_dir)
+        self.catalog = VideoCatalog(make_shorts_detector(config))
+        self._vault_indexes = {} # 노트 폴더 경로 → VaultIndex
+        youtube_helper.youtube.configure(config.get("youtube_api_workers", 4))
+
+    def load_channel_videos(self, channel_url, include_shorts=None, min_duration_seconds=None):
+        """
+        채널의 첫 영상 목록을 불러옵니다.
+        영상 인덱스를 사용하면 새 업로드만 동기화한 뒤 인덱스에 저장된 전체 목록을 반환합니다.
+        불러온 영상은 필터와 관계없이 모두 카탈로그(self.catalog)에 들어가므로, 이후 조건 변경은 query_videos로 처리합니다.
+
+        Returns:
+            tuple: (영상 목록, 다음 페이지 토큰). 토큰이 None이면 더 불러올 영상이 없습니다.
+        """
+        include_shorts, min_duration_seconds = self._filter_options(include_shorts, min_duration_seconds)
+        self.catalog.clear()
+        if self.video_index is not None:
+            channel_id, _ = youtube_helper.sync_channel(
+                channel_url,
+                self.video_index,
+                self.channel_cache,
+                max_pages=self.config.get("index_initial_pages", 4),
+                prefetch_page_size=self.config.get("list_load_batch_size", 30)
+            )
+            self.catalog.add(self.video_index.list_videos(channel_id))
+            next_page_token = self.video_index.get_backfill_token(channel_id)
+        else:
+            videos, next_page_token = youtube_helper.get_videos_from_channel(
+                channel_url,
+                include_shorts=True,
+                min_duration_seconds=0,
+                max_results=self.config.get("list_load_batch_size", 30),
+                channel_cache=self.channel_cache
+            )
+            self.catalog.add(videos)
+        return self.catalog.query(include_shorts, min_duration_seconds), next_page_token
+
+    def load_more_channel_videos(self, channel_url, page_token, include_shorts=None, min_duration_seconds=None):
+        """
+        load_channel_videos 이후의 영상을 이어서 불러와 카탈로그에 추가합니다.
+        영상 인덱스를 사용하면 처음 동기화에서 가져오지 못한 과거 영상을 인덱스에 추가하고 그 영상들만 반환합니다.
+
+        Returns:
+            tuple: (새로 불러온 영상 중 필터를 통과한 목록, 다음 페이지 토큰)
+        """
+        include_shorts, min_duration_seconds = self._filter_options(include_shorts, min_duration_seconds)
+        batch_size = self.config.get("list_load_batch_size", 30)
+        if self.video_index is not None:
+            channel_id, new_videos = youtube_helper.backfill_channel(
+                channel_url,
+                self.video_index,
+                self.channel_cache,
+                page_size=batch_size
+            )
+            next_page_token = self.video_index.get_backfill_token(channel_id)
+        else:
+            new_videos, next_page_token = youtube_helper.get_videos_from_channel(
+                channel_url,
+                include_shorts=True,
+                min_duration_seconds=0,
+                max_results=batch_size,
+                page_token=page_token,
+                channel_cache=self.channel_cache
+            )
+        return self.catalog.filter(self.catalog.add(new_videos), include_shorts, min_duration_seconds), next_page_token
+
+    def query_videos(self, include_shorts=None, min_duration_seconds=None, text=None, sort="newest"):
+        """불러온 영상들을 네트워크 요청 없이 다시 걸러내고 정렬합니다. 조건은 VideoCatalog.query와 같습니다."""
+        include_shorts, min_duration_seconds = self._filter_options(include_shorts, min_duration_seconds)
+        return self.catalog.query(include_shorts, min_duration_seconds, text=text, sort=sort)
+
+    def load_videos_by_ids(self, video_ids):
+        """영상 ID 또는 영상 URL 목록으로 처리할 영상 목록을 만듭니다. 인식할 수 없는 항목은 무시합니다."""
+        ids = []
+        for value in video_ids:
+            video_id = youtube_helper.extract_video_id(value)
+            if video_id and video_id not in ids:
+                ids.append(video_id)
+        return youtube_helper.get_videos_by_ids(ids)
+
+    def process(self, videos, user_prompt, output_dir, model_name=None, keep_original_title=None, log=None, progress=None):
+        """
+        선택된 영상들을 처리 파이프라인으로 실행하고 결과 요약을 반환합니다.
+        job_journal_dir이 설정되어 있으면 같은 영상 선택·프롬프트·모델·저장 경로의 중단된 작업을 이어서 진행합니다.
+        skip_existing_notes가 켜져 있으면 노트 폴더에 이미 노트가 있는 영상은 스크립트 추출 전에 빼고 'existing'에 담습니다.
+        progress는 영상 하나가 끝날 때마다 (끝난 영상 수, 처리할 영상 수)로 호출됩니다.
+        실행이 끝나면 단계별 소요 시간과 처리량을 log로 보고하고, metrics_path가 설정되어 있으면 JSON으로 저장합니다.
+        log가 없으면 진행 메시지를 모듈 로거에 INFO로 기록합니다.
+        """
+        log = log or logger.info
+        METRICS.reset()
+        model_name = model_name or self.config.get("gemini_model")
+        vault_index = self.vault_index(output_dir)
+        existing = []
+        pending = videos
+        if vault_index is not None and self.config.get("skip_existing_notes", True):
+            done_ids = vault_index.video_ids()
+            existing = [v['id'] for v in videos if v['id'] in done_ids]
+            pending = [v for v in videos if v['id'] not in done_ids]
+            if existing:
+                log(f"  - 이미 노트가 있는 영상 {len(existing)}개를 건너뜁니다.")
+        # 작업 일지는 처음 선택한 영상 기준으로 열어, 일부가 저장된 뒤 다시 실행해도 같은 작업으로 이어짐
+        journal = self._open_journal(videos, user_prompt, model_name, output_dir)
+        if journal is not None and journal.resumed:
+            log(f"  - 중단된 작업 일지를 발견했습니다: {journal.path}")
+        try:
+            summary = pipeline.run_pipeline(
+                pending,
+                user_prompt,
+                output_dir,
+                model_name=model_name,
+                batch_size=self.config.get("gemini_batch_size", 30),
+                max_batch_tokens=self.config.get("gemini_max_batch_tokens", 120000),
+                keep_original_title=self.config.get("keep_original_title", False) if keep_original_title is None else keep_original_title,
+                transcript_workers=self.config.get("transcript_workers", 4),
+                transcript_timeout=self.config.get("transcript_timeout", 60),
+                transcript_max_retries=self.config.get("transcript_max_retries", 2),
+                transcript_languages=self.config.get("transcript_languages"),
+                map_reduce_threshold=self.config.get("map_reduce_threshold_tokens", 0),
+                map_reduce_chunk_tokens=self.config.get("map_reduce_chunk_tokens", 8000),
+                map_reduce_chunk_seconds=self.config.get("map_reduce_chunk_minutes", 0) * 60 or None,
+                timestamp_interval=self.config.get("note_timestamp_interval", 0),
+                transcript_cache=self.transcript_cache,
+                result_cache=self.result_cache,
+                video_index=self.video_index,
+                vault_index=vault_index,
+                journal=journal,
+                dispatcher=GeminiDispatcher(
+                    model_name,
+                    max_in_flight=self.config.get("gemini_max_in_flight", 3),
+                    rpm=self.config.get("gemini_rpm", 60),
+                    tpm=self.config.get("gemini_tpm", 1000000),
+                    max_retries=self.config.get("gemini_max_retries", 4),
+                    stream=self.config.get("gemini_stream", True),
+                    structured=self.config.get("gemini_structured_output", True),
+                    log=log
+                ),
+                log=log,
+                progress=progress
+            )
+            summary["total"] = len(videos)
+            summary["existing"] = existing
+            summary["metrics"] = METRICS.snapshot()
+            return summary
+        finally:
+            if journal is not None:
+                journal.close()
+            if vault_index is not None:
+                vault_index.save()
+            self._report_metrics(log)
+
+    def _report_metrics(self, log):
+        for line in METRICS.report():
+            log(line)
+        path = self.config.get("metrics_path")
+        if not path:
+            return
+        if not os.path.isabs(path):
+            path = os.path.join(self.base_dir, path)
+        try:
+            METRICS.export_json(path)
+        except OSError as e:
+            log(f"  - 경고: 측정값 저장 실패 - {e}")
+
+    def vault_index(self, output_dir):
+        """
+        노트 폴더의 VaultIndex를 최신 상태로 만들어 반환합니다. vault_index_dir이 비어 있으면 None을 반환합니다.
+        폴더마다 한 번 만든 인덱스를 재사용하며, 호출할 때마다 바뀐 노트만 다시 읽습니다.
+        """
+        directory = self.config.get("vault_index_dir")
+        if not directory or not output_dir:
+            return None
+        if not os.path.isabs(directory):
+            directory = os.path.join(self.base_dir, directory)
+        key = os.path.abspath(output_dir)
+        if key not in self._vault_indexes:
+            self._vault_indexes[key] = VaultIndex.for_vault(directory, output_dir)
+        return self._vault_indexes[key].refresh()
+
+    def processed_video_ids(self, output_dir, video_ids=None):
+        """
+        노트 폴더에 이미 노트가 있는 영상 ID 집합을 반환합니다.
+        video_ids가 주어지면 그중 영상 인덱스에 처리 완료로 표시된 영상도 포함합니다.
+        """
+        vault_index = self.vault_index(output_dir)
+        processed = vault_index.video_ids() if vault_index is not None else set()
+        if video_ids is not None and self.video_index is not None:
+            processed = processed | self.video_index.processed_ids(video_ids)
+        return processed
+
+    def _open_journal(self, videos, user_prompt, model_name, output_dir):
+        directory = self.config.get("job_journal_dir")
+        if not directory:
+            return None
+        if not os.path.isabs(directory):
+            directory = os.path.join(self.base_dir, directory)
+        return JobJournal.for_job(directory, [v['id'] for v in videos], user_prompt, model_name, output_dir)
+
+    def _filter_options(self, include_shorts, min_duration_seconds):
+        if include_shorts is None:
+            include_shorts = self.config.get("include_shorts", False)
+        if min_duration_seconds is None:
+            min_duration_seconds = self.config.get("min_video_duration", 0)
+        return include_shorts, min_duration_seconds
@@ -1,9 +1,16 @@
 # utils/file_helper.py
 # 파일 이름 생성 및 저장 등 파일 관련 처리 함수들을 포함합니다.
 
+import logging
 import os
 import re
 import json
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# 이미 읽은 API 키 파일 {경로: 내용}. 여러 모듈이 키를 요청해도 파일은 한 번만 읽음
+_api_key_files = {}
 
 def load_api_key(key_name="myapi", filepath="MYAPI.json"):
     """
@@ -12,18 +19,21 @@ def load_api_key(key_name="myapi", filepath="MYAPI.json"):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     # 상위 디렉토리로 이동하여 MYAPI.json 찾기
     json_path = os.path.join(script_dir, "..", filepath) 
-    
+    if json_path not in _api_key_files:
+        _api_key_files[json_path] = _read_api_key_file(json_path)
+    return _api_key_files[json_path].get(key_name)
+
+def _read_api_key_file(json_path):
     if not os.path.exists(json_path):
-        print(f"경고: {json_path} 파일을 찾을 수 없습니다.")
-        return None
+        logger.warning("%s 파일을 찾을 수 없습니다.", json_path)
+        return {}
     
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get(key_name)
+            return json.load(f)
     except (json.JSONDecodeError, IOError) as e:
-        print(f"경고: API 키 파일 로딩 실패 - {e}.")
-        return None
+        logger.warning("API 키 파일 로딩 실패 - %s", e)
+        return {}
 
 def _sanitize_filename(title):
     """
@@ -51,15 +61,8 @@ def generate_filename_from_content(content):
     first_line = content.strip().split('\n')[0]
     return _sanitize_filename(first_line)
 
-def save_as_obsidian_note(path, content, keep_original_title=False, original_title=""):
-    """
-    지정된 경로에 가공된 내용을 마크다운 파일로 저장합니다.
-    파일 이름은 내용 또는 원본 제목에서 생성됩니다.
-    """
-    if not os.path.isdir(path):
-        os.makedirs(path)
-        print(f"'{path}' 폴더를 생성했습니다.")
-
+def note_base_filename(content, keep_original_title=False, original_title=""):
+    """노트 파일 이름(확장자 제외)을 원본 제목 또는 내용의 첫 줄에서 만듭니다."""
     base_filename = ""
     if keep_original_title and original_title:
         base_filename = _sanitize_filename(original_title)
@@ -67,23 +70,71 @@ def save_as_obsidian_note(path, content, keep_original_title=False, original_tit
     if not base_filename:
         base_filename = generate_filename_from_content(content)
 
-    if not base_filename:
-        base_filename = "untitled"
+    return base_filename or "untitled"
+
+def numbered_filename(base_filename, counter):
+    """중복을 피하기 위한 '<이름>-<번호>.md' 파일명을 만듭니다."""
+    # 기존 파일명에서 카운터 제거 (예: title-1.md -> title.md)
+    temp_base = re.sub(r'-\d+$', '', base_filename)
+    return f"{temp_base}-{counter}.md"
+
+def build_frontmatter(metadata):
+    """
+    노트 맨 앞에 붙일 YAML frontmatter를 만듭니다. 값이 None인 항목은 넣지 않습니다.
+    문자열 값은 JSON 문자열로 적으므로 따옴표나 콜론이 들어 있어도 올바른 YAML입니다.
+    """
+    lines = [f"{key}: {json.dumps(value, ensure_ascii=False)}" for key, value in metadata.items() if value is not None]
+    return "---\n" + "\n".join(lines) + "\n---\n\n"
+
+def read_frontmatter(file_path, max_lines=30):
+    """노트 앞부분의 frontmatter를 읽어 딕셔너리로 반환합니다. frontmatter가 없으면 빈 딕셔너리를 반환합니다."""
+    metadata = {}
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if f.readline().strip() != "---":
+                return {}
+            for _ in range(max_lines):
+                line = f.readline()
+                if not line or line.strip() == "---":
+                    break
+                key, sep, value = line.partition(":")
+                if not sep:
+                    continue
+                value = value.strip()
+                try:
+                    metadata[key.strip()] = json.loads(value)
+                except json.JSONDecodeError:
+                    metadata[key.strip()] = value.strip("'")
+    except (OSError, UnicodeDecodeError):
+        return {}
+    return metadata
+
+def save_as_obsidian_note(path, content, keep_original_title=False, original_title="", metadata=None):
+    """
+    지정된 경로에 가공된 내용을 마크다운 파일로 저장합니다.
+    파일 이름은 내용 또는 원본 제목에서 생성됩니다.
+    metadata(video_id, channel, model 등)가 주어지면 YAML frontmatter로 노트 앞에 붙입니다.
+    저장한 파일의 경로를 반환합니다.
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+        logger.info("'%s' 폴더를 생성했습니다.", path)
 
+    base_filename = note_base_filename(content, keep_original_title, original_title)
     filename = f"{base_filename}.md"
     file_path = os.path.join(path, filename)
 
     # 파일명 중복 방지
     counter = 1
     while os.path.exists(file_path):
-        # 기존 파일명에서 카운터 제거 (예: title-1.md -> title.md)
-        temp_base, ext = os.path.splitext(base_filename)
-        temp_base = re.sub(r'-\d+$', '', temp_base)
-        filename = f"{temp_base}-{counter}.md"
+        filename = numbered_filename(base_filename, counter)
         file_path = os.path.join(path, filename)
         counter += 1
 
-    with open(file_path, 'w', encoding='utf-8') as f:
+    with METRICS.timer("note.write"), open(file_path, 'w', encoding='utf-8') as f:
+        if metadata:
+            f.write(build_frontmatter(metadata))
         f.write(content)
     
-    print(f"파일 저장 완료: {file_path}")
\ No newline at end of file
+    logger.debug("파일 저장 완료: %s", file_path)
+    return file_path
\ No newline at end of file
@@ -0,0 +1,198 @@
+# utils/gemini_dispatcher.py
+# Gemini 배치 요청을 스레드 풀로 동시에 보내는 디스패처를 포함합니다.
+# 분당 요청 수(RPM) / 분당 토큰 수(TPM) 제한, 429·5xx 오류의 지수 백오프 재시도,
+# 응답에서 빠진 작업의 재요청, 응답을 해석할 수 없는 배치의 작업별 재요청을 담당합니다.
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from . import gemini_helper
+from .batch_planner import PROMPT_OVERHEAD_TOKENS, task_tokens
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 google.api_core 예외 이름 (패키지를 직접 가져오지 않고 이름으로 판별)
+_RETRYABLE_ERROR_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+    'InternalServerError', 'DeadlineExceeded', 'BadGateway', 'GatewayTimeout',
+}
+
+def is_retryable_error(error):
+    """429(요청 한도 초과) 또는 5xx 서버 오류이면 True를 반환합니다."""
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) and (code == 429 or 500 <= code < 600):
+        return True
+    return type(error).__name__ in _RETRYABLE_ERROR_NAMES
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """attempt번째 재시도 전 대기 시간 (지수 증가 + full jitter)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class TokenBucket:
+    """
+    분당 rate_per_minute만큼 채워지는 토큰 버킷.
+    acquire는 필요한 양이 쌓일 때까지 호출한 스레드를 대기시킵니다.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        # 버킷 용량보다 큰 요청은 가득 찬 버킷 하나만큼만 기다림
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            self._sleep(wait)
+
+class GeminiDispatcher:
+    """
+    배치를 submit하면 최대 max_in_flight개의 요청을 동시에 보냅니다.
+    작업 결과가 도착할 때마다 on_result(task, result)를 호출하고, 배치가 끝나면 on_done(batch, missing, error)를 호출합니다.
+    missing은 끝내 결과를 받지 못한 작업 목록입니다.
+
+    응답에서 일부 작업의 결과가 빠지면 빠진 작업만 작은 배치로 최대 max_retries번 다시 요청하고,
+    429·5xx 오류로 재시도할 때도 이미 결과를 받은 작업은 다시 보내지 않습니다.
+
+    Args:
+        model_name (str): Gemini 모델 이름
+        stream (bool): True이면 응답을 스트리밍으로 받아 결과 객체가 완성되는 즉시 전달합니다.
+        structured (bool): True이면 JSON 응답 스키마(구조화 출력)로 결과 형식을 강제합니다.
+        model_factory (callable, optional): 모델 이름을 받아 generate_content를 제공하는 객체를 반환하는 함수.
+            테스트나 벤치마크에서 가짜 모델을 넣을 때 사용합니다.
+        log (callable, optional): 재시도 등 진행 메시지를 받을 함수. 없으면 모듈 로거에 INFO로 기록합니다.
+    """
+
+    def __init__(self, model_name, max_in_flight=3, rpm=60, tpm=1000000, max_retries=4,
+                 stream=False, structured=False, model_factory=None, log=None):
+        self.model_name = model_name
+        self.max_retries = max_retries
+        self.stream = stream
+        self.structured = structured
+        self.log = log or logger.info
+        self._model_factory = model_factory or _default_model_factory
+        self._request_limiter = TokenBucket(rpm) if rpm else None
+        self._token_limiter = TokenBucket(tpm) if tpm else None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="gemini")
+        # 대기 중인 배치까지 포함해 메모리에 머무는 배치 수를 제한
+        self._slots = threading.BoundedSemaphore(max(1, max_in_flight) * 2)
+        self._local = threading.local()
+
+    def submit(self, batch, on_result, on_done):
+        """배치 요청을 예약합니다. 동시에 처리 중인 배치가 많으면 자리가 날 때까지 대기합니다."""
+        self._slots.acquire()
+        future = self._executor.submit(self._run, batch, on_result, on_done)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def close(self):
+        """예약된 모든 배치가 끝날 때까지 기다린 뒤 스레드 풀을 종료합니다."""
+        self._executor.shutdown(wait=True)
+
+    def _model(self):
+        # 모델 객체는 스레드마다 하나씩 만들어 재사용
+        model = getattr(self._local, 'model', None)
+        if model is None:
+            model = self._local.model = self._model_factory(self.model_name)
+        return model
+
+    def _run(self, batch, on_result, on_done):
+        tasks_by_id = {task['id']: task for task in batch}
+        delivered = set()
+
+        def deliver(item):
+            # 배치에 없는 ID나 이미 받은 결과는 무시
+            task = tasks_by_id.get(item['id'])
+            if task is None or item['id'] in delivered:
+                return
+            delivered.add(item['id'])
+            try:
+                on_result(task, item['result'])
+            except Exception as e:
+                self.log(f"  - ✗ 오류: '{task.get('original_title', task['id'])}' 결과 처리 중 문제 발생 - {e}")
+
+        error = None
+        try:
+            self._request_until_complete(batch, delivered, deliver)
+        except Exception as e:
+            error = e
+        missing = [task for task in batch if task['id'] not in delivered]
+        try:
+            on_done(batch, missing, error)
+        except Exception as e:
+            self.log(f"  - ✗ 오류: Gemini 결과 처리 중 문제 발생 - {e}")
+
+    def _request_until_complete(self, batch, delivered, deliver):
+        rounds = 0
+        while True:
+            if not self._request_with_retry(batch, delivered, deliver):
+                return
+            missing = [task for task in batch if task['id'] not in delivered]
+            if not missing or rounds >= self.max_retries:
+                return
+            rounds += 1
+            self.log(f"  - 경고: 응답에 {len(missing)}개 작업의 결과가 없어 다시 요청합니다. ({rounds}/{self.max_retries})")
+            batch = missing
+
+    def _request_with_retry(self, batch, delivered, deliver):
+        """
+        아직 결과를 받지 못한 작업을 요청합니다.
+        응답을 해석했으면 True, 작업별 재요청으로 넘어갔으면 False를 반환합니다.
+        """
+        attempt = 0
+        while True:
+            pending = [task for task in batch if task['id'] not in delivered]
+            if not pending:
+                return True
+            self._acquire(pending)
+            try:
+                gemini_helper.request_batch(pending, self._model(), on_result=deliver,
+                                           stream=self.stream, structured=self.structured)
+                return True
+            except gemini_helper.GeminiResponseError as e:
+                if len(pending) == 1:
+                    raise
+                # 배치 응답에서 결과를 하나도 찾을 수 없으면 작업별로 다시 요청
+                self.log(f"  - 경고: 배치 응답을 해석할 수 없어 {len(pending)}개 작업을 하나씩 다시 요청합니다. ({e})")
+                self._request_individually(pending, delivered, deliver)
+                return False
+            except Exception as e:
+                if not is_retryable_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                attempt += 1
+                self.log(f"  - 경고: Gemini 요청 실패, {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries}) - {e}")
+                time.sleep(delay)
+
+    def _request_individually(self, batch, delivered, deliver):
+        for task in batch:
+            try:
+                self._request_with_retry([task], delivered, deliver)
+            except Exception as e:
+                self.log(f"  - ✗ 오류: '{task.get('original_title', task['id'])}' 개별 요청 실패 - {e}")
+
+    def _acquire(self, batch):
+        # 분당 요청 / 토큰 한도 때문에 기다린 시간
+        with METRICS.timer("gemini.rate_wait"):
+            if self._request_limiter is not None:
+                self._request_limiter.acquire(1)
+            if self._token_limiter is not None:
+                self._token_limiter.acquire(PROMPT_OVERHEAD_TOKENS + sum(task_tokens(task) for task in batch))
+
+def _default_model_factory(model_name):
+    return gemini_helper.get_genai().GenerativeModel(model_name)
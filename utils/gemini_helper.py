@@ -1,13 +1,33 @@
 # utils/gemini_helper.py
 # Google AI (Gemini) API 관련 함수들을 포함합니다.
 
-import google.generativeai as genai
 import json
+import logging
 import os
+import threading
+import time
 from .file_helper import load_api_key
+from .json_stream import ResultStreamParser, parse_results
+from .batch_planner import estimate_tokens
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
 
 GEMINI_API_KEY = load_api_key("myapi")
-genai.configure(api_key=GEMINI_API_KEY)
+
+# google.generativeai는 불러오는 데 시간이 걸리므로 처음 사용할 때 불러오고 API 키를 설정함
+_genai = None
+_genai_lock = threading.Lock()
+
+def get_genai():
+    """API 키가 설정된 google.generativeai 모듈을 반환합니다."""
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+            genai.configure(api_key=GEMINI_API_KEY)
+            _genai = genai
+    return _genai
 
 def load_gemini_model_from_config():
     """config.json에서 사용할 Gemini 모델 이름을 로드합니다."""
@@ -21,62 +41,166 @@ def load_gemini_model_from_config():
     except (FileNotFoundError, json.JSONDecodeError):
         return "gemini-1.5-flash" # 파일이 없거나 오류 발생 시 기본값
 
-def check_gemini_api():
+def check_gemini_api(model_name=None, cache_path=None, ttl_seconds=0):
     """
-    Gemini API에 간단한 요청을 보내 접근성을 확인합니다.
+    Gemini API의 모델 정보 조회로 접근성을 확인합니다. (생성 요청이 아니므로 토큰을 쓰지 않음)
+    cache_path가 주어지면 성공한 확인 결과를 저장해 두고, ttl_seconds 안에는 요청 없이 성공으로 봅니다.
     """
+    model_name = model_name or load_gemini_model_from_config()
+    if cache_path and ttl_seconds > 0:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("model") == model_name and time.time() - cached.get("checked_at", 0) < ttl_seconds:
+                return True, "Gemini API is accessible. (cached)"
+        except (OSError, ValueError):
+            pass
     try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        model.generate_content("test")
-        return True, "Gemini API is accessible."
+        get_genai().get_model(model_name if model_name.startswith("models/") else f"models/{model_name}")
     except Exception as e:
         return False, f"Failed to access Gemini API: {e}"
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"model": model_name, "checked_at": time.time()}, f)
+        except OSError:
+            pass
+    return True, "Gemini API is accessible."
+
+class GeminiResponseError(ValueError):
+    """Gemini 배치 응답에서 결과 JSON을 해석할 수 없을 때 발생합니다."""
+
+# 구조화 출력(JSON 모드)에서 응답이 따라야 할 스키마: [{"id": 문자열, "result": 문자열}, ...]
+RESULT_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "STRING"},
+            "result": {"type": "STRING"},
+        },
+        "required": ["id", "result"],
+    },
+}
+
+def structured_generation_config():
+    """응답을 RESULT_SCHEMA 형태의 JSON으로만 받도록 하는 generation_config를 반환합니다."""
+    return {"response_mime_type": "application/json", "response_schema": RESULT_SCHEMA}
 
-def process_batch_with_gemini(tasks, model_name=None):
+def _tasks_json(tasks):
+    # 들여쓰기 공백이 입력 토큰을 늘리지 않도록 구분자 뒤 공백 없이 직렬화
+    return json.dumps([{"id": task["id"], "task": task["task"]} for task in tasks], ensure_ascii=False, separators=(',', ':'))
+
+def build_batch_prompt(tasks, structured=False):
     """
-    여러 작업을 배치로 묶어 Gemini API에 한 번에 요청하고 결과를 반환합니다.
-    
-    Args:
-        tasks (list): 각 항목이 {"id": "...", "task": "..."} 형태의 딕셔너리인 리스트
-        model_name (str, optional): 사용할 Gemini 모델 이름. None이면 config.json에서 로드합니다.
-        
-    Returns:
-        list: 각 항목이 {"id": "...", "result": "..."} 형태의 딕셔너리인 리스트
+    작업 목록을 Gemini에 보낼 배치 프롬프트로 만듭니다. 각 작업의 'id'와 'task'만 전달합니다.
+    structured=True이면 응답 형식은 response_schema가 강제하므로 형식 안내 문구를 생략합니다.
     """
-    if model_name is None:
-        model_name = load_gemini_model_from_config()
-    model = genai.GenerativeModel(model_name)
+    if structured:
+        return f"""다음 JSON 배열의 각 항목에 대해 'task'를 수행하고, 같은 'id'와 수행 결과 'result'를 담은 객체의 배열로 답해 줘.
 
-    # Gemini API에 전달할 프롬프트 구성
-    prompt = f"""
+{_tasks_json(tasks)}
+"""
+    return f"""
 너는 이제부터 질문 목록에 대해 JSON 형식으로만 답변하는 봇이야.
 다음은 처리해야 할 작업 목록이 담긴 JSON 배열이야. 각 항목의 'task'를 수행하고 'id'와 함께 결과를 JSON 배열 형식으로 반환해 줘.
 모든 결과 문자열의 내부 큰따옴표는 `"`로 이스케이프 처리해야 해.
 
 JSON
 
-{json.dumps(tasks, indent=2, ensure_ascii=False)}
+{_tasks_json(tasks)}
 """
-    
-    print(f"[Gemini] Batch request sent with {len(tasks)} tasks.")
-    response = model.generate_content(prompt)
-    
+
+def parse_batch_response(response_text):
+    """
+    배치 응답 텍스트에서 {"id", "result"} 결과 객체들을 추출합니다.
+    일부 객체가 깨져 있으면 나머지만 반환하며, 하나도 찾지 못하면 GeminiResponseError를 발생시킵니다.
+    """
+    results = parse_results(response_text)
+    if not results:
+        raise GeminiResponseError("Error parsing batch response: 결과 객체를 찾을 수 없습니다.")
+    return results
+
+def _chunk_text(chunk):
+    """스트리밍 응답 조각의 텍스트를 반환합니다. 텍스트가 없는 조각(안전 필터 등)은 빈 문자열로 취급합니다."""
     try:
-        # 응답 텍스트에서 JSON 부분만 추출
-        # 응답이 "JSON\n[...]" 또는 "```json\n[...]형식일 수 있음
-        response_text = "".join([part.text for part in response.parts])
-        if '```json' in response_text:
-            json_part = response_text.split('```json')[1].split('```')[0].strip()
-        elif 'JSON' in response_text:
-            json_part = response_text.split('JSON')[1].strip()
+        return "".join(part.text for part in chunk.parts)
+    except Exception:
+        return ""
+
+def request_batch(tasks, model, on_result=None, stream=False, structured=False):
+    """
+    주어진 모델 객체로 배치 요청을 한 번 보내고 파싱된 결과 목록을 반환합니다.
+
+    structured=True이면 모델의 JSON 응답 스키마 기능으로 결과 형식을 강제하고, 스키마에 맞지 않는 객체는 버립니다.
+    stream=True이면 응답을 조각 단위로 받으면서 결과 객체가 완성될 때마다 on_result(result)를 호출하므로,
+    전체 응답이 끝나기 전에 저장을 시작할 수 있습니다. 응답에 빠진 작업은 결과 목록에도 없습니다.
+    API 오류는 그대로 전파되며, 결과 객체를 하나도 찾지 못하면 GeminiResponseError를 발생시킵니다.
+    """
+    logger.debug("[Gemini] Batch request sent with %d tasks.", len(tasks))
+    prompt = build_batch_prompt(tasks, structured)
+    parser = ResultStreamParser(strict=structured)
+    options = {"generation_config": structured_generation_config()} if structured else {}
+    results = []
+    parse_seconds = 0.0
+
+    def parse(feed, *args):
+        nonlocal parse_seconds
+        start = time.perf_counter()
+        items = feed(*args)
+        parse_seconds += time.perf_counter() - start
+        for item in items:
+            results.append(item)
+            if on_result is not None:
+                on_result(item)
+
+    METRICS.incr("gemini.input_tokens", estimate_tokens(prompt))
+    with METRICS.timer("gemini.request"):
+        if stream:
+            text_parts = []
+            for chunk in model.generate_content(prompt, stream=True, **options):
+                text = _chunk_text(chunk)
+                text_parts.append(text)
+                parse(parser.feed, text)
+            response_text = "".join(text_parts)
         else:
-            json_part = response_text # 순수 JSON만 반환된 경우
-
-        results = json.loads(json_part)
-        print(f"[Gemini] Batch response received and parsed successfully.")
-        return results
-    except (json.JSONDecodeError, IndexError) as e:
-        print(f"[Gemini] Error parsing batch response: {e}")
-        print(f"[Gemini] Raw response text: {response.text}")
+            response = model.generate_content(prompt, **options)
+            response_text = "".join([part.text for part in response.parts])
+            parse(parser.feed, response_text)
+        parse(parser.close)
+    METRICS.incr("gemini.output_tokens", estimate_tokens(response_text))
+    METRICS.observe("gemini.parse", parse_seconds)
+
+    if parser.rejected:
+        logger.warning("[Gemini] %d result objects did not match the schema and were discarded.", parser.rejected)
+    if not results:
+        logger.debug("[Gemini] Raw response text: %s", response_text)
+        raise GeminiResponseError("Error parsing batch response: 결과 객체를 찾을 수 없습니다.")
+    logger.debug("[Gemini] Batch response received: %d/%d results parsed.", len(results), len(tasks))
+    return results
+
+def process_batch_with_gemini(tasks, model_name=None, model=None, structured=False):
+    """
+    여러 작업을 배치로 묶어 Gemini API에 한 번에 요청하고 결과를 반환합니다.
+    
+    Args:
+        tasks (list): 각 항목이 {"id": "...", "task": "..."} 형태의 딕셔너리인 리스트
+        model_name (str, optional): 사용할 Gemini 모델 이름. None이면 config.json에서 로드합니다.
+        model (optional): generate_content를 제공하는 모델 객체. 주어지면 model_name 대신 사용합니다.
+        structured (bool): True이면 JSON 응답 스키마로 결과 형식을 강제합니다.
+        
+    Returns:
+        list: 각 항목이 {"id": "...", "result": "..."} 형태의 딕셔너리인 리스트
+    """
+    if model is None:
+        if model_name is None:
+            model_name = load_gemini_model_from_config()
+        model = get_genai().GenerativeModel(model_name)
+
+    try:
+        return request_batch(tasks, model, structured=structured)
+    except GeminiResponseError as e:
+        logger.warning("[Gemini] %s", e)
         # 오류 발생 시, 각 태스크에 대해 오류 메시지를 포함한 결과 반환
-        return [{"id": task["id"], "result": f"Error processing batch response: {e}"} for task in tasks]
+        return [{"id": task["id"], "result": str(e)} for task in tasks]
@@ -0,0 +1,124 @@
+# utils/job_journal.py
+# 처리 작업의 영상별 진행 단계를 JSONL 파일에 추가 기록하는 작업 일지를 포함합니다.
+# 실행이 중간에 끊겨도 같은 작업을 다시 실행하면 완료된 단계를 건너뛰고 이어서 진행할 수 있습니다.
+# 모든 영상이 저장까지 끝난 작업의 일지는 이어서 진행할 것이 없으므로 삭제합니다.
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# 영상별 진행 단계 (뒤로 갈수록 진행된 단계)
+STAGE_QUEUED = "queued"
+STAGE_TRANSCRIPT_FETCHED = "transcript_fetched"
+STAGE_SUMMARIZED = "summarized"
+STAGE_SAVED = "saved"
+STAGE_FAILED = "failed"
+
+def make_job_id(video_ids, user_prompt, model_name, output_dir):
+    """같은 영상 선택, 프롬프트, 모델, 저장 경로의 실행이 같은 작업 ID를 갖도록 해시를 만듭니다."""
+    digest = hashlib.sha256()
+    for part in (",".join(sorted(video_ids)), user_prompt, model_name or "", os.path.abspath(output_dir)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+class JobJournal:
+    """
+    영상 ID별 마지막 단계와 요약 결과를 추가 전용(append-only) JSONL 파일로 기록합니다.
+    각 줄은 {"ts", "video_id", "stage", ...} 형태이며, 파일을 다시 열면 마지막 상태를 복원합니다.
+    모든 영상이 저장까지 끝나면 finish로 일지 파일을 삭제하므로, 이후 같은 작업 ID로 열면 새 일지로 시작합니다.
+
+    기록은 줄마다 운영체제에 넘기므로(flush) 프로그램이 중단되어도 남지만, 디스크 동기화(fsync)는
+    sync를 호출하는 단계 경계(Gemini 배치 하나의 결과 반영이 끝났을 때)와 close에서만 합니다.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._states = {}
+        self._results = {}
+        self.resumed = False
+
+        if os.path.exists(path):
+            self._load()
+        self.resumed = bool(self._states)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    @classmethod
+    def for_job(cls, directory, video_ids, user_prompt, model_name, output_dir):
+        job_id = make_job_id(video_ids, user_prompt, model_name, output_dir)
+        return cls(os.path.join(directory, f"{job_id}.jsonl"))
+
+    def _load(self):
+        """기존 일지를 읽어 상태를 복원합니다."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # 중단 시점에 잘린 마지막 줄
+                video_id = entry.get('video_id')
+                if not video_id:
+                    continue
+                self._states[video_id] = entry['stage']
+                if entry['stage'] == STAGE_SUMMARIZED and 'result' in entry:
+                    self._results[video_id] = entry['result']
+                elif entry['stage'] == STAGE_SAVED:
+                    self._results.pop(video_id, None)
+
+    def _append(self, entry):
+        entry['ts'] = time.time()
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._dirty = True
+
+    def _sync(self):
+        if self._dirty and not self._file.closed:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+
+    def record(self, video_id, stage, **data):
+        """영상의 새 단계를 기록합니다. 요약 단계에서는 result를 함께 넘겨 결과를 보존합니다."""
+        with self._lock:
+            self._states[video_id] = stage
+            if stage == STAGE_SUMMARIZED and 'result' in data:
+                self._results[video_id] = data['result']
+            elif stage == STAGE_SAVED:
+                self._results.pop(video_id, None)
+            self._append({'video_id': video_id, 'stage': stage, **data})
+
+    def stage(self, video_id):
+        with self._lock:
+            return self._states.get(video_id)
+
+    def result(self, video_id):
+        """요약 단계까지 끝난 영상의 결과를 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            return self._results.get(video_id)
+
+    def sync(self):
+        """지금까지 기록한 줄을 디스크에 동기화합니다. 단계 경계에서 호출합니다."""
+        with self._lock:
+            self._sync()
+
+    def finish(self):
+        """모든 영상이 저장까지 끝났을 때 호출합니다. 일지 파일을 닫고 삭제합니다."""
+        with self._lock:
+            self._file.close()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
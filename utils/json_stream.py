@@ -0,0 +1,101 @@
+# utils/json_stream.py
+# Gemini 배치 응답을 청크 단위로 읽으면서 {"id": ..., "result": ...} 객체를
+# 완성되는 즉시 꺼내는 점진적 JSON 결과 파서를 포함합니다.
+
+import json
+
+class ResultStreamParser:
+    """
+    텍스트 조각을 feed로 넣으면, 그 사이에 닫힌 {"id", "result"} 객체 목록을 반환합니다.
+
+    응답 앞뒤의 설명 문장, 코드 블록 표시(```json), 요약 본문 안의 'JSON' 같은 단어는 결과에 영향을 주지 않습니다.
+    객체 하나가 깨져 있어도 그 객체만 버리고 나머지 객체는 계속 추출합니다.
+    같은 id가 여러 번 나오면 처음 것만 사용합니다.
+
+    strict=True이면 응답 스키마대로 id와 result가 모두 문자열이고 result가 비어 있지 않은 객체만 받아들이며,
+    받아들이지 않은 객체 수를 rejected에 셉니다.
+    """
+
+    def __init__(self, strict=False):
+        self.strict = strict
+        self.rejected = 0
+        self._buffer = ""
+        self._pos = 0
+        self._starts = [] # 아직 닫히지 않은 '{'의 위치
+        self._in_string = False
+        self._escape = False
+        self._seen_ids = set()
+
+    def feed(self, chunk):
+        """텍스트 조각을 추가하고 새로 완성된 결과 객체 목록을 반환합니다."""
+        if not chunk:
+            return []
+        self._buffer += chunk
+        found = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                # 객체 밖의 문장에 있는 따옴표는 문자열로 취급하지 않음
+                if self._starts:
+                    self._in_string = True
+            elif ch == '{':
+                self._starts.append(i)
+            elif ch == '}' and self._starts:
+                start = self._starts.pop()
+                item = self._decode(buffer[start:i + 1])
+                if item is not None:
+                    found.append(item)
+            i += 1
+
+        if self._starts:
+            self._pos = i
+        else:
+            # 열린 객체가 없으면 이미 읽은 부분은 더 필요 없음
+            self._buffer = ""
+            self._pos = 0
+        return found
+
+    def close(self):
+        """입력이 끝났음을 알립니다. 닫히지 않은 객체는 버려지며 빈 목록을 반환합니다."""
+        self._buffer = ""
+        self._pos = 0
+        self._starts = []
+        self._in_string = False
+        self._escape = False
+        return []
+
+    def _decode(self, text):
+        try:
+            obj = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(obj, dict) or 'id' not in obj or 'result' not in obj:
+            return None
+        if self.strict and not _matches_schema(obj):
+            self.rejected += 1
+            return None
+        video_id = str(obj['id'])
+        if video_id in self._seen_ids:
+            return None
+        self._seen_ids.add(video_id)
+        result = obj['result']
+        if not isinstance(result, str):
+            result = json.dumps(result, ensure_ascii=False)
+        return {'id': video_id, 'result': result}
+
+def _matches_schema(obj):
+    return isinstance(obj['id'], str) and isinstance(obj['result'], str) and bool(obj['result'].strip())
+
+def parse_results(text):
+    """응답 전체 텍스트에서 결과 객체들을 추출합니다."""
+    parser = ResultStreamParser()
+    return parser.feed(text) + parser.close()
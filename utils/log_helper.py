@@ -0,0 +1,71 @@
+# utils/log_helper.py
+# 표준 logging 모듈 설정을 모아 둔 모듈입니다. 각 모듈은 logging.getLogger(__name__)로 자기 로거를 사용하고,
+# GUI(main.py)와 명령줄 실행기(cli.py)는 setup_logging으로 출력 형식(텍스트 / JSON)과 수준을 정합니다.
+# GUI는 add_callback_sink로 경고 이상의 기록을 작업 진행 창(메시지 큐)에도 보냅니다.
+
+import json
+import logging
+import sys
+from datetime import datetime
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# LogRecord의 기본 속성. 이 밖의 속성(logger.info(..., extra={...}))은 JSON 출력에 그대로 넣음
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """기록 하나를 한 줄의 JSON 객체({"ts", "level", "logger", "message", ...})로 출력합니다."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class CallbackHandler(logging.Handler):
+    """기록의 메시지를 callback(메시지)으로 보내는 처리기. (예: GUI 메시지 큐에 넣는 함수)"""
+
+    def __init__(self, callback, level=logging.WARNING):
+        super().__init__(level)
+        self.callback = callback
+        self.setFormatter(logging.Formatter("%(message)s"))
+
+    def emit(self, record):
+        try:
+            self.callback(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+_stream_handler = None
+
+def setup_logging(level="INFO", json_output=False, stream=None):
+    """
+    루트 로거에 표준 오류(또는 stream) 출력 처리기를 설정합니다. 다시 호출하면 이전 설정을 바꿉니다.
+
+    Args:
+        level (str | int): 최소 기록 수준 ('DEBUG', 'INFO', 'WARNING', ...)
+        json_output (bool): True이면 한 줄에 JSON 객체 하나씩 출력합니다. (화면 없는 실행의 로그 수집용)
+    """
+    global _stream_handler
+    root = logging.getLogger()
+    if _stream_handler is not None:
+        root.removeHandler(_stream_handler)
+    _stream_handler = logging.StreamHandler(stream or sys.stderr)
+    _stream_handler.setFormatter(JsonFormatter() if json_output else logging.Formatter(TEXT_FORMAT))
+    root.addHandler(_stream_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    return _stream_handler
+
+def add_callback_sink(callback, level=logging.WARNING):
+    """level 이상의 기록을 callback으로도 보내는 처리기를 루트 로거에 추가하고 반환합니다."""
+    handler = CallbackHandler(callback, level)
+    logging.getLogger().addHandler(handler)
+    return handler
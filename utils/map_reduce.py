@@ -0,0 +1,120 @@
+# utils/map_reduce.py
+# 아주 긴 스크립트를 자막 세그먼트 경계에 맞춘 시간 구간으로 나누어 구간별로 요약(map)한 뒤,
+# 구간 요약들을 모아 하나의 노트로 정리(reduce)하는 작업을 만드는 함수들을 포함합니다.
+
+from .transcript import format_timestamp
+from .batch_planner import estimate_tokens, split_text
+
+# 작업 프롬프트에서 스크립트 부분의 시작과 끝을 나타내는 표시
+TRANSCRIPT_START = "--- 원본 스크립트 ---\n"
+TRANSCRIPT_END = "\n--- 원본 스크립트 끝 ---"
+
+# 구간 요약 작업의 안내 문구와 영상 제목에 대한 대략적인 토큰 수 (구간 크기를 배치 예산 안으로 맞출 때 사용)
+MAP_PROMPT_TOKENS = 300
+
+def build_map_tasks(video, chunks, transcript_start, transcript_end):
+    """
+    Transcript.chunks로 나눈 시간 구간 조각마다 구간 요약(map) 작업을 만듭니다.
+    각 작업의 ID는 '<영상 ID>#map<번호>'이며, kind='map'과 parent_id / part_index / part_count / time_range를 가집니다.
+    """
+    tasks = []
+    for index, chunk in enumerate(chunks):
+        time_range = f"{format_timestamp(chunk.start)}~{format_timestamp(chunk.end)}"
+        prompt = (
+            f"영상 제목: {video['title']}\n\n"
+            f"아래는 긴 영상의 스크립트를 시간 순서로 나눈 {len(chunks)}개 구간 중 {index+1}번째 구간({time_range})이야. "
+            "이 구간에서 다룬 내용을 빠뜨리지 말고 핵심 위주로 정리해 줘. "
+            "나중에 다른 구간의 정리와 합쳐 하나의 노트로 만들 예정이니 서론, 결론, 제목은 쓰지 마."
+        )
+        tasks.append({
+            "id": f"{video['id']}#map{index+1}",
+            "task": f"{prompt}\n\n{transcript_start}{chunk.text}{transcript_end}",
+            "original_title": video['title'],
+            "kind": "map",
+            "parent_id": video['id'],
+            "part_index": index,
+            "part_count": len(chunks),
+            "time_range": time_range
+        })
+    return tasks
+
+def build_reduce_task(map_tasks, map_results, user_prompt, transcript_start, transcript_end):
+    """
+    구간 요약 결과들을 시간 순서로 모아, 원래 프롬프트대로 하나의 노트를 작성하는 reduce 작업을 만듭니다.
+    map_results는 {부분 번호: 결과}입니다.
+    """
+    first = map_tasks[0]
+    sections = "\n\n".join(
+        f"[{task['time_range']}]\n{map_results[task['part_index']].strip()}" for task in map_tasks
+    )
+    prompt = (
+        f"영상 제목: {first['original_title']}\n\n{user_prompt}\n\n"
+        "(스크립트가 길어 시간 구간별로 먼저 정리했어. 아래 구간별 정리를 원본 스크립트로 보고 위 요청을 수행해 줘.)"
+    )
+    return {
+        "id": f"{first['parent_id']}#reduce",
+        "task": f"{prompt}\n\n{transcript_start}{sections}{transcript_end}",
+        "original_title": first['original_title'],
+        "kind": "reduce",
+        "parent_id": first['parent_id']
+    }
+
+def build_merge_task(source, part_results, user_prompt):
+    """
+    토큰 예산보다 길어 부분별로 나눠 요약한 작업(영상 전체 또는 reduce 작업)의 부분 결과들을 모아,
+    원래 프롬프트대로 하나의 노트로 합치는 merge 작업을 만듭니다. part_results는 부분 순서대로 된 결과 목록입니다.
+    """
+    video_id = source.get('parent_id', source['id'])
+    sections = "\n\n".join(
+        f"[{index+1}/{len(part_results)} 부분]\n{result.strip()}" for index, result in enumerate(part_results)
+    )
+    prompt = (
+        f"영상 제목: {source['original_title']}\n\n{user_prompt}\n\n"
+        "(스크립트가 길어 여러 부분으로 나누어 각각 위 요청대로 정리했어. 아래 부분별 정리를 원본 스크립트로 보고, "
+        "겹치는 제목과 내용은 합쳐서 위 요청대로 하나의 노트를 작성해 줘.)"
+    )
+    return {
+        "id": f"{video_id}#merge",
+        "task": f"{prompt}\n\n{TRANSCRIPT_START}{sections}{TRANSCRIPT_END}",
+        "original_title": source['original_title'],
+        "kind": "merge",
+        "parent_id": video_id
+    }
+
+def split_task(task, max_tokens):
+    """
+    토큰 예산보다 긴 작업을 스크립트 부분별 작업으로 나눕니다.
+    각 부분 작업의 ID는 '<원래 작업 ID>#part<번호>'이며, split_of에 원래 작업(스크립트 제외)을 담고
+    part_index / part_count로 순서를 나타냅니다. parent_id는 항상 영상 ID입니다. (구간 / reduce 작업을 나눠도 같음)
+    """
+    header, _, rest = task['task'].partition(TRANSCRIPT_START)
+    transcript = rest[:-len(TRANSCRIPT_END)] if rest.endswith(TRANSCRIPT_END) else rest
+    # 머리말과 부분 안내 문구가 들어갈 자리를 남기고 스크립트를 나눔
+    chunks = split_text(transcript, max(1, max_tokens - estimate_tokens(header) - 50))
+    source = {key: value for key, value in task.items() if key != 'task'}
+    parts = []
+    for index, chunk in enumerate(chunks):
+        note = f"(전체 스크립트 {len(chunks)}개 부분 중 {index+1}번째 부분입니다.)\n\n"
+        parts.append({
+            "id": f"{task['id']}#part{index+1}",
+            "task": f"{header}{note}{TRANSCRIPT_START}{chunk}{TRANSCRIPT_END}",
+            "original_title": task['original_title'],
+            "parent_id": task.get('parent_id', task['id']),
+            "split_of": source,
+            "part_index": index,
+            "part_count": len(chunks)
+        })
+    return parts
+
+def merge_part_results(results):
+    """
+    부분 작업들의 결과를 순서대로 이어 붙입니다. (merge 작업 없이 합치는 구간 요약 / merge 작업의 조각용)
+    두 번째 부분부터는 첫 줄의 '# 제목'을 빼서 같은 제목이 반복되지 않게 합니다.
+    """
+    merged = []
+    for index, result in enumerate(results):
+        result = result.strip()
+        if index and result.startswith('# '):
+            result = result.partition('\n')[2].lstrip()
+        merged.append(result)
+    return "\n\n".join(merged)
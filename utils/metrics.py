@@ -0,0 +1,146 @@
+# utils/metrics.py
+# 단계별 소요 시간(히스토그램), 횟수(카운터), 진행 중인 작업 수(게이지)를 모으는 가벼운 측정 도구를 포함합니다.
+# youtube_helper, gemini_helper, 노트 저장, 처리 파이프라인이 같은 전역 레지스트리(METRICS)에 기록하며,
+# 실행이 끝나면 단계별 p50 / p95와 분당 처리량을 보고하고 JSON 파일로 내보낼 수 있습니다.
+
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+class Histogram:
+    """
+    관측값의 개수, 합계, 최솟값, 최댓값과 백분위 계산용 표본을 보관합니다.
+    표본은 max_samples개까지 모두 두고, 그 뒤로는 저장소 표집(reservoir sampling)으로 일정 크기를 유지합니다.
+    """
+
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._samples = []
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._samples) < self.max_samples:
+            self._samples.append(value)
+        else:
+            index = random.randrange(self.count)
+            if index < self.max_samples:
+                self._samples[index] = value
+
+    def percentile(self, p):
+        """p(0~100) 백분위 값을 반환합니다. 관측값이 없으면 None을 반환합니다."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+        }
+
+class Metrics:
+    """
+    이름별 카운터, 히스토그램, 게이지 레지스트리. 여러 스레드에서 동시에 기록할 수 있습니다.
+    시간 측정에는 timer를 사용합니다. (측정하는 동안 '<이름>' 게이지가 1 늘어나고, 예외가 나면 '<이름>.errors' 카운터가 늘어남)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.monotonic()
+            self._counters = {}
+            self._histograms = {}
+            self._gauges = {}
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def gauge_add(self, name, delta):
+        with self._lock:
+            self._gauges[name] = self._gauges.get(name, 0) + delta
+
+    @contextmanager
+    def timer(self, name):
+        """with 블록의 소요 시간(초)을 name 히스토그램에 기록합니다."""
+        self.gauge_add(name, 1)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.incr(f"{name}.errors")
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start)
+            self.gauge_add(name, -1)
+
+    def counter(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self):
+        """현재까지의 측정값을 JSON으로 직렬화할 수 있는 딕셔너리로 반환합니다."""
+        with self._lock:
+            return {
+                "elapsed_seconds": round(time.monotonic() - self.started_at, 3),
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {name: histogram.to_dict() for name, histogram in self._histograms.items()},
+            }
+
+    def export_json(self, path):
+        """측정값을 JSON 파일로 저장합니다."""
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+    def report(self):
+        """실행 종료 보고용 문자열 목록을 반환합니다. (단계별 횟수·p50·p95, 분당 영상 / 토큰 처리량)"""
+        snapshot = self.snapshot()
+        minutes = max(snapshot["elapsed_seconds"], 1e-9) / 60
+        counters = snapshot["counters"]
+        lines = ["--- 단계별 소요 시간 ---"]
+        for name in sorted(snapshot["histograms"]):
+            stats = snapshot["histograms"][name]
+            errors = counters.get(f"{name}.errors", 0)
+            lines.append(
+                f"  - {name}: {stats['count']}회, p50 {stats['p50']:.3f}초, p95 {stats['p95']:.3f}초"
+                + (f", 오류 {errors}회" if errors else "")
+            )
+        finished = sum(counters.get(f"videos.{state}", 0) for state in ("saved", "failed", "skipped"))
+        lines.append(
+            f"  - 처리량: 영상 {finished / minutes:.1f}개/분, "
+            f"입력 토큰 {counters.get('gemini.input_tokens', 0) / minutes:,.0f}/분, "
+            f"출력 토큰 {counters.get('gemini.output_tokens', 0) / minutes:,.0f}/분"
+        )
+        return lines
+
+# 모든 모듈이 함께 기록하는 전역 레지스트리
+METRICS = Metrics()
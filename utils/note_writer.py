@@ -0,0 +1,121 @@
+# utils/note_writer.py
+# 노트 저장 폴더를 한 번만 읽어 파일 이름 목록을 메모리에 두고, 노트를 백그라운드 스레드에서
+# 임시 파일에 쓴 뒤 이름을 바꾸는(원자적) 방식으로 저장하는 노트 작성기를 포함합니다.
+# OneDrive 등으로 동기화되는 폴더에서는 파일 조회가 느리므로 노트마다 폴더를 조회하지 않습니다.
+
+import logging
+import os
+import queue
+import tempfile
+import threading
+from .file_helper import note_base_filename, numbered_filename, build_frontmatter
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+# 임시 파일을 둘 노트 폴더 안의 숨김 폴더. Obsidian은 '.'으로 시작하는 폴더를 볼트 목록에 보이지 않음
+TEMP_DIR_NAME = ".ytgnify-tmp"
+
+def _default_file_mode():
+    # mkstemp는 0600으로 파일을 만들므로, 일반 open처럼 umask를 적용한 권한으로 바꿔 저장함
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+_FILE_MODE = _default_file_mode()
+
+class NoteWriter:
+    """
+    하나의 노트 폴더에 노트를 저장합니다.
+    파일 이름은 write를 호출한 순서대로 즉시 정해지고, 실제 파일 쓰기는 작성기 스레드가 순서대로 처리합니다.
+    close를 호출하면 남은 쓰기가 모두 끝날 때까지 기다립니다.
+
+    Args:
+        directory (str): 노트 저장 폴더. 없으면 만듭니다.
+        max_pending (int): 아직 쓰지 않은 노트의 최대 개수. 가득 차면 write가 잠시 기다립니다.
+        log (callable, optional): 폴더 생성 등 메시지를 받을 함수. 없으면 모듈 로거에 INFO로 기록합니다.
+    """
+
+    def __init__(self, directory, max_pending=64, log=None):
+        self.directory = directory
+        self.log = log or logger.info
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+            self.log(f"'{directory}' 폴더를 생성했습니다.")
+        # Windows / OneDrive 폴더는 대소문자를 구분하지 않으므로 소문자로 비교
+        self._names = {name.lower() for name in os.listdir(directory)}
+        self._temp_dir = os.path.join(directory, TEMP_DIR_NAME)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread = threading.Thread(target=self._run, name="note-writer", daemon=True)
+        self._thread.start()
+
+    def reserve(self, base_filename):
+        """폴더와 예약된 이름에 없는 '<이름>.md' 또는 '<이름>-<번호>.md' 경로를 정해 예약합니다."""
+        with self._lock:
+            filename = f"{base_filename}.md"
+            counter = 1
+            while filename.lower() in self._names:
+                filename = numbered_filename(base_filename, counter)
+                counter += 1
+            self._names.add(filename.lower())
+        return os.path.join(self.directory, filename)
+
+    def write(self, content, keep_original_title=False, original_title="", on_done=None, metadata=None):
+        """
+        노트 저장을 예약하고 저장될 경로를 반환합니다.
+        metadata가 주어지면 YAML frontmatter로 노트 앞에 붙입니다. (파일 이름은 frontmatter를 뺀 내용으로 정함)
+        on_done이 주어지면 쓰기가 끝난 뒤 작성기 스레드에서 (경로, 오류)로 호출합니다. 성공하면 오류는 None입니다.
+        """
+        file_path = self.reserve(note_base_filename(content, keep_original_title, original_title))
+        if metadata:
+            content = build_frontmatter(metadata) + content
+        self._queue.put((file_path, content, on_done))
+        return file_path
+
+    def close(self):
+        """남은 노트를 모두 저장한 뒤 작성기 스레드를 종료합니다."""
+        if self._thread.is_alive():
+            self._queue.put(_END)
+            self._thread.join()
+        try:
+            os.rmdir(self._temp_dir)
+        except OSError:
+            pass # 없거나 (다른 작성기가 쓰는 중이라) 비어 있지 않음
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            file_path, content, on_done = item
+            error = None
+            try:
+                with METRICS.timer("note.write"):
+                    self._write_file(file_path, content)
+            except Exception as e:
+                error = e
+            if on_done is not None:
+                try:
+                    on_done(file_path, error)
+                except Exception as e:
+                    self.log(f"  - ✗ 오류: 노트 저장 후처리 중 문제 발생 - {e}")
+
+    def _write_file(self, file_path, content):
+        # 같은 드라이브의 임시 파일에 끝까지 쓴 뒤 이름을 바꾸므로, 중간에 끊겨도 반쯤 쓰인 노트가 남지 않음
+        # (임시 파일은 노트 목록에 섞이지 않도록 숨김 하위 폴더에 만듦)
+        os.makedirs(self._temp_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self._temp_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.chmod(temp_path, _FILE_MODE)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
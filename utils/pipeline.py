@@ -0,0 +1,416 @@
+# utils/pipeline.py
+# 스크립트 추출 → Gemini 요약 → 노트 저장 단계를 크기가 제한된 큐로 연결하여
+# 각 단계가 동시에 진행되도록 하는 처리 파이프라인을 포함합니다.
+
+import hashlib
+import logging
+import queue
+import threading
+from datetime import datetime
+from . import youtube_helper
+from .gemini_dispatcher import GeminiDispatcher
+from .job_journal import STAGE_QUEUED, STAGE_TRANSCRIPT_FETCHED, STAGE_SUMMARIZED, STAGE_SAVED, STAGE_FAILED
+from .batch_planner import BatchPlanner, estimate_tokens, PROMPT_OVERHEAD_TOKENS, TASK_OVERHEAD_TOKENS
+from .result_cache import ResultCache
+from .map_reduce import (
+    TRANSCRIPT_START, TRANSCRIPT_END, MAP_PROMPT_TOKENS,
+    build_map_tasks, build_reduce_task, build_merge_task, split_task, merge_part_results
+)
+from .note_writer import NoteWriter
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_END = object() # 단계의 입력이 끝났음을 알리는 표식
+
+def build_task(video, user_prompt, transcript):
+    """영상 정보와 스크립트로 Gemini에 보낼 작업 항목을 만듭니다."""
+    prompt_with_title = f"영상 제목: {video['title']}\n\n{user_prompt}"
+    full_prompt = f"{prompt_with_title}\n\n{TRANSCRIPT_START}{transcript}{TRANSCRIPT_END}"
+    return {"id": video['id'], "task": full_prompt, "original_title": video['title']}
+
+def result_cache_key(task, model_name):
+    """작업의 스크립트, 스크립트 앞 프롬프트(제목 포함), 모델 이름으로 요약 결과 캐시 키를 만듭니다."""
+    header, _, rest = task['task'].partition(TRANSCRIPT_START)
+    transcript = rest[:-len(TRANSCRIPT_END)] if rest.endswith(TRANSCRIPT_END) else rest
+    return ResultCache.make_key(transcript, header, model_name)
+
+def run_pipeline(videos, user_prompt, obsidian_path, model_name=None, batch_size=20,
+                 max_batch_tokens=120000, keep_original_title=False, transcript_workers=4, transcript_timeout=60,
+                 transcript_max_retries=2, transcript_languages=None,
+                 map_reduce_threshold=0, map_reduce_chunk_tokens=8000, map_reduce_chunk_seconds=None, timestamp_interval=0,
+                 transcript_cache=None, result_cache=None, video_index=None, vault_index=None, journal=None, dispatcher=None, log=None, progress=None):
+    """
+    선택된 영상들을 스트리밍 방식으로 처리합니다.
+
+    스크립트는 준비되는 대로 큐에 들어가고, BatchPlanner가 작업 수(batch_size)와 추정 토큰 수(max_batch_tokens)
+    한도 안에서 배치를 채우면 Gemini 배치 요청이 나갑니다. 한도보다 긴 스크립트는 여러 부분으로 나눠 요약한 뒤
+    merge 작업으로 하나의 노트로 합칩니다.
+    요청이 처리되는 동안에도 다음 스크립트 추출은 계속되며, 결과는 작업 단위로 도착하는 즉시 노트로 저장됩니다.
+    큐의 크기가 제한되어 있으므로 영상 수가 많아도 메모리에 머무는 스크립트 수는 일정합니다.
+
+    추정 토큰 수가 map_reduce_threshold를 넘는 스크립트는 map-reduce 방식으로 처리합니다.
+    자막 세그먼트 경계에 맞춰 map_reduce_chunk_tokens / map_reduce_chunk_seconds 이하의 시간 구간으로 나누어
+    구간별 요약을 다른 작업과 함께 병렬로 요청한 뒤, 모든 구간 요약이 도착하면 이를 모아 최종 노트를 요청합니다.
+
+    Args:
+        videos (list): 각 항목이 {"id": "...", "title": "..."} 형태의 딕셔너리인 리스트
+        map_reduce_threshold (int): map-reduce로 처리할 스크립트의 최소 추정 토큰 수. 0이면 사용하지 않습니다.
+        timestamp_interval (int): 0보다 크면 노트 끝에 이 간격(초)마다 &t= 링크가 달린 원본 스크립트를 덧붙입니다.
+        transcript_max_retries (int): 자막 요청이 일시적인 오류로 실패했을 때 다시 시도하는 최대 횟수
+        transcript_languages (list, optional): 자막 선호 언어 코드 목록 (예: ['ko', 'en'])
+        transcript_cache (TranscriptCache, optional): 자막 조회 전에 확인할 로컬 캐시
+        result_cache (ResultCache, optional): 요약 결과 캐시. 같은 스크립트·프롬프트·모델의 결과가 있으면
+            Gemini 요청 없이 바로 노트로 저장하고, 새로 받은 결과는 캐시에 추가합니다.
+        video_index (VideoIndex, optional): 노트 저장이 끝난 영상을 처리 완료로 표시할 영상 인덱스
+        vault_index (VaultIndex, optional): 저장한 노트를 추가할 노트 폴더 인덱스
+        journal (JobJournal, optional): 영상별 진행 단계를 기록할 작업 일지.
+            이전 실행에서 저장까지 끝난 영상은 건너뛰고, 요약까지 끝난 영상은 저장된 결과로 바로 노트를 만듭니다.
+        dispatcher (GeminiDispatcher, optional): 배치 요청을 보낼 디스패처. 없으면 기본 설정으로 만들며,
+            실행이 끝나면 닫힙니다.
+        log (callable, optional): 진행 상황 메시지를 받을 함수. 없으면 모듈 로거에 INFO로 기록합니다.
+        progress (callable, optional): 영상 하나의 처리가 끝날 때마다 (끝난 영상 수, 전체 영상 수)로 호출할 함수
+
+    Returns:
+        dict: 'total'과 단계별 결과 영상 ID 목록('saved', 'failed', 'skipped', 'resumed', 'cached')
+    """
+    log = log or logger.info
+    total = len(videos)
+    batch_size = max(1, int(batch_size))
+    video_map = {v['id']: v for v in videos}
+    task_queue = queue.Queue(maxsize=batch_size * 2)
+    save_queue = queue.Queue(maxsize=batch_size * 2)
+    summary = {"total": total, "saved": [], "failed": [], "skipped": [], "resumed": [], "cached": []}
+    summary_lock = threading.Lock()
+
+    def record(state, video_id):
+        METRICS.incr(f"videos.{state}")
+        with summary_lock:
+            summary[state].append(video_id)
+            finished = len(summary["saved"]) + len(summary["failed"]) + len(summary["skipped"])
+        if progress is not None and state in ("saved", "failed", "skipped"):
+            progress(finished, total)
+
+    def mark(video_id, stage, **data):
+        if journal is not None:
+            journal.record(video_id, stage, **data)
+
+    # 작업 일지에 남은 이전 실행의 진행 상황을 반영하여 남은 작업만 추림
+    pending_videos = []
+    summarized_tasks = []
+    for video in videos:
+        stage = journal.stage(video['id']) if journal is not None else None
+        if stage == STAGE_SAVED:
+            record("saved", video['id'])
+            record("resumed", video['id'])
+        elif stage == STAGE_SUMMARIZED and journal.result(video['id']) is not None:
+            summarized_tasks.append(({"id": video['id'], "original_title": video['title']}, journal.result(video['id'])))
+            record("resumed", video['id'])
+        else:
+            pending_videos.append(video)
+            if stage is None:
+                mark(video['id'], STAGE_QUEUED)
+    if summary["resumed"]:
+        log(f"  - 이전 작업 이어서 진행: 저장 완료 {len(summary['saved'])}개, 요약 완료 {len(summarized_tasks)}개 재사용")
+
+    part_results = {} # 예산보다 커서 나뉜 작업의 {영상 ID: {원래 작업 ID: {부분 번호: 결과}}}
+    map_results = {} # 구간 요약 결과 {영상 ID: {구간 번호: 결과}}
+    failed_parents = set()
+    cache_keys = {} # 요약 결과를 캐시에 저장할 영상의 {영상 ID: 캐시 키}
+    map_jobs = {} # 구간 요약(map) 단계에 있는 영상의 {영상 ID: 구간 작업 목록}
+    merge_jobs = set() # 부분별로 나눠 요약 중이라 merge 작업이 나올 영상 ID
+    # 구간 요약이 모두 끝나 만들어진 reduce 작업과 부분 요약이 모두 끝나 만들어진 merge 작업.
+    # 디스패처 스레드가 막히지 않도록 크기를 제한하지 않음 (map / 부분 단계가 실패하면 대기 중인 요약 단계를 깨우기 위해 None을 넣음)
+    reduce_queue = queue.Queue()
+    results_lock = threading.Lock() # 디스패처 스레드들이 동시에 결과를 반영함
+    in_flight = 0 # 보냈지만 아직 on_batch_done이 호출되지 않은 배치 수
+
+    # 구간 작업이 배치 예산보다 커서 다시 나뉘지 않도록 구간 크기를 작업 하나의 예산 안으로 제한
+    map_reduce_chunk_tokens = max(1, min(
+        map_reduce_chunk_tokens,
+        max_batch_tokens - PROMPT_OVERHEAD_TOKENS - TASK_OVERHEAD_TOKENS - MAP_PROMPT_TOKENS
+    ))
+
+    timestamped = {} # 노트에 덧붙일 {영상 ID: 타임스탬프 스크립트}
+
+    def queue_task(video, task, transcript):
+        if not map_reduce_threshold or estimate_tokens(task['task']) <= map_reduce_threshold:
+            task_queue.put(task)
+            return
+        chunks = transcript.chunks(map_reduce_chunk_tokens, map_reduce_chunk_seconds)
+        if len(chunks) < 2:
+            task_queue.put(task)
+            return
+        map_tasks = build_map_tasks(video, chunks, TRANSCRIPT_START, TRANSCRIPT_END)
+        log(f"  - '{video['title']}' 스크립트가 길어 {len(map_tasks)}개 구간으로 나누어 요약합니다.")
+        with results_lock:
+            map_jobs[video['id']] = map_tasks
+        for map_task in map_tasks:
+            task_queue.put(map_task)
+
+    def fetch_stage():
+        try:
+            results = youtube_helper.fetch_transcripts(
+                [v['id'] for v in pending_videos], max_workers=transcript_workers, timeout=transcript_timeout,
+                cache=transcript_cache, with_segments=True, languages=transcript_languages, retries=transcript_max_retries
+            )
+            for i, (video_id, transcript, _, error) in enumerate(results):
+                video = video_map[video_id]
+                log(f"  - [{i+1}/{len(pending_videos)}] '{video['title']}' 스크립트 준비 중...")
+                if error:
+                    log(f"  - ✗ 오류: '{video['title']}' 스크립트 추출 중 문제 발생 - {error}")
+                    record("failed", video_id)
+                    mark(video_id, STAGE_FAILED, error=str(error))
+                    continue
+                if not transcript:
+                    log(f"  - 경고: '{video['title']}' 스크립트를 찾을 수 없어 건너뜁니다.")
+                    record("skipped", video_id)
+                    mark(video_id, STAGE_FAILED, error="no transcript")
+                    continue
+                mark(video_id, STAGE_TRANSCRIPT_FETCHED)
+                if timestamp_interval:
+                    with results_lock:
+                        timestamped[video_id] = transcript.to_markdown(video_id, timestamp_interval)
+                task = build_task(video, user_prompt, transcript.text)
+                if result_cache is not None:
+                    key = result_cache_key(task, model_name)
+                    cached_result = result_cache.get(key)
+                    if cached_result is not None:
+                        log(f"  - '{video['title']}' 캐시된 요약 결과를 사용합니다.")
+                        record("cached", video_id)
+                        mark(video_id, STAGE_SUMMARIZED, result=cached_result)
+                        save_queue.put((task, cached_result))
+                        continue
+                    with results_lock:
+                        cache_keys[video_id] = key
+                queue_task(video, task, transcript)
+        except Exception as e:
+            log(f"  - ✗ 오류: 스크립트 추출 단계 중단 - {e}")
+        finally:
+            task_queue.put(_END)
+
+    def fail_task(task, reason):
+        video_id = task.get('parent_id', task['id'])
+        with results_lock:
+            if video_id in failed_parents:
+                return
+            failed_parents.add(video_id)
+            part_results.pop(video_id, None)
+            map_results.pop(video_id, None)
+            cache_keys.pop(video_id, None)
+            timestamped.pop(video_id, None)
+            if map_jobs.pop(video_id, None) is not None:
+                reduce_queue.put(None)
+            if video_id in merge_jobs:
+                merge_jobs.discard(video_id)
+                reduce_queue.put(None)
+        log(f"  - ✗ 오류: '{task['original_title']}' 처리 결과가 없습니다.")
+        record("failed", video_id)
+        mark(video_id, STAGE_FAILED, error=reason)
+
+    def complete_task(task, result):
+        video_id = task.get('parent_id', task['id'])
+        source = task.get('split_of')
+        if source is not None:
+            # 예산보다 커서 나눈 작업의 조각: 모두 모이면 원래 작업(영상, 구간, reduce 또는 merge 작업)의 결과로 합침
+            with results_lock:
+                if video_id in failed_parents:
+                    return
+                parts = part_results.setdefault(video_id, {}).setdefault(source['id'], {})
+                parts[task['part_index']] = result
+                if len(parts) < task['part_count']:
+                    return
+                del part_results[video_id][source['id']]
+                ordered = [parts[i] for i in range(task['part_count'])]
+                if video_id in merge_jobs:
+                    # 부분마다 노트 전체를 요약했으므로 이어 붙이지 않고 하나의 노트로 합치는 작업을 보냄
+                    merge_jobs.discard(video_id)
+                    reduce_queue.put(build_merge_task(source, ordered, user_prompt))
+                    return
+            complete_task(source, merge_part_results(ordered))
+            return
+        if task.get('kind') == 'map':
+            with results_lock:
+                if video_id in failed_parents:
+                    return
+                parts = map_results.setdefault(video_id, {})
+                parts[task['part_index']] = result
+                if len(parts) < task['part_count']:
+                    return
+                del map_results[video_id]
+                # 구간 요약이 모두 모이면 최종 노트를 만들 reduce 작업을 요약 단계로 보냄
+                reduce_queue.put(build_reduce_task(map_jobs.pop(video_id), parts, user_prompt, TRANSCRIPT_START, TRANSCRIPT_END))
+            return
+        if 'parent_id' in task:
+            task = {"id": video_id, "original_title": task['original_title']}
+        # 유료 요청의 결과는 저장 전에 먼저 일지와 캐시에 남김
+        mark(video_id, STAGE_SUMMARIZED, result=result)
+        with results_lock:
+            key = cache_keys.pop(video_id, None)
+        if key is not None:
+            result_cache.put(key, result)
+        save_queue.put((task, result))
+
+    def on_batch_done(batch, missing, error):
+        nonlocal in_flight
+        try:
+            if error is not None:
+                log(f"  - ✗ 오류: Gemini 배치 처리 중 문제 발생 - {error}")
+            for task in missing:
+                fail_task(task, str(error) if error else "no result")
+            if journal is not None:
+                # 배치 하나의 요약 결과 기록이 끝난 단계 경계에서만 디스크에 동기화
+                journal.sync()
+        finally:
+            # 결과 반영(reduce 작업 추가 포함)이 끝난 뒤에 줄여야 요약 단계가 남은 작업을 잘못 판단하지 않음
+            with results_lock:
+                in_flight -= 1
+
+    gemini = dispatcher or GeminiDispatcher(model_name, log=log)
+
+    def send_batch(batch):
+        nonlocal in_flight
+        log(f"  - Gemini API로 {len(batch)}개 작업 배치 요청...")
+        with results_lock:
+            in_flight += 1
+        gemini.submit(batch, complete_task, on_batch_done)
+
+    def fail_orphaned_jobs():
+        # 보낸 배치가 모두 끝났는데도 reduce / merge 작업이 오지 않은 영상은 실패로 처리하여 대기가 끝나게 함
+        with results_lock:
+            orphaned = [] if in_flight else list(map_jobs) + list(merge_jobs)
+        if not orphaned or not reduce_queue.empty():
+            return
+        for video_id in orphaned:
+            fail_task({"id": video_id, "original_title": video_map[video_id]['title']}, "map-reduce 결과가 완성되지 않았습니다.")
+
+    def split(task, max_tokens):
+        parts = split_task(task, max_tokens)
+        # 노트 전체를 요약하는 작업(영상 / reduce)이 여러 부분으로 나뉘면 부분 결과를 merge 작업으로 합침
+        # (구간 요약과 merge 작업의 조각은 그대로 이어 붙임)
+        if len(parts) > 1 and task.get('kind') not in ('map', 'merge'):
+            with results_lock:
+                merge_jobs.add(task.get('parent_id', task['id']))
+        return parts
+
+    def summarize_stage():
+        planner = BatchPlanner(max_batch_tokens, batch_size, splitter=split)
+
+        def add_reduce_tasks():
+            while True:
+                try:
+                    task = reduce_queue.get_nowait()
+                except queue.Empty:
+                    return
+                if task is not None:
+                    for batch in planner.add(task):
+                        send_batch(batch)
+
+        try:
+            for item in summarized_tasks:
+                save_queue.put(item)
+            while True:
+                add_reduce_tasks()
+                try:
+                    # 스크립트 추출이 느려도 reduce 작업이 오래 머물지 않도록 주기적으로 깨어남
+                    task = task_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if task is _END:
+                    break
+                for batch in planner.add(task):
+                    send_batch(batch)
+            for batch in planner.flush():
+                send_batch(batch)
+
+            # 구간 / 부분 요약 중인 영상의 reduce / merge 작업이 모두 나갈 때까지 대기
+            while True:
+                with results_lock:
+                    waiting = bool(map_jobs) or bool(merge_jobs)
+                if not waiting:
+                    add_reduce_tasks()
+                    for batch in planner.flush():
+                        send_batch(batch)
+                    break
+                try:
+                    task = reduce_queue.get(timeout=0.5)
+                except queue.Empty:
+                    fail_orphaned_jobs()
+                    continue
+                if task is not None:
+                    for batch in planner.add(task):
+                        send_batch(batch)
+                for batch in planner.flush():
+                    send_batch(batch)
+        finally:
+            # 진행 중인 요청이 모두 끝나 결과가 저장 큐에 들어간 뒤 종료 표식을 보냄
+            gemini.close()
+            save_queue.put(_END)
+
+    prompt_hash = hashlib.sha256(user_prompt.encode('utf-8')).hexdigest()[:12]
+
+    def note_metadata(video_id, video_title):
+        # 노트 frontmatter. video_id로 이미 처리한 영상을 알아봄
+        return {
+            "video_id": video_id,
+            "title": video_title,
+            "channel": video_map.get(video_id, {}).get('channel_id'),
+            "model": model_name,
+            "prompt_hash": prompt_hash,
+            "created": datetime.now().astimezone().isoformat(timespec='seconds')
+        }
+
+    def on_note_written(video_id, video_title, file_path, error):
+        # 노트 작성기 스레드에서 파일 쓰기가 끝난 뒤 호출됨
+        if error is not None:
+            log(f"  - ✗ 오류: '{video_title}' 노트 저장 중 문제 발생 - {error}")
+            record("failed", video_id)
+            mark(video_id, STAGE_FAILED, error=str(error))
+            return
+        log(f"  - ✓ 완료: '{video_title}' 노트 생성 완료")
+        record("saved", video_id)
+        mark(video_id, STAGE_SAVED, path=file_path)
+        if video_index is not None:
+            video_index.mark_processed([video_id])
+        if vault_index is not None:
+            vault_index.add(video_id, file_path)
+
+    def save_stage():
+        writer = None
+        try:
+            while True:
+                item = save_queue.get()
+                if item is _END:
+                    break
+                task, processed_content = item
+                video_id, video_title = task['id'], task['original_title']
+                with results_lock:
+                    timestamps = timestamped.pop(video_id, None)
+                if timestamps:
+                    processed_content = f"{processed_content.rstrip()}\n\n## 타임스탬프 스크립트\n\n{timestamps}\n"
+                try:
+                    log(f"  - '{video_title}' 내용 가공 완료. 노트 저장 중...")
+                    if writer is None:
+                        # 저장할 노트가 생겼을 때 폴더를 한 번만 읽음
+                        writer = NoteWriter(obsidian_path, log=log)
+                    writer.write(
+                        processed_content, keep_original_title, video_title,
+                        on_done=lambda path, error, video_id=video_id, video_title=video_title: on_note_written(video_id, video_title, path, error),
+                        metadata=note_metadata(video_id, video_title)
+                    )
+                except Exception as e:
+                    on_note_written(video_id, video_title, None, e)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    stages = [threading.Thread(target=stage, name=f"pipeline-{stage.__name__}", daemon=True)
+              for stage in (fetch_stage, summarize_stage, save_stage)]
+    for stage in stages:
+        stage.start()
+    for stage in stages:
+        stage.join()
+
+    if journal is not None and not summary["failed"]:
+        journal.finish()
+    return summary
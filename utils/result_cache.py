@@ -0,0 +1,48 @@
+# utils/result_cache.py
+# Gemini 요약 결과를 (스크립트 해시, 프롬프트 해시, 모델 이름)으로 보관하여
+# 같은 스크립트를 같은 프롬프트와 모델로 다시 처리할 때 API 호출을 생략하는 캐시를 포함합니다.
+
+import hashlib
+import os
+from .cache_store import CacheStore
+
+def _digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """
+    내용 주소 방식의 요약 결과 캐시.
+    키가 입력 내용에서 만들어지므로 만료 기간 없이 크기 상한(max_bytes)에 따른 LRU 제거만 합니다.
+    저장 경로나 원본 제목 유지 설정은 키에 포함되지 않으므로, 이것만 바꾼 재실행은 API를 호출하지 않습니다.
+    """
+
+    def __init__(self, path, max_bytes=None):
+        self.store = CacheStore(path, max_bytes=max_bytes)
+
+    @classmethod
+    def from_config(cls, config, base_dir):
+        """config의 result_cache_* 설정으로 캐시를 만듭니다. 경로가 비어 있으면 None을 반환합니다."""
+        path = config.get("result_cache_path")
+        if not path:
+            return None
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        max_mb = config.get("result_cache_max_mb", 200)
+        return cls(path, max_bytes=max_mb * 1024 * 1024 if max_mb else None)
+
+    @staticmethod
+    def make_key(transcript, prompt, model_name):
+        """
+        Args:
+            transcript (str): 요약할 스크립트 본문
+            prompt (str): 스크립트 앞에 붙는 프롬프트 (영상 제목 포함)
+            model_name (str): Gemini 모델 이름
+        """
+        return f"{_digest(transcript)}|{_digest(prompt)}|{model_name or ''}"
+
+    def get(self, key):
+        """저장된 요약 결과를 반환합니다. 없으면 None을 반환합니다."""
+        return self.store.get(key)
+
+    def put(self, key, result):
+        self.store.put(key, result)
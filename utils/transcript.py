@@ -0,0 +1,162 @@
+# utils/transcript.py
+# 자막 세그먼트의 텍스트와 시작 시각을 적은 메모리로 보관하는 Transcript 객체를 포함합니다.
+# 시간 구간 자르기, 세그먼트 경계에 맞춘 조각 나누기, 유튜브 &t= 링크가 달린 타임스탬프 출력을 지원합니다.
+
+from array import array
+from bisect import bisect_left
+from .batch_planner import estimate_tokens
+
+# 자막 언어 기본 선호 순서 (config의 transcript_languages로 바꿀 수 있음)
+DEFAULT_LANGUAGES = ['ko', 'en']
+
+# 세 글자 언어 코드 등 같은 언어를 가리키는 다른 표기
+_LANGUAGE_ALIASES = {'kor': 'ko', 'korean': 'ko', 'eng': 'en', 'english': 'en'}
+
+def normalize_language(code):
+    """'ko-KR', 'kor', 'en_US' 같은 언어 코드를 'ko', 'en' 같은 기본 언어 코드로 바꿉니다."""
+    primary = code.lower().replace('_', '-').split('-')[0]
+    return _LANGUAGE_ALIASES.get(primary, primary)
+
+def language_rank(language_code, is_generated, languages=None):
+    """
+    선호 언어 목록에서 자막의 순위를 반환합니다. 값이 작을수록 우선하며, 같은 언어에서는 수동 자막이 먼저입니다.
+    선호 목록에 없는 언어이면 None을 반환합니다.
+    """
+    preferred = [normalize_language(code) for code in (languages or DEFAULT_LANGUAGES)]
+    language = normalize_language(language_code)
+    if language not in preferred:
+        return None
+    return preferred.index(language) * 2 + (1 if is_generated else 0)
+
+def format_timestamp(seconds):
+    """초를 'M:SS' 또는 'H:MM:SS' 형식으로 바꿉니다."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+def watch_url(video_id, seconds=0):
+    """영상의 해당 시각으로 바로 이동하는 유튜브 링크를 만듭니다."""
+    return f"https://www.youtube.com/watch?v={video_id}&t={int(seconds)}s"
+
+class Transcript:
+    """
+    자막 세그먼트 목록을 하나의 문자열과 숫자 배열로 보관합니다.
+
+    세그먼트 텍스트는 공백 하나로 이어 붙인 text에, 각 세그먼트의 시작 위치는 offsets에,
+    시작 시각과 길이는 starts / durations 배열에 저장하므로 세그먼트마다 객체를 만들지 않습니다.
+    반복하면 (텍스트, 시작 시각, 길이) 튜플을 순서대로 돌려주어 기존 세그먼트 목록처럼 사용할 수 있습니다.
+    """
+
+    __slots__ = ('text', 'offsets', 'starts', 'durations')
+
+    def __init__(self, text, offsets, starts, durations):
+        self.text = text
+        self.offsets = offsets
+        self.starts = starts
+        self.durations = durations
+
+    @classmethod
+    def from_segments(cls, segments):
+        """(텍스트, 시작 시각, 길이) 항목들로 Transcript를 만듭니다. 빈 텍스트의 세그먼트는 건너뜁니다."""
+        texts = []
+        offsets = array('L')
+        starts = array('d')
+        durations = array('f')
+        position = 0
+        for text, start, duration in segments:
+            text = text.replace('\n', ' ').strip()
+            if not text:
+                continue
+            offsets.append(position)
+            starts.append(start or 0.0)
+            durations.append(duration or 0.0)
+            texts.append(text)
+            position += len(text) + 1
+        return cls(" ".join(texts), offsets, starts, durations)
+
+    def to_segments(self):
+        """캐시 저장용 [텍스트, 시작 시각, 길이] 목록을 반환합니다."""
+        return [[text, start, duration] for text, start, duration in self]
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __bool__(self):
+        return len(self.offsets) > 0
+
+    def __iter__(self):
+        for i in range(len(self.offsets)):
+            yield self.segment_text(i), self.starts[i], self.durations[i]
+
+    def segment_text(self, index):
+        end = self.offsets[index + 1] - 1 if index + 1 < len(self.offsets) else len(self.text)
+        return self.text[self.offsets[index]:end]
+
+    @property
+    def start(self):
+        return self.starts[0] if self.starts else 0.0
+
+    @property
+    def end(self):
+        return self.starts[-1] + self.durations[-1] if self.starts else 0.0
+
+    def _slice(self, first, last):
+        # first 이상 last 미만 세그먼트로 새 Transcript를 만듦 (텍스트는 한 번만 잘라냄)
+        if first >= last:
+            return Transcript("", array('L'), array('d'), array('f'))
+        base = self.offsets[first]
+        text_end = self.offsets[last] - 1 if last < len(self.offsets) else len(self.text)
+        offsets = array('L', (offset - base for offset in self.offsets[first:last]))
+        return Transcript(self.text[base:text_end], offsets, self.starts[first:last], self.durations[first:last])
+
+    def slice(self, start_seconds, end_seconds=None):
+        """start_seconds 이상 end_seconds 미만에 시작하는 세그먼트들만 담은 Transcript를 반환합니다."""
+        first = bisect_left(self.starts, start_seconds)
+        last = len(self.starts) if end_seconds is None else bisect_left(self.starts, end_seconds)
+        return self._slice(first, last)
+
+    def chunks(self, max_tokens, max_seconds=None):
+        """
+        세그먼트 경계에서 잘라 추정 토큰 수가 max_tokens 이하인 조각들로 나눕니다.
+        max_seconds가 주어지면 조각이 덮는 시간도 그 이하로 제한합니다.
+        (세그먼트 하나가 max_tokens보다 크면 그 세그먼트만으로 조각을 만듭니다.)
+        """
+        count = len(self.offsets)
+        if not count:
+            return []
+        # 전체 평균 글자/토큰 비율로 세그먼트별 토큰 수를 어림하여 조각마다 문자열을 다시 세지 않음
+        tokens_per_char = estimate_tokens(self.text) / max(1, len(self.text))
+        result = []
+        first = 0
+        while first < count:
+            last = first + 1
+            char_limit = max_tokens / tokens_per_char
+            time_limit = self.starts[first] + max_seconds if max_seconds else None
+            while last < count:
+                next_end = self.offsets[last + 1] - 1 if last + 1 < count else len(self.text)
+                if next_end - self.offsets[first] > char_limit:
+                    break
+                if time_limit is not None and self.starts[last] + self.durations[last] > time_limit:
+                    break
+                last += 1
+            result.append(self._slice(first, last))
+            first = last
+        return result
+
+    def to_markdown(self, video_id, interval_seconds=60):
+        """
+        약 interval_seconds마다 줄을 나누고, 각 줄 앞에 해당 시각으로 이동하는 [M:SS](…&t=…s) 링크를 붙인 텍스트를 반환합니다.
+        """
+        lines = []
+        count = len(self.offsets)
+        first = 0
+        while first < count:
+            line_start = self.starts[first]
+            last = max(first + 1, bisect_left(self.starts, line_start + interval_seconds, first))
+            piece = self._slice(first, last)
+            lines.append(f"[{format_timestamp(line_start)}]({watch_url(video_id, line_start)}) {piece.text}")
+            first = last
+        return "\n".join(lines)
@@ -0,0 +1,67 @@
+# utils/transcript_cache.py
+# 한 번 가져온 유튜브 자막을 로컬에 보관하여 같은 영상을 다시 처리할 때
+# 자막 목록 조회와 다운로드 요청을 생략할 수 있도록 하는 캐시를 포함합니다.
+
+import json
+import os
+from .cache_store import CacheStore
+from .transcript import language_rank
+
+class TranscriptCache:
+    """
+    (영상 ID, 언어 코드, 자동생성 여부)를 키로 자막 세그먼트를 저장하는 캐시.
+    세그먼트는 [텍스트, 시작 시각, 길이] 목록으로 저장됩니다.
+    """
+
+    def __init__(self, path, ttl_seconds=None, max_bytes=None):
+        self.store = CacheStore(path, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+
+    @classmethod
+    def from_config(cls, config, base_dir):
+        """config의 transcript_cache_* 설정으로 캐시를 만듭니다. 경로가 비어 있으면 None을 반환합니다."""
+        path = config.get("transcript_cache_path")
+        if not path:
+            return None
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        ttl_days = config.get("transcript_cache_ttl_days", 30)
+        max_mb = config.get("transcript_cache_max_mb", 500)
+        return cls(path, ttl_seconds=ttl_days * 86400 if ttl_days else None,
+                   max_bytes=max_mb * 1024 * 1024 if max_mb else None)
+
+    @staticmethod
+    def make_key(video_id, language_code, is_generated):
+        return f"{video_id}|{language_code}|{'generated' if is_generated else 'manual'}"
+
+    def get(self, video_id, language_code, is_generated):
+        """저장된 세그먼트 목록을 반환합니다. 없으면 None을 반환합니다."""
+        value = self.store.get(self.make_key(video_id, language_code, is_generated))
+        return json.loads(value) if value is not None else None
+
+    def put(self, video_id, language_code, is_generated, segments):
+        self.store.put(self.make_key(video_id, language_code, is_generated),
+                       json.dumps(segments, ensure_ascii=False, separators=(',', ':')))
+
+    def find(self, video_id, languages=None, fallback=False):
+        """
+        영상에 대해 캐시된 자막 중 선호 언어(languages) 순서상 가장 앞선 것을 찾습니다.
+        같은 언어에서는 수동 자막이 먼저입니다. 선호 언어의 자막이 없으면 None을 반환하며,
+        fallback=True일 때만 캐시된 다른 언어의 자막을 대신 반환합니다. (네트워크 조회가 실패했을 때의 마지막 수단)
+
+        Returns:
+            tuple: (언어 코드, 자동생성 여부, 세그먼트 목록). 캐시에 없으면 None
+        """
+        cached = []
+        for key in self.store.keys_with_prefix(f"{video_id}|"):
+            _, language_code, kind = key.split('|')
+            is_generated = kind == 'generated'
+            rank = language_rank(language_code, is_generated, languages)
+            if rank is None and not fallback:
+                continue
+            cached.append((rank is None, rank or 0, language_code, is_generated))
+
+        for _, _, language_code, is_generated in sorted(cached):
+            segments = self.get(video_id, language_code, is_generated)
+            if segments is not None:
+                return language_code, is_generated, segments
+        return None
@@ -0,0 +1,98 @@
+# utils/vault_index.py
+# 노트 폴더(볼트)의 노트 frontmatter에 적힌 video_id를 모아 어떤 영상의 노트가 이미 있는지 알려 주는 인덱스를 포함합니다.
+# 인덱스는 JSON 파일로 저장되며, 다시 열 때는 새로 생기거나 바뀐 노트의 frontmatter만 읽습니다.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from .file_helper import read_frontmatter
+
+class VaultIndex:
+    """
+    볼트의 .md 파일별 (수정 시각, 크기, video_id)를 보관합니다.
+    refresh로 폴더를 한 번 훑어 바뀐 파일만 다시 읽고, add로 새로 저장한 노트를 바로 반영합니다.
+
+    Args:
+        vault_dir (str): 노트 폴더
+        path (str): 인덱스를 저장할 JSON 파일 경로
+    """
+
+    def __init__(self, vault_dir, path):
+        self.vault_dir = os.path.abspath(vault_dir)
+        self.path = path
+        self._lock = threading.Lock()
+        self._files = {} # 파일 이름 → [수정 시각(ns), 크기, video_id 또는 None]
+        self._load()
+
+    @classmethod
+    def for_vault(cls, directory, vault_dir):
+        """directory 아래에 볼트 경로별로 구분된 인덱스 파일을 엽니다."""
+        name = hashlib.sha256(os.path.abspath(vault_dir).encode('utf-8')).hexdigest()[:16]
+        return cls(vault_dir, os.path.join(directory, f"{name}.json"))
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('vault') == self.vault_dir:
+            self._files = data.get('files', {})
+
+    def refresh(self):
+        """볼트를 훑어 새로 생기거나 바뀐 노트의 video_id를 읽고, 사라진 노트는 인덱스에서 뺍니다."""
+        files = {}
+        try:
+            entries = list(os.scandir(self.vault_dir))
+        except FileNotFoundError:
+            entries = []
+        with self._lock:
+            for entry in entries:
+                if not entry.name.endswith('.md') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                known = self._files.get(entry.name)
+                if known is not None and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+                    files[entry.name] = known
+                else:
+                    files[entry.name] = [stat.st_mtime_ns, stat.st_size, read_frontmatter(entry.path).get('video_id')]
+            changed = files != self._files
+            self._files = files
+        if changed:
+            self.save()
+        return self
+
+    def add(self, video_id, file_path):
+        """새로 저장한 노트를 인덱스에 추가합니다."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        with self._lock:
+            self._files[os.path.basename(file_path)] = [stat.st_mtime_ns, stat.st_size, video_id]
+
+    def video_ids(self):
+        """노트가 있는 영상 ID 집합을 반환합니다."""
+        with self._lock:
+            return {video_id for _, _, video_id in self._files.values() if video_id}
+
+    def path_for(self, video_id):
+        """영상의 노트 경로를 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            for name, (_, _, known_id) in self._files.items():
+                if known_id == video_id:
+                    return os.path.join(self.vault_dir, name)
+        return None
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({'vault': self.vault_dir, 'files': self._files}, ensure_ascii=False)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,201 @@
+# utils/video_catalog.py
+# 불러온 영상 목록을 메모리에 색인하여 Shorts / 최소 길이 / 제목 검색 / 정렬 조건을 바꿀 때
+# API를 다시 호출하지 않고 바로 다시 걸러낼 수 있도록 하는 영상 카탈로그를 포함합니다.
+
+import re
+import threading
+from bisect import bisect_left, bisect_right
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text):
+    """제목을 소문자 단어 토큰 목록으로 나눕니다. (한글, 영문, 숫자 단위)"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+# --- Shorts 판별기 ---
+# 판별기는 영상 딕셔너리를 받아 Shorts이면 True를 반환하는 함수입니다.
+
+def hashtag_detector(suffixes=('#비밀치트키',)):
+    """제목이 지정된 해시태그로 끝나면 Shorts로 판단합니다."""
+    suffixes = tuple(suffix.lower() for suffix in suffixes)
+    return lambda video: video['title'].strip().lower().endswith(suffixes)
+
+def duration_detector(max_seconds=60):
+    """영상 길이가 max_seconds 이하이면 Shorts로 판단합니다. (길이 정보가 없으면 판단하지 않음)"""
+    return lambda video: 0 < video.get('total_seconds', 0) <= max_seconds
+
+def make_shorts_detector(config):
+    """
+    config의 shorts_detectors 목록(예: ["hashtag", "duration"])으로 판별기를 만듭니다.
+    판별기 중 하나라도 Shorts라고 판단하면 Shorts로 봅니다.
+    """
+    factories = {
+        "hashtag": lambda: hashtag_detector(config.get("shorts_title_suffixes", ['#비밀치트키'])),
+        "duration": lambda: duration_detector(config.get("shorts_max_seconds", 60)),
+    }
+    detectors = []
+    for name in config.get("shorts_detectors", ["hashtag"]):
+        if name not in factories:
+            raise ValueError(f"알 수 없는 Shorts 판별기입니다: {name}")
+        detectors.append(factories[name]())
+    return lambda video: any(detect(video) for detect in detectors)
+
+# query의 sort 값과 (정렬 기준, 내림차순 여부)
+SORT_OPTIONS = {
+    "newest": ("published", True),
+    "oldest": ("published", False),
+    "longest": ("duration", True),
+    "shortest": ("duration", False),
+    "title": ("title", False),
+}
+
+class VideoCatalog:
+    """
+    영상 목록을 ID별 딕셔너리, 길이순 / 게시일순 정렬 열, 제목 토큰 색인으로 보관합니다.
+    Shorts 여부는 추가할 때 한 번만 판별해 둡니다.
+    작업 스레드의 add('더 불러오기')와 GUI 스레드의 query가 겹칠 수 있으므로 모든 공개 메서드는 잠금 안에서 실행됩니다.
+
+    Args:
+        shorts_detector (callable, optional): 영상 딕셔너리를 받아 Shorts 여부를 반환하는 함수.
+            없으면 기본 해시태그 판별기를 사용합니다.
+    """
+
+    def __init__(self, shorts_detector=None):
+        self.shorts_detector = shorts_detector or hashtag_detector()
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._videos = {}
+        self._shorts = set()
+        self._by_duration = [] # (총 초, 영상 ID) 정렬 목록
+        self._by_published = [] # (게시 시각, 영상 ID) 정렬 목록
+        self._tokens = {} # 토큰 → 영상 ID 집합
+        self._sorted_tokens = None # 접두어 검색용 정렬된 토큰 목록 (필요할 때 다시 만듦)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._videos)
+
+    def __contains__(self, video_id):
+        with self._lock:
+            return video_id in self._videos
+
+    def get(self, video_id):
+        with self._lock:
+            return self._videos.get(video_id)
+
+    def add(self, videos):
+        """영상들을 추가합니다. 이미 있는 영상은 새 정보로 바꿉니다. 입력 순서대로 추가된 영상 목록을 반환합니다."""
+        videos = list(videos)
+        with self._lock:
+            for video in videos:
+                if video['id'] in self._videos:
+                    self._remove(video['id'])
+                self._insert(video)
+            if videos:
+                # 한 번에 많이 추가되므로 하나씩 끼워 넣지 않고 추가 후 한 번 정렬
+                self._by_duration.sort()
+                self._by_published.sort()
+        return videos
+
+    def _insert(self, video):
+        video_id = video['id']
+        self._videos[video_id] = video
+        if self.shorts_detector(video):
+            self._shorts.add(video_id)
+        self._by_duration.append((video.get('total_seconds', 0), video_id))
+        self._by_published.append((video.get('published_at') or "", video_id))
+        for token in set(tokenize(video['title'])):
+            if token not in self._tokens:
+                self._tokens[token] = set()
+                self._sorted_tokens = None
+            self._tokens[token].add(video_id)
+
+    def _remove(self, video_id):
+        video = self._videos.pop(video_id)
+        self._shorts.discard(video_id)
+        for column, key in ((self._by_duration, video.get('total_seconds', 0)), (self._by_published, video.get('published_at') or "")):
+            try:
+                column.remove((key, video_id))
+            except ValueError:
+                pass
+        for token in set(tokenize(video['title'])):
+            ids = self._tokens.get(token)
+            if ids is not None:
+                ids.discard(video_id)
+
+    def is_short(self, video_id):
+        with self._lock:
+            return video_id in self._shorts
+
+    def filter(self, videos, include_shorts=True, min_duration_seconds=0):
+        """카탈로그에 추가된 영상 목록에 Shorts / 최소 길이 조건만 적용합니다. 순서는 유지합니다."""
+        with self._lock:
+            return [
+                v for v in videos
+                if (include_shorts or v['id'] not in self._shorts) and v.get('total_seconds', 0) >= (min_duration_seconds or 0)
+            ]
+
+    def _match_text(self, words):
+        """검색어 단어(words, 비어 있지 않은 토큰 목록)를 모두 (접두어로) 포함하는 영상 ID 집합을 반환합니다."""
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._tokens)
+        matched = None
+        for word in words:
+            start = bisect_left(self._sorted_tokens, word)
+            ids = set()
+            for token in self._sorted_tokens[start:]:
+                if not token.startswith(word):
+                    break
+                ids |= self._tokens[token]
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return set()
+        return matched
+
+    def query(self, include_shorts=True, min_duration_seconds=0, max_duration_seconds=None, text=None, sort="newest"):
+        """
+        조건에 맞는 영상 목록을 정렬하여 반환합니다. 네트워크 요청 없이 색인만 사용합니다.
+
+        Args:
+            text (str, optional): 제목 검색어. 모든 단어가 제목 단어의 접두어와 일치하는 영상만 반환합니다.
+                단어가 없는 검색어(문장 부호만 있는 경우 등)는 검색 조건이 없는 것으로 봅니다.
+            sort (str): SORT_OPTIONS의 키 ('newest', 'oldest', 'longest', 'shortest', 'title')
+        """
+        column, descending = SORT_OPTIONS[sort]
+        with self._lock:
+            # 길이 조건은 길이순 열에서 이분 탐색으로 범위를 잘라냄
+            low = bisect_left(self._by_duration, (min_duration_seconds or 0, ""))
+            high = len(self._by_duration) if max_duration_seconds is None else bisect_right(self._by_duration, (max_duration_seconds, "\uffff"))
+            in_range = self._by_duration[low:high]
+
+            candidates = None
+            if low > 0 or high < len(self._by_duration):
+                candidates = {video_id for _, video_id in in_range}
+            words = tokenize(text) if text else []
+            if words:
+                matched = self._match_text(words)
+                candidates = matched if candidates is None else candidates & matched
+
+            if column == "duration":
+                ordered = (video_id for _, video_id in in_range)
+            elif column == "published":
+                ordered = (video_id for _, video_id in self._by_published)
+            else:
+                ordered = (video['id'] for video in sorted(self._videos.values(), key=lambda v: v['title'].lower()))
+            if descending:
+                ordered = reversed(list(ordered))
+
+            result = []
+            for video_id in ordered:
+                if candidates is not None and video_id not in candidates:
+                    continue
+                if not include_shorts and video_id in self._shorts:
+                    continue
+                result.append(self._videos[video_id])
+            return result
@@ -0,0 +1,146 @@
+# utils/video_index.py
+# 채널별로 이미 확인한 영상 목록을 로컬 SQLite에 보관하는 영상 인덱스를 포함합니다.
+# 증분 동기화 시 이미 알고 있는 영상에 도달하면 목록 조회를 멈추는 데 사용됩니다.
+
+import os
+import sqlite3
+import threading
+import time
+
+class VideoIndex:
+    """
+    영상 ID, 제목, 길이, 게시 시각, 처리 여부를 채널별로 저장하는 인덱스.
+    채널마다 아직 내려받지 않은 과거 페이지의 토큰(backfill_token)도 함께 저장합니다.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS videos ("
+            " video_id TEXT PRIMARY KEY, channel_id TEXT NOT NULL, title TEXT NOT NULL,"
+            " duration TEXT NOT NULL, total_seconds INTEGER NOT NULL, published_at TEXT,"
+            " processed INTEGER NOT NULL DEFAULT 0, indexed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS videos_channel_published ON videos (channel_id, published_at);"
+            "CREATE INDEX IF NOT EXISTS videos_channel_duration ON videos (channel_id, total_seconds);"
+            "CREATE TABLE IF NOT EXISTS channel_sync ("
+            " channel_id TEXT PRIMARY KEY, backfill_token TEXT, last_synced_at REAL);"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config, base_dir):
+        """config의 video_index_path 설정으로 인덱스를 만듭니다. 경로가 비어 있으면 None을 반환합니다."""
+        path = config.get("video_index_path")
+        if not path:
+            return None
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        return cls(path)
+
+    def has_channel(self, channel_id):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM channel_sync WHERE channel_id = ?", (channel_id,)).fetchone()
+        return row is not None
+
+    def contains(self, video_id):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+        return row is not None
+
+    def upsert_videos(self, channel_id, videos):
+        """
+        영상 정보를 저장합니다. 이미 있는 영상은 제목과 길이만 갱신하고 처리 여부는 유지합니다.
+
+        Args:
+            videos (list): 각 항목이 {"id", "title", "duration", "total_seconds", "published_at"} 키를 갖는 딕셔너리인 리스트
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO videos (video_id, channel_id, title, duration, total_seconds, published_at, indexed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(video_id) DO UPDATE SET title = excluded.title, duration = excluded.duration,"
+                " total_seconds = excluded.total_seconds, published_at = excluded.published_at",
+                [(v['id'], channel_id, v['title'], v['duration'], v['total_seconds'], v.get('published_at'), now)
+                 for v in videos]
+            )
+            self._conn.commit()
+
+    def get_backfill_token(self, channel_id):
+        with self._lock:
+            row = self._conn.execute("SELECT backfill_token FROM channel_sync WHERE channel_id = ?", (channel_id,)).fetchone()
+        return row['backfill_token'] if row else None
+
+    def update_sync_state(self, channel_id, backfill_token=None, keep_backfill_token=False):
+        """마지막 동기화 시각과 과거 페이지 토큰을 기록합니다. keep_backfill_token=True이면 기존 토큰을 유지합니다."""
+        now = time.time()
+        with self._lock:
+            if keep_backfill_token:
+                self._conn.execute(
+                    "INSERT INTO channel_sync (channel_id, backfill_token, last_synced_at) VALUES (?, NULL, ?)"
+                    " ON CONFLICT(channel_id) DO UPDATE SET last_synced_at = excluded.last_synced_at",
+                    (channel_id, now)
+                )
+            else:
+                self._conn.execute(
+                    "INSERT INTO channel_sync (channel_id, backfill_token, last_synced_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(channel_id) DO UPDATE SET backfill_token = excluded.backfill_token,"
+                    " last_synced_at = excluded.last_synced_at",
+                    (channel_id, backfill_token, now)
+                )
+            self._conn.commit()
+
+    def mark_processed(self, video_ids, processed=True):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE videos SET processed = ? WHERE video_id = ?",
+                [(1 if processed else 0, video_id) for video_id in video_ids]
+            )
+            self._conn.commit()
+
+    def processed_ids(self, video_ids):
+        """주어진 영상 ID 중 처리 완료로 표시된 영상 ID 집합을 반환합니다."""
+        video_ids = list(video_ids)
+        processed = set()
+        with self._lock:
+            # SQLite 변수 개수 제한을 넘지 않도록 나누어 조회
+            for i in range(0, len(video_ids), 500):
+                chunk = video_ids[i:i+500]
+                rows = self._conn.execute(
+                    f"SELECT video_id FROM videos WHERE processed = 1 AND video_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                processed.update(row['video_id'] for row in rows)
+        return processed
+
+    def list_videos(self, channel_id, video_ids=None):
+        """
+        채널의 영상을 최신 게시순으로 반환합니다. video_ids가 주어지면 해당 영상만 반환합니다.
+        각 항목은 get_videos_from_channel과 같은 키에 'processed'가 추가된 딕셔너리입니다.
+        """
+        query = "SELECT * FROM videos WHERE channel_id = ?"
+        params = [channel_id]
+        if video_ids is not None:
+            video_ids = list(video_ids)
+            if not video_ids:
+                return []
+            query += f" AND video_id IN ({','.join('?' * len(video_ids))})"
+            params.extend(video_ids)
+        query += " ORDER BY published_at DESC, video_id"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{
+            'id': row['video_id'],
+            'title': row['title'],
+            'duration': row['duration'],
+            'total_seconds': row['total_seconds'],
+            'published_at': row['published_at'],
+            'channel_id': row['channel_id'],
+            'processed': bool(row['processed'])
+        } for row in rows]
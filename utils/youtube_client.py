@@ -0,0 +1,51 @@
+# utils/youtube_client.py
+# 여러 스레드에서 YouTube Data API를 동시에 호출할 수 있도록 스레드별 클라이언트와 공용 스레드 풀을 관리합니다.
+# googleapiclient의 HTTP 객체(httplib2)는 스레드 안전하지 않으므로 스레드마다 클라이언트를 하나씩 만들어
+# 그 스레드의 연결(keep-alive)을 계속 재사용합니다.
+# googleapiclient는 불러오는 데 시간이 걸리므로 첫 API 요청 때 불러옵니다.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class YouTubeClientPool:
+    """
+    youtube.videos().list(...)처럼 googleapiclient 리소스와 같은 방식으로 사용할 수 있는 클라이언트 풀.
+    속성에 접근하면 호출한 스레드의 클라이언트로 위임하며, 클라이언트는 스레드에서 처음 사용할 때 만듭니다.
+    submit으로 API 요청을 공용 스레드 풀에서 실행하여 여러 요청을 겹쳐 보낼 수 있습니다.
+    """
+
+    def __init__(self, api_key, max_workers=4):
+        self.api_key = api_key
+        self.max_workers = max(1, int(max_workers))
+        self._local = threading.local()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        """현재 스레드의 YouTube Data API 클라이언트를 반환합니다."""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            from googleapiclient.discovery import build
+            client = self._local.client = build('youtube', 'v3', developerKey=self.api_key, cache_discovery=False)
+        return client
+
+    def __getattr__(self, name):
+        return getattr(self.client(), name)
+
+    def configure(self, max_workers):
+        """동시에 보낼 요청 수를 바꿉니다. 이미 만든 스레드 풀은 다음 submit부터 새 크기로 다시 만듭니다."""
+        max_workers = max(1, int(max_workers))
+        with self._lock:
+            if max_workers == self.max_workers:
+                return
+            self.max_workers = max_workers
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def submit(self, fn, *args, **kwargs):
+        """fn을 공용 스레드 풀에서 실행하고 Future를 반환합니다. fn 안에서 다시 submit의 결과를 기다리면 안 됩니다."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="youtube-api")
+            return self._executor.submit(fn, *args, **kwargs)
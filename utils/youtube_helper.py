@@ -2,14 +2,36 @@
 # YouTube Data API와 youtube-transcript-api 라이브러리를 사용하여
 # 유튜브 관련 데이터를 처리하는 함수들을 포함합니다.
 
-from googleapiclient.discovery import build
 from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+import logging
+import queue
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
 from isodate import parse_duration
 from .file_helper import load_api_key
+from .gemini_dispatcher import backoff_delay, is_retryable_error
+from .transcript import Transcript, DEFAULT_LANGUAGES, language_rank
+from .youtube_client import YouTubeClientPool
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
 
 YOUTUBE_API_KEY = load_api_key("myapi")
-youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+# 스레드마다 클라이언트를 따로 두어 여러 요청을 동시에 보낼 수 있음
+youtube = YouTubeClientPool(YOUTUBE_API_KEY)
+
+# get_videos_from_channel / sync_channel / backfill_channel이 미리 요청해 둔 다음 페이지 {(재생목록 ID, 페이지 토큰, 개수): (Future, 요청 시각, 유효 기간)}
+_prefetched_pages = {}
+_prefetch_lock = threading.Lock()
+# 채널 캐시가 없을 때 미리 받은 페이지의 유효 기간 (channel_cache_ttl_days 기본값과 같은 30일)
+PREFETCH_TTL_SECONDS = 30 * 86400
+# 동시에 보관할 미리 받은 페이지 수 상한 (넘으면 가장 오래된 것부터 버림)
+MAX_PREFETCHED_PAGES = 32
+# 자막 목록 조회 / 다운로드가 일시적인 오류로 실패했을 때 다시 시도하는 최대 횟수
+TRANSCRIPT_MAX_RETRIES = 2
 
 def parse_iso8601_duration(duration_str):
     """ISO 8601 형식의 기간을 'HH:MM:SS' 또는 'MM:SS' 형태로 변환합니다."""
@@ -58,254 +80,672 @@ def get_channel_id_from_url(url):
                 if search_response and search_response.get('items'):
                     return search_response['items'][0]['id']['channelId']
             except Exception as e:
-                print(f"'{identifier}'로 채널 ID를 검색하는 중 오류 발생: {e}")
+                logger.warning("'%s'로 채널 ID를 검색하는 중 오류 발생: %s", identifier, e)
                 return None # 검색 실패 시 None 반환
     return None
 
-def get_videos_from_channel(channel_url, include_shorts=False, min_duration_seconds=0, max_results=50, page_token=None):
+def resolve_channel(channel_url, cache=None, refresh=False):
     """
-    채널의 영상 목록을 지정된 개수만큼 가져와 반환합니다.
-    page_token을 사용하여 다음 페이지를 가져올 수 있습니다.
+    채널 URL을 (채널 ID, 업로드 재생목록 ID)로 변환합니다.
+    cache(ChannelCache)가 주어지면 저장된 결과를 사용하고, 새로 조회한 결과는 저장합니다.
+    refresh=True이면 캐시를 무시하고 다시 조회합니다.
     """
-    channel_id = get_channel_id_from_url(channel_url)
-    if not channel_id:
-        raise ValueError("유효한 채널 URL이 아니거나 채널 ID를 찾을 수 없습니다.")
+    if cache is not None and not refresh:
+        cached = cache.get(channel_url)
+        if cached:
+            METRICS.incr("youtube.channel_cache_hits")
+            return cached
+
+    with METRICS.timer("youtube.channel_resolve"):
+        channel_id = get_channel_id_from_url(channel_url)
+        if not channel_id:
+            raise ValueError("유효한 채널 URL이 아니거나 채널 ID를 찾을 수 없습니다.")
+
+        try:
+            res = youtube.channels().list(id=channel_id, part='contentDetails').execute()
+            if not res.get('items'):
+                raise ValueError(f"채널 ID '{channel_id}'에 대한 정보를 찾을 수 없습니다.")
+            
+            playlist_id = res['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        except Exception as e:
+            raise ValueError(f"채널의 업로드 목록을 가져오는 중 오류 발생: {e}")
+
+    if cache is not None:
+        cache.put(channel_url, channel_id, playlist_id)
+    return channel_id, playlist_id
+
+def _is_not_found_error(error):
+    """googleapiclient HttpError가 404(재생목록 없음)인지 확인합니다."""
+    return getattr(getattr(error, 'resp', None), 'status', None) == 404
 
+def is_shorts_title(title):
+    """제목 끝의 해시태그로 Shorts 영상 여부를 판단합니다."""
+    return title.strip().endswith('#비밀치트키')
+
+def _list_playlist_page(channel_url, playlist_id, page_token, max_results, channel_cache=None, part='snippet'):
+    """
+    업로드 재생목록의 한 페이지를 가져옵니다. (응답, 재생목록 ID)를 반환합니다.
+    캐시된 재생목록이 404를 반환하면 캐시를 무효화하고 한 번만 다시 조회합니다.
+    """
     try:
-        res = youtube.channels().list(id=channel_id, part='contentDetails').execute()
-        if not res.get('items'):
-            raise ValueError(f"채널 ID '{channel_id}'에 대한 정보를 찾을 수 없습니다.")
-        
-        playlist_id = res['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        with METRICS.timer("youtube.playlist_page"):
+            res = youtube.playlistItems().list(
+                playlistId=playlist_id,
+                part=part,
+                maxResults=max_results, # 요청된 max_results 사용
+                pageToken=page_token
+            ).execute()
     except Exception as e:
-        raise ValueError(f"채널의 업로드 목록을 가져오는 중 오류 발생: {e}")
+        if channel_cache is None or not _is_not_found_error(e):
+            raise
+        # 캐시된 업로드 재생목록이 더 이상 유효하지 않으면 무효화 후 한 번만 다시 조회
+        channel_cache.invalidate(channel_url)
+        _, playlist_id = resolve_channel(channel_url, channel_cache, refresh=True)
+        with METRICS.timer("youtube.playlist_page"):
+            res = youtube.playlistItems().list(
+                playlistId=playlist_id,
+                part=part,
+                maxResults=max_results,
+                pageToken=page_token
+            ).execute()
+    return res, playlist_id
+
+def _request_video_details(chunk_ids):
+    """영상 ID 50개 이하의 길이 정보를 videos().list 한 번으로 조회하여 {영상 ID: (표시용 길이, 총 초)}로 반환합니다."""
+    details = {}
+    try:
+        with METRICS.timer("youtube.video_details"):
+            video_details_res = youtube.videos().list(
+                id=','.join(chunk_ids),
+                part='contentDetails'
+            ).execute()
+
+        for item in video_details_res.get('items', []):
+            duration_iso = item.get('contentDetails', {}).get('duration', 'PT0S')
+            total_seconds = int(parse_duration(duration_iso).total_seconds())
+            details[item['id']] = (parse_iso8601_duration(duration_iso), total_seconds)
+    except Exception as e:
+        logger.warning("영상 길이 정보를 가져오는 중 오류 발생 (ID: %s): %s", chunk_ids, e)
+    return details
+
+def _submit_video_details(video_ids):
+    """영상 ID 목록을 50개 단위로 나누어 길이 정보 요청을 동시에 보내고 Future 목록을 반환합니다."""
+    return [youtube.submit(_request_video_details, video_ids[i:i+50]) for i in range(0, len(video_ids), 50)]
+
+def _collect_video_details(futures):
+    details = {}
+    for future in futures:
+        details.update(future.result())
+    return details
+
+def _fetch_video_details(video_ids):
+    """영상 ID 목록의 길이 정보를 50개 단위로 동시에 조회하여 {영상 ID: (표시용 길이, 총 초)}로 반환합니다."""
+    return _collect_video_details(_submit_video_details(video_ids))
+
+def _take_prefetched_page(playlist_id, page_token, max_results):
+    with _prefetch_lock:
+        _drop_expired_prefetches(time.monotonic())
+        entry = _prefetched_pages.pop((playlist_id, page_token, max_results), None)
+    if entry is None:
+        return None
+    future = entry[0]
+    try:
+        return future.result()
+    except Exception:
+        return None # 미리 받기에 실패했으면 평소처럼 다시 요청
+
+def _prefetch_page(channel_url, playlist_id, page_token, max_results, channel_cache):
+    # 사용자가 '더 불러오기'를 누르기 전에 다음 페이지를 받아 둠 (재생목록마다 최근 하나만 유지)
+    ttl = getattr(channel_cache, 'ttl_seconds', None) or PREFETCH_TTL_SECONDS
+    now = time.monotonic()
+    with _prefetch_lock:
+        _discard_prefetched_pages_locked(playlist_id)
+        _drop_expired_prefetches(now)
+        while len(_prefetched_pages) >= MAX_PREFETCHED_PAGES:
+            del _prefetched_pages[min(_prefetched_pages, key=lambda key: _prefetched_pages[key][1])]
+        future = youtube.submit(
+            _list_playlist_page, channel_url, playlist_id, page_token, max_results, channel_cache, 'snippet,contentDetails'
+        )
+        _prefetched_pages[(playlist_id, page_token, max_results)] = (future, now, ttl)
+
+def _discard_prefetched_pages(playlist_id):
+    """재생목록의 미리 받은 페이지를 버립니다. 채널을 처음부터 다시 불러오거나 동기화할 때 호출합니다."""
+    with _prefetch_lock:
+        _discard_prefetched_pages_locked(playlist_id)
+
+def _discard_prefetched_pages_locked(playlist_id):
+    for key in [key for key in _prefetched_pages if key[0] == playlist_id]:
+        del _prefetched_pages[key]
+
+def _drop_expired_prefetches(now):
+    for key in [key for key, (_, fetched_at, ttl) in _prefetched_pages.items() if now - fetched_at > ttl]:
+        del _prefetched_pages[key]
+
+def get_videos_from_channel(channel_url, include_shorts=False, min_duration_seconds=0, max_results=50, page_token=None, channel_cache=None):
+    """
+    채널의 영상 목록을 지정된 개수만큼 가져와 반환합니다.
+    page_token을 사용하여 다음 페이지를 가져올 수 있습니다.
+    channel_cache(ChannelCache)가 주어지면 채널 ID와 업로드 재생목록 조회를 캐시하여
+    다음 페이지부터는 playlistItems / videos 요청만 사용합니다.
+    """
+    _, playlist_id = resolve_channel(channel_url, channel_cache)
+    if not page_token:
+        # 첫 페이지부터 다시 불러오면 이전에 받아 둔 페이지는 새 업로드가 반영되지 않았으므로 버림
+        _discard_prefetched_pages(playlist_id)
 
     video_ids = []
     video_titles = {}
+    published = {}
+    channel_id = None
     
     # 첫 번째 요청에서 maxResults를 사용하여 지정된 개수만큼만 가져옵니다.
-    # 이후 요청에서는 page_token을 사용하여 다음 페이지를 가져옵니다.
-    res = youtube.playlistItems().list(
-        playlistId=playlist_id,
-        part='snippet',
-        maxResults=max_results, # 요청된 max_results 사용
-        pageToken=page_token
-    ).execute()
+    # 이후 요청에서는 page_token을 사용하여 다음 페이지를 가져옵니다. (미리 받아 둔 페이지가 있으면 사용)
+    prefetched = _take_prefetched_page(playlist_id, page_token, max_results) if page_token else None
+    res, playlist_id = prefetched or _list_playlist_page(
+        channel_url, playlist_id, page_token, max_results, channel_cache, part='snippet,contentDetails'
+    )
     
     for item in res.get('items', []):
-        snippet = item.get('snippet', {})
-        title = snippet.get('title', "")
+        video_id, title, published_at = _parse_playlist_item(item)
         
         # Shorts 영상 필터링
-        if not include_shorts and title.strip().endswith('#비밀치트키'):
+        if not include_shorts and is_shorts_title(title):
             continue
 
-        if snippet.get('resourceId', {}).get('videoId'):
-            video_id = snippet['resourceId']['videoId']
+        if video_id:
             video_ids.append(video_id)
             video_titles[video_id] = title
+            published[video_id] = published_at
+            channel_id = channel_id or item.get('snippet', {}).get('channelId')
 
     next_page_token = res.get('nextPageToken')
-    
+    if next_page_token:
+        _prefetch_page(channel_url, playlist_id, next_page_token, max_results, channel_cache)
+    details = _fetch_video_details(video_ids)
+
+    sorted_videos = []
+    for video_id in video_ids:
+        if video_id not in details:
+            continue
+        duration_formatted, total_seconds = details[video_id]
+        # 최소 영상 길이 필터링
+        if total_seconds < min_duration_seconds:
+            continue
+        sorted_videos.append({
+            'id': video_id,
+            'title': video_titles.get(video_id, "제목 없음"),
+            'duration': duration_formatted,
+            'total_seconds': total_seconds,
+            'published_at': published.get(video_id),
+            'channel_id': channel_id
+        })
+
+    return sorted_videos, next_page_token
+
+def extract_video_id(value):
+    """영상 URL(watch?v=, youtu.be/, shorts/) 또는 11자리 영상 ID 문자열에서 영상 ID를 추출합니다."""
+    value = value.strip()
+    match = re.search(r'(?:v=|youtu\.be/|/shorts/|/embed/|/live/)([a-zA-Z0-9_-]{11})', value)
+    if match:
+        return match.group(1)
+    if re.fullmatch(r'[a-zA-Z0-9_-]{11}', value):
+        return value
+    return None
+
+def get_videos_by_ids(video_ids):
+    """
+    영상 ID 목록의 제목과 길이 정보를 조회하여 get_videos_from_channel과 같은 형태로 반환합니다.
+    존재하지 않거나 비공개인 영상은 결과에서 빠집니다. 순서는 입력 순서를 따릅니다.
+    """
+    def request(chunk_ids):
+        return youtube.videos().list(id=','.join(chunk_ids), part='snippet,contentDetails').execute()
+
+    found = {}
+    futures = [youtube.submit(request, video_ids[i:i+50]) for i in range(0, len(video_ids), 50)]
+    for future in futures:
+        for item in future.result().get('items', []):
+            duration_iso = item.get('contentDetails', {}).get('duration', 'PT0S')
+            found[item['id']] = {
+                'id': item['id'],
+                'title': item.get('snippet', {}).get('title', "제목 없음"),
+                'duration': parse_iso8601_duration(duration_iso),
+                'total_seconds': int(parse_duration(duration_iso).total_seconds()),
+                'published_at': item.get('snippet', {}).get('publishedAt'),
+                'channel_id': item.get('snippet', {}).get('channelId')
+            }
+    return [found[video_id] for video_id in video_ids if video_id in found]
+
+def _index_playlist_items(video_index, channel_id, items, details=None):
+    """
+    재생목록 항목들을 길이 정보와 함께 인덱스에 저장하고, 저장된 영상 목록을 반환합니다.
+    details({영상 ID: (표시용 길이, 총 초)})가 없으면 여기서 조회합니다.
+    """
+    if details is None:
+        details = _fetch_video_details([item[0] for item in items])
     videos = []
-    # video_ids가 50개 미만일 수도 있으므로 len(video_ids)를 사용
-    for i in range(0, len(video_ids), 50): 
-        chunk_ids = video_ids[i:i+50]
-        try:
-            video_details_res = youtube.videos().list(
-                id=','.join(chunk_ids),
-                part='contentDetails'
-            ).execute()
+    for video_id, title, published_at in items:
+        if video_id not in details:
+            continue
+        duration_formatted, total_seconds = details[video_id]
+        videos.append({
+            'id': video_id,
+            'title': title,
+            'duration': duration_formatted,
+            'total_seconds': total_seconds,
+            'published_at': published_at,
+            'channel_id': channel_id
+        })
+    if videos:
+        video_index.upsert_videos(channel_id, videos)
+    return videos
 
-            for item in video_details_res.get('items', []):
-                video_id = item['id']
-                duration_iso = item.get('contentDetails', {}).get('duration', 'PT0S')
-                duration_parsed = parse_duration(duration_iso)
-                total_seconds = int(duration_parsed.total_seconds())
-
-                # 최소 영상 길이 필터링
-                if total_seconds < min_duration_seconds:
-                    continue
-
-                duration_formatted = parse_iso8601_duration(duration_iso)
-                
-                videos.append({
-                    'id': video_id,
-                    'title': video_titles.get(video_id, "제목 없음"),
-                    'duration': duration_formatted,
-                    'total_seconds': total_seconds
-                })
-        except Exception as e:
-            print(f"영상 길이 정보를 가져오는 중 오류 발생 (ID: {chunk_ids}): {e}")
+def _parse_playlist_item(item):
+    """playlistItems 항목에서 (영상 ID, 제목, 게시 시각)을 추출합니다."""
+    snippet = item.get('snippet', {})
+    content_details = item.get('contentDetails', {})
+    video_id = content_details.get('videoId') or snippet.get('resourceId', {}).get('videoId')
+    published_at = content_details.get('videoPublishedAt') or snippet.get('publishedAt')
+    return video_id, snippet.get('title', ""), published_at
+
+def sync_channel(channel_url, video_index, channel_cache=None, max_pages=None, page_size=50, prefetch_page_size=None):
+    """
+    채널의 새 업로드를 영상 인덱스에 증분 동기화합니다.
 
-    videos_dict = {v['id']: v for v in videos}
-    sorted_videos = [videos_dict[vid_id] for vid_id in video_ids if vid_id in videos_dict]
+    처음 보는 채널은 최신 영상부터 최대 max_pages 페이지를 가져오고, 남은 과거 페이지 토큰을 저장해 둡니다.
+    이미 동기화한 채널은 인덱스에 있는 영상 ID를 만날 때까지만 playlistItems를 조회합니다.
+    prefetch_page_size가 주어지면 backfill_channel이 다음에 요청할 과거 페이지(그 크기)를 미리 받아 둡니다.
 
-    return sorted_videos, next_page_token
+    Returns:
+        tuple: (채널 ID, 새로 추가된 영상 목록)
+    """
+    channel_id, playlist_id = resolve_channel(channel_url, channel_cache)
+    _discard_prefetched_pages(playlist_id)
+    initial = not video_index.has_channel(channel_id)
+
+    new_items = []
+    detail_futures = []
+    page_token = None
+    pages = 0
+    while True:
+        res, playlist_id = _list_playlist_page(
+            channel_url, playlist_id, page_token, page_size, channel_cache, part='snippet,contentDetails'
+        )
+        pages += 1
+        reached_known = False
+        page_items = []
+        for item in res.get('items', []):
+            video_id, title, published_at = _parse_playlist_item(item)
+            if not video_id:
+                continue
+            if not initial and video_index.contains(video_id):
+                reached_known = True
+                break
+            page_items.append((video_id, title, published_at))
+        # 이 페이지의 길이 정보 요청이 진행되는 동안 다음 페이지를 요청
+        detail_futures.extend(_submit_video_details([item[0] for item in page_items]))
+        new_items.extend(page_items)
+
+        page_token = res.get('nextPageToken')
+        if reached_known or not page_token:
+            break
+        # 증분 동기화는 알고 있는 영상까지 이어져야 하므로 페이지 수 제한은 처음 동기화에만 적용
+        if initial and max_pages and pages >= max_pages:
+            break
+
+    new_videos = _index_playlist_items(video_index, channel_id, new_items, _collect_video_details(detail_futures))
+    if initial:
+        video_index.update_sync_state(channel_id, backfill_token=page_token)
+    else:
+        video_index.update_sync_state(channel_id, keep_backfill_token=True)
+    backfill_token = video_index.get_backfill_token(channel_id)
+    if prefetch_page_size and backfill_token:
+        _prefetch_page(channel_url, playlist_id, backfill_token, prefetch_page_size, channel_cache)
+    logger.info("[채널 동기화] %s: 새 영상 %d개 (요청 %d페이지)", channel_id, len(new_videos), pages)
+    return channel_id, new_videos
+
+def backfill_channel(channel_url, video_index, channel_cache=None, pages=1, page_size=50):
+    """
+    처음 동기화에서 가져오지 못한 과거 영상을 저장된 페이지 토큰부터 이어서 인덱스에 추가합니다.
+    미리 받아 둔 페이지가 있으면 사용하고, 끝나면 다음 호출에 쓸 페이지를 미리 받아 둡니다.
+
+    Returns:
+        tuple: (채널 ID, 새로 추가된 영상 목록)
+    """
+    channel_id, playlist_id = resolve_channel(channel_url, channel_cache)
+    page_token = video_index.get_backfill_token(channel_id)
+    new_items = []
+    detail_futures = []
+    for _ in range(pages):
+        if not page_token:
+            break
+        res, playlist_id = _take_prefetched_page(playlist_id, page_token, page_size) or _list_playlist_page(
+            channel_url, playlist_id, page_token, page_size, channel_cache, part='snippet,contentDetails'
+        )
+        page_items = []
+        for item in res.get('items', []):
+            video_id, title, published_at = _parse_playlist_item(item)
+            if video_id:
+                page_items.append((video_id, title, published_at))
+        detail_futures.extend(_submit_video_details([item[0] for item in page_items]))
+        new_items.extend(page_items)
+        page_token = res.get('nextPageToken')
 
-def get_transcript(video_id, proxy_url=None):
+    if page_token:
+        _prefetch_page(channel_url, playlist_id, page_token, page_size, channel_cache)
+    new_videos = _index_playlist_items(video_index, channel_id, new_items, _collect_video_details(detail_futures))
+    video_index.update_sync_state(channel_id, backfill_token=page_token)
+    return channel_id, new_videos
+
+def get_transcript(video_id, proxy_url=None, cache=None, languages=None, retries=TRANSCRIPT_MAX_RETRIES):
     """
     주어진 영상 ID의 스크립트를 우선순위에 따라 추출하여 텍스트와 세그먼트 수를 반환합니다.
     개선된 자막 검색 및 오류 처리 포함.
+    cache(TranscriptCache)가 주어지면 네트워크 요청 전에 캐시를 먼저 확인하고, 새로 가져온 자막은 캐시에 저장합니다.
+    languages는 선호 언어 코드 목록이며, 없으면 DEFAULT_LANGUAGES(한국어, 영어)를 사용합니다.
+    연결 끊김이나 429 / 5xx 같은 일시적인 오류는 요청마다 최대 retries번 다시 시도합니다.
     """
-    print(f"[자막 검색] 영상 ID: {video_id}")
-    
+    result, segment_count = get_transcript_segments(video_id, proxy_url, cache, languages, retries)
+    if not result:
+        return None, 0
+    return result.text, segment_count
+
+def get_transcript_segments(video_id, proxy_url=None, cache=None, languages=None, retries=TRANSCRIPT_MAX_RETRIES):
+    """
+    get_transcript와 같은 순서로 자막을 찾되, 텍스트 대신 시작 시각이 보존된 Transcript 객체와 세그먼트 수를 반환합니다.
+    자막을 찾지 못하면 (None, 0)을 반환합니다.
+    캐시에서는 선호 언어의 자막만 바로 사용하고, 다른 언어의 캐시된 자막은 네트워크에서 자막을 가져오지 못했을 때만 사용합니다.
+    """
+    logger.debug("[자막 검색] 영상 ID: %s", video_id)
+
+    cached = _find_cached_transcript(cache, video_id, languages)
+    if cached:
+        language_code, _, segments = cached
+        METRICS.incr("transcript.cache_hits")
+        logger.debug("[자막 캐시] 캐시 사용: %s (%s)", video_id, language_code)
+        result = Transcript.from_segments(segments)
+        return result, len(result)
+
+    result, segment_count = _fetch_transcript_segments(video_id, proxy_url, cache, languages, retries)
+    if result:
+        return result, segment_count
+
+    cached = _find_cached_transcript(cache, video_id, languages, fallback=True)
+    if cached:
+        language_code, _, segments = cached
+        METRICS.incr("transcript.cache_fallbacks")
+        logger.info("[자막 캐시] 선호 언어 자막을 가져오지 못해 캐시된 %s 자막 사용: %s", language_code, video_id)
+        result = Transcript.from_segments(segments)
+        return result, len(result)
+    return None, 0
+
+def _find_cached_transcript(cache, video_id, languages, fallback=False):
+    if cache is None:
+        return None
+    try:
+        return cache.find(video_id, languages, fallback=fallback)
+    except Exception as e:
+        logger.warning("[자막 캐시] 조회 오류: %s", e)
+        return None
+
+def _fetch_transcript_segments(video_id, proxy_url, cache, languages, retries):
     proxies = None
     if proxy_url and proxy_url.strip():
         proxies = {'http': proxy_url.strip(), 'https': proxy_url.strip()}
 
     try:
-        # 자막 목록 가져오기
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id, proxies=proxies)
-        
-        # 사용 가능한 자막 목록 출력
-        available_transcripts = []
-        for transcript in transcript_list:
-            lang_code = transcript.language_code
-            lang_name = getattr(transcript, 'language', lang_code)
-            is_generated = transcript.is_generated
-            is_translatable = transcript.is_translatable
-            status = "자동생성" if is_generated else "수동작성"
-            translatable = " (번역가능)" if is_translatable else ""
-            available_transcripts.append(f"{lang_name}({lang_code}) - {status}{translatable}")
-        
-        print(f"[자막 검색] 사용 가능한 자막: {len(available_transcripts)}개")
-        for transcript_info in available_transcripts:
-            print(f"  - {transcript_info}")
-        
+        with METRICS.timer("transcript.list"):
+            transcript_list = _with_retries(
+                lambda: YouTubeTranscriptApi.list_transcripts(video_id, proxies=proxies), retries, "자막 목록 조회", video_id
+            )
     except NoTranscriptFound:
-        print(f"[자막 검색] 자막 없음: {video_id}")
+        logger.info("[자막 검색] 자막 없음: %s", video_id)
         return None, 0
     except TranscriptsDisabled:
-        print(f"[자막 검색] 자막 비활성화: {video_id}")
+        logger.info("[자막 검색] 자막 비활성화: %s", video_id)
         return None, 0
     except Exception as e:
-        print(f"[자막 검색] 오류 발생: {e}")
+        logger.warning("[자막 검색] 오류 발생 (%s): %s", video_id, e)
         return None, 0
 
-    # 자막 검색 우선순위 정의
-    search_priorities = [
-        # 1. 한국어 수동 자막
-        ("한국어 수동 자막", lambda: transcript_list.find_manually_created_transcript(['ko', 'ko-KR', 'kor'])),
-        
-        # 2. 한국어 자동생성 자막
-        ("한국어 자동생성 자막", lambda: transcript_list.find_generated_transcript(['ko', 'ko-KR', 'kor'])),
-        
-        # 3. 영어 수동 자막
-        ("영어 수동 자막", lambda: transcript_list.find_manually_created_transcript(['en', 'en-US', 'en-GB'])),
-        
-        # 4. 영어 자동생성 자막
-        ("영어 자동생성 자막", lambda: transcript_list.find_generated_transcript(['en', 'en-US', 'en-GB'])),
-        
-        # 5. 직접 검색 - 한국어 관련
-        ("한국어 직접 검색", lambda: find_korean_transcript_direct(transcript_list)),
-        
-        # 6. 번역 가능한 자막 → 한국어 번역
-        ("한국어 번역", lambda: find_translatable_to_korean(transcript_list)),
-        
-        # 7. 번역 가능한 자막 → 영어 번역
-        ("영어 번역", lambda: find_translatable_to_english(transcript_list)),
-        
-        # 8. 첫 번째 사용 가능한 자막
-        ("첫 번째 자막", lambda: get_first_available_transcript(transcript_list))
-    ]
-    
-    # 우선순위에 따라 자막 검색 시도
-    for priority_name, search_func in search_priorities:
+    transcript, description = select_transcript(transcript_list, languages)
+    if transcript is None:
+        logger.info("[자막 검색] 사용할 수 있는 자막 없음: %s", video_id)
+        return None, 0
+    logger.debug("[자막 검색] %s: %s 선택", video_id, description)
+    return extract_transcript_segments(transcript, video_id, cache, retries)
+
+def _is_transient_error(error):
+    """연결 끊김 / 시간 초과 또는 429 / 5xx 응답처럼 다시 시도하면 성공할 수 있는 오류이면 True를 반환합니다."""
+    if isinstance(error, (NoTranscriptFound, TranscriptsDisabled)):
+        return False
+    return isinstance(error, OSError) or is_retryable_error(error)
+
+def _with_retries(request, retries, description, video_id):
+    """request()를 호출하고, 일시적인 오류이면 지수 백오프 후 최대 retries번 다시 시도합니다."""
+    attempt = 0
+    while True:
         try:
-            print(f"[자막 검색] {priority_name} 시도 중...")
-            transcript = search_func()
-            if transcript:
-                print(f"[자막 검색] {priority_name} 성공!")
-                return extract_transcript_text(transcript, video_id)
-        except NoTranscriptFound:
-            print(f"[자막 검색] {priority_name} - 자막 없음")
-            continue
+            return request()
         except Exception as e:
-            print(f"[자막 검색] {priority_name} - 오류: {e}")
-            continue
+            if attempt >= retries or not _is_transient_error(e):
+                raise
+            delay = backoff_delay(attempt, base=0.5, cap=5.0)
+            attempt += 1
+            METRICS.incr("transcript.retries")
+            logger.info("[자막 검색] %s 실패 (%s), %.1f초 후 재시도 (%d/%d): %s", description, video_id, delay, attempt, retries, e)
+            time.sleep(delay)
 
-    print(f"[자막 검색] 모든 시도 실패: {video_id}")
-    return None, 0
+def select_transcript(transcript_list, languages=None):
+    """
+    자막 목록을 한 번만 순회하여 선호 언어(languages) 순서에 가장 잘 맞는 자막을 고릅니다.
 
-def find_korean_transcript_direct(transcript_list):
-    """한국어 자막을 직접 검색"""
-    for transcript in transcript_list:
-        lang_code = transcript.language_code.lower()
-        if any(korean in lang_code for korean in ['ko', 'kor', 'korean']):
-            return transcript
-    raise NoTranscriptFound("한국어 자막을 찾을 수 없습니다")
+    1. 선호 언어의 자막 (언어 순서대로, 같은 언어에서는 수동 작성 → 자동 생성)
+    2. 선호 언어 자막이 하나도 없을 때만, 번역 가능한 자막을 선호 언어로 번역 (번역은 네트워크 요청이 필요함)
+    3. 그 밖의 첫 번째 자막
 
-def find_translatable_to_korean(transcript_list):
-    """번역 가능한 자막을 한국어로 번역"""
+    Returns:
+        tuple: (자막 객체, 선택 설명). 자막이 없으면 (None, None)
+    """
+    best = None
+    best_rank = None
+    first = None
+    translatable = None
+    debug = logger.isEnabledFor(logging.DEBUG)
     for transcript in transcript_list:
-        if transcript.is_translatable:
+        if debug:
+            logger.debug("[자막 목록] %s (%s)", transcript.language_code, '자동생성' if transcript.is_generated else '수동작성')
+        if first is None:
+            first = transcript
+        if translatable is None and transcript.is_translatable:
+            translatable = transcript
+        rank = language_rank(transcript.language_code, transcript.is_generated, languages)
+        if rank is not None and (best_rank is None or rank < best_rank):
+            best, best_rank = transcript, rank
+
+    if best is not None:
+        return best, f"{best.language_code} {'자동생성' if best.is_generated else '수동작성'} 자막"
+    if translatable is not None:
+        for language in (languages or DEFAULT_LANGUAGES):
             try:
-                return transcript.translate('ko')
+                return translatable.translate(language), f"{translatable.language_code} → {language} 번역 자막"
             except Exception as e:
-                print(f"[자막 번역] {transcript.language_code} → 한국어 실패: {e}")
-                continue
-    raise NoTranscriptFound("번역 가능한 자막을 찾을 수 없습니다")
+                logger.warning("[자막 번역] %s → %s 실패: %s", translatable.language_code, language, e)
+    if first is not None:
+        return first, f"{first.language_code} 자막"
+    return None, None
 
-def find_translatable_to_english(transcript_list):
-    """번역 가능한 자막을 영어로 번역"""
-    for transcript in transcript_list:
-        if transcript.is_translatable:
+class _DaemonWorkers:
+    """
+    데몬 스레드 작업자 묶음. submit은 concurrent.futures.Future를 반환합니다.
+
+    자막 요청은 HTTP 제한 시간을 지정할 수 없어 멈춘 스레드를 중단할 수 없습니다.
+    ThreadPoolExecutor의 작업자는 인터프리터 종료 시 join되어 멈춘 요청 하나가 프로그램 종료를 막으므로,
+    데몬 스레드를 사용하고 replace_worker로 멈춘 작업자 대신 일할 작업자를 하나 더 띄웁니다.
+    멈췄던 작업이 끝나면 그 작업자는 종료되어 작업자 수가 다시 count로 돌아옵니다.
+    """
+
+    def __init__(self, count, name):
+        self._jobs = queue.Queue()
+        self._name = name
+        self._lock = threading.Lock()
+        self._spawned = 0
+        self._abandoned = set() # 다른 작업자로 대신한 작업의 Future. 끝나면 그 작업자는 종료
+        for _ in range(count):
+            self._spawn()
+
+    def _spawn(self):
+        with self._lock:
+            self._spawned += 1
+            name = f"{self._name}-{self._spawned}"
+        threading.Thread(target=self._work, name=name, daemon=True).start()
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, fn, args = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+            with self._lock:
+                if future in self._abandoned:
+                    self._abandoned.discard(future)
+                    return
+
+    def submit(self, fn, *args):
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    def replace_worker(self, future):
+        """future의 작업이 작업자를 붙잡고 있는 동안 대기 중인 작업을 처리할 작업자를 추가합니다."""
+        with self._lock:
+            if future.done():
+                return
+            self._abandoned.add(future)
+        self._spawn()
+
+    def shutdown(self):
+        """대기 중인 작업을 취소하고, 쉬고 있는 작업자를 종료시킵니다. 실행 중인 작업은 기다리지 않습니다."""
+        while True:
             try:
-                return transcript.translate('en')
-            except Exception as e:
-                print(f"[자막 번역] {transcript.language_code} → 영어 실패: {e}")
-                continue
-    raise NoTranscriptFound("번역 가능한 자막을 찾을 수 없습니다")
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job[0].cancel()
+        with self._lock:
+            alive = self._spawned
+        for _ in range(alive):
+            self._jobs.put(None)
 
-def get_first_available_transcript(transcript_list):
-    """첫 번째 사용 가능한 자막 반환"""
-    for transcript in transcript_list:
-        return transcript
-    raise NoTranscriptFound("사용 가능한 자막이 없습니다")
+def fetch_transcripts(video_ids, max_workers=4, timeout=60, proxy_url=None, cache=None, with_segments=False, languages=None,
+                      retries=TRANSCRIPT_MAX_RETRIES):
+    """
+    여러 영상의 스크립트를 max_workers개의 작업자 스레드로 동시에 가져옵니다.
+    결과는 입력 순서대로 (video_id, transcript, segment_count, error) 튜플로 yield 됩니다.
+    with_segments=True이면 transcript 자리에 텍스트 대신 get_transcript_segments의 Transcript 객체를 담습니다.
+    timeout은 영상 하나의 작업이 실행을 시작한 시점부터 적용되며, 시간을 초과한 영상은
+    error에 TimeoutError를 담아 반환하고 다음 영상으로 넘어갑니다.
+    시간을 초과한 요청은 중단되지 않고 데몬 스레드에 남으며(프로그램 종료는 막지 않음),
+    그 작업자 대신 새 작업자를 띄워 뒤의 영상이 기다리지 않도록 합니다.
+    retries는 일시적인 오류가 난 요청을 다시 시도하는 최대 횟수입니다.
+    """
+    video_ids = list(video_ids)
+    max_workers = max(1, int(max_workers))
+    # 결과를 순서대로 꺼내는 동안 메모리가 커지지 않도록 미리 제출하는 작업 수를 제한
+    window = max_workers * 2
+    started_at = {}
+    loader = get_transcript_segments if with_segments else get_transcript
+
+    def run(index, video_id):
+        started_at[index] = time.monotonic()
+        return loader(video_id, proxy_url, cache, languages, retries)
+
+    workers = _DaemonWorkers(min(max_workers, len(video_ids)) or 1, "transcript")
+    pending = deque()
+    next_index = 0
+    try:
+        while pending or next_index < len(video_ids):
+            while next_index < len(video_ids) and len(pending) < window:
+                video_id = video_ids[next_index]
+                pending.append((next_index, video_id, workers.submit(run, next_index, video_id)))
+                next_index += 1
+
+            index, video_id, future = pending.popleft()
+            while True:
+                start = started_at.get(index)
+                remaining = timeout if start is None else start + timeout - time.monotonic()
+                try:
+                    transcript, segment_count = future.result(timeout=max(remaining, 0))
+                    yield video_id, transcript, segment_count, None
+                    break
+                except FuturesTimeoutError:
+                    start = started_at.get(index)
+                    if start is not None and time.monotonic() - start >= timeout:
+                        # 결과만 버리고, 대기 중인 작업이 멈춘 작업자를 기다리지 않도록 작업자를 보충
+                        METRICS.incr("transcript.timeouts")
+                        workers.replace_worker(future)
+                        yield video_id, None, 0, TimeoutError(f"{timeout}초 안에 스크립트를 가져오지 못했습니다.")
+                        break
+                except Exception as e:
+                    yield video_id, None, 0, e
+                    break
+    finally:
+        workers.shutdown()
 
-def extract_transcript_text(transcript, video_id):
+def extract_transcript_text(transcript, video_id, cache=None):
     """
     자막 객체에서 텍스트와 세그먼트 수를 안전하게 추출합니다.
+    cache가 주어지면 추출한 세그먼트를 (영상 ID, 언어, 자동생성 여부) 키로 저장합니다.
+    """
+    result, segment_count = extract_transcript_segments(transcript, video_id, cache)
+    if not result:
+        return None, 0
+    return result.text, segment_count
+
+def extract_transcript_segments(transcript, video_id, cache=None, retries=TRANSCRIPT_MAX_RETRIES):
+    """
+    자막 객체에서 세그먼트를 추출하여 (Transcript, 세그먼트 수)를 반환합니다. 실패하면 (None, 0)을 반환합니다.
+    세그먼트마다 리스트를 만들지 않고 Transcript의 배열에 바로 담습니다.
     """
     try:
-        print(f"[자막 추출] 자막 데이터 가져오는 중...")
-        fetched_transcript = transcript.fetch()
+        with METRICS.timer("transcript.fetch"):
+            fetched_transcript = _with_retries(transcript.fetch, retries, "자막 다운로드", video_id)
         
         if not fetched_transcript:
-            print(f"[자막 추출] 빈 자막 데이터")
+            logger.warning("[자막 추출] 빈 자막 데이터: %s", video_id)
             return None, 0
-        
-        segment_count = len(fetched_transcript)
-        print(f"[자막 추출] 자막 세그먼트 수: {segment_count}")
-        
-        # 자막 조각들을 텍스트로 변환
-        text_parts = []
-        for i, segment in enumerate(fetched_transcript):
-            try:
+
+        def segments():
+            for i, segment in enumerate(fetched_transcript):
                 if isinstance(segment, dict) and 'text' in segment:
-                    text_parts.append(segment['text'])
+                    yield segment['text'], segment.get('start', 0.0), segment.get('duration', 0.0)
                 elif hasattr(segment, 'text'):
-                    text_parts.append(segment.text)
+                    yield segment.text, getattr(segment, 'start', 0.0), getattr(segment, 'duration', 0.0)
                 else:
-                    print(f"[자막 추출] 알 수 없는 세그먼트 형태 (인덱스 {i}): {type(segment)}")
-            except Exception as e:
-                print(f"[자막 추출] 세그먼트 {i} 처리 오류: {e}")
-                continue
-        
-        if not text_parts:
-            print(f"[자막 추출] 추출된 텍스트가 없음")
+                    logger.debug("[자막 추출] 알 수 없는 세그먼트 형태 (인덱스 %d): %s", i, type(segment))
+
+        result = Transcript.from_segments(segments())
+        if not result:
+            logger.warning("[자막 추출] 추출된 텍스트가 없음: %s", video_id)
             return None, 0
+        logger.debug("[자막 추출] 완료 - 세그먼트 %d개, 총 %d 문자", len(result), len(result.text))
+        if logger.isEnabledFor(logging.DEBUG):
+            # 자막 내용 확인용. 디버그 수준이 아니면 문자열을 만들지도 않음
+            logger.debug("[자막 추출] 샘플: %s", result.text[:200])
+
+        if cache is not None:
+            try:
+                cache.put(video_id, transcript.language_code, transcript.is_generated, result.to_segments())
+            except Exception as e:
+                logger.warning("[자막 캐시] 저장 오류: %s", e)
         
-        full_transcript = " ".join(text_parts)
-        print(f"[자막 추출] 완료 - 총 {len(full_transcript)} 문자")
-        
-        # 텍스트 샘플 출력 (처음 200자)
-        sample_text = full_transcript[:200] + "..." if len(full_transcript) > 200 else full_transcript
-        print(f"[자막 추출] 텍스트 샘플: {sample_text}")
-        
-        return full_transcript, segment_count
+        return result, len(result)
         
     except Exception as e:
-        print(f"[자막 추출] 오류 발생: {e}")
-        return None, 0
\ No newline at end of file
+        logger.warning("[자막 추출] 오류 발생 (%s): %s", video_id, e)
+        return None, 0